@@ -0,0 +1,72 @@
+"""
+Compare Chromium launch time & per-page memory (RSS of the whole process tree) across launch presets.
+
+Usage:
+    ENVIRONMENT=localhost PYTHONPATH=./src python benchmarks/launch_presets.py [--runs 5] [--pages 5] [--url URL]
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+import psutil
+import pyppeteer
+
+from web_pilot.clients.leased_browser import LeasedBrowser
+from web_pilot.schemas.constants.launch_preset import LaunchPreset
+
+
+def process_tree_rss(pid: int) -> float:
+    "RSS (MB) of a process and all of its children"
+    root = psutil.Process(pid)
+    rss = 0
+    for process in [root, *root.children(recursive=True)]:
+        try:
+            rss += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return rss / (1024 * 1024)
+
+
+async def measure(preset: LaunchPreset | None, pages: int, url: str) -> tuple[float, float]:
+    "Launch time (sec.) and RSS added per open page (MB)"
+    config = LeasedBrowser("bench", parent="bench", launch_preset=preset).config
+    config["userDataDir"] = tempfile.mkdtemp(prefix="web_pilot_bench_")
+    try:
+        started = time.perf_counter()
+        browser = await pyppeteer.launch(**config)
+        launch_time = time.perf_counter() - started
+
+        pid = browser.process.pid
+        baseline_rss = process_tree_rss(pid)
+        for _ in range(pages):
+            page = await browser.newPage()
+            await page.goto(url, waitUntil="load")
+        await asyncio.sleep(1)  # let renderers settle
+        per_page_rss = (process_tree_rss(pid) - baseline_rss) / pages
+        await browser.close()
+        return launch_time, per_page_rss
+
+    finally:
+        shutil.rmtree(config["userDataDir"], ignore_errors=True)
+
+
+async def main(runs: int, pages: int, url: str) -> None:
+    print(f"{'preset':<14}{'launch (s)':>14}{'RSS/page (MB)':>16}")
+    for preset in [None, *LaunchPreset]:
+        results = [await measure(preset, pages, url) for _ in range(runs)]
+        launch_time = statistics.median([result[0] for result in results])
+        per_page_rss = statistics.median([result[1] for result in results])
+        name = preset.value if preset else "default"
+        print(f"{name:<14}{launch_time:>14.3f}{per_page_rss:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--url", default="https://example.com")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.pages, args.url))
@@ -0,0 +1,126 @@
+"""
+Measure session throughput (new session -> action -> close, per second) of the multi-worker mode,
+for an increasing number of worker processes - ideally throughput scales near-linearly with workers.
+
+Usage:
+    PYTHONPATH=./src python benchmarks/multi_worker_throughput.py [--workers 1 2 4] [--concurrency 32] [--duration 30]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import httpx
+
+
+POOL_CONFIG = {
+    "headless": True,
+    "incognito": False,
+    "gpu": False,
+    "privacy": False,
+    "ignore_http_errors": True,
+    "spa_mode": False,
+    "proxy_server": None,
+    "platform": None,
+    "browser": None,
+    "launch_preset": "lean-scrape",
+}
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        ENVIRONMENT="production",
+        WORKERS_COUNT=str(workers),
+        HOST_PORT=str(port),
+        WORKERS_BASE_PORT=str(port + 100),
+        RATE_LIMIT="1000000",
+        LOG_LEVEL="WARNING",
+    )
+    return subprocess.Popen(
+        [sys.executable, "main.py"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, api: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get(f"{api}/browser-pools/list")).is_success:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError("Server didn't start in time")
+        await asyncio.sleep(0.5)
+
+
+async def session_cycle(client: httpx.AsyncClient, api: str, pool_id: str) -> bool:
+    response = await client.get(f"{api}/sessions/new", params={"pool_id": pool_id})
+    if not response.is_success:
+        return False
+    session_id = response.json()["session_id"]
+    await client.post(
+        f"{api}/sessions/action/{session_id}",
+        json={"action": "evaluate", "code": "() => document.title"},
+    )
+    await client.patch(f"{api}/sessions/close/{session_id}")
+    return True
+
+
+async def run_load(api: str, workers: int, concurrency: int, duration: float) -> float:
+    "Completed session cycles per second"
+    async with httpx.AsyncClient(timeout=60) as client:
+        await wait_until_ready(client, api)
+        pool_config = dict(POOL_CONFIG, max_browsers=max(concurrency // workers, 1))
+        pool_id = (await client.post(f"{api}/browser-pools", json=pool_config)).json()["pool_id"]
+        await asyncio.sleep(5)  # let warm browsers launch
+
+        completed = 0
+        deadline = time.monotonic() + duration
+
+        async def client_loop() -> None:
+            nonlocal completed
+            while time.monotonic() < deadline:
+                if await session_cycle(client, api, pool_id):
+                    completed += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*[client_loop() for _ in range(concurrency)])
+        elapsed = time.monotonic() - started
+        await client.delete(f"{api}/browser-pools/{pool_id}", params={"force": True})
+        return completed / elapsed
+
+
+async def main(worker_counts: list[int], concurrency: int, duration: float, port: int) -> None:
+    print(f"{'workers':<10}{'sessions/s':>12}{'speedup':>10}{'efficiency':>12}")
+    baseline = None
+    for workers in worker_counts:
+        server = start_server(workers, port)
+        try:
+            throughput = await run_load(
+                f"http://127.0.0.1:{port}/api/v1", workers, concurrency, duration
+            )
+        finally:
+            server.terminate()
+            server.wait()
+            await asyncio.sleep(2)  # release ports
+
+        baseline = baseline or throughput / workers
+        speedup = throughput / baseline if baseline else 0
+        print(f"{workers:<10}{throughput:>12.1f}{speedup:>10.2f}{speedup / workers:>12.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.concurrency, args.duration, args.port))
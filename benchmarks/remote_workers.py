@@ -0,0 +1,114 @@
+"""
+Start several local Chromium processes with remote debugging enabled, register them as remote
+browser workers of a new pool on a running WebPilot instance, and spread page sessions across them.
+
+Usage:
+    ENVIRONMENT=localhost PYTHONPATH=./src python benchmarks/remote_workers.py [--workers 3] [--sessions 30] [--api http://localhost:8000/api/v1]
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+import urllib.request
+
+from web_pilot.config import config as conf
+
+
+def request(method: str, url: str, body: dict = None) -> dict:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(
+        url, data=data, method=method, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req) as response:
+        payload = response.read()
+        return json.loads(payload) if payload else {}
+
+
+def start_worker(port: int) -> tuple[subprocess.Popen, str]:
+    "Launch a headless Chromium listening for CDP connections on the given port"
+    profile_dir = tempfile.mkdtemp(prefix=f"web_pilot_worker_{port}_")
+    process = subprocess.Popen(
+        [
+            conf.chromium_path,
+            "--headless",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={profile_dir}",
+            "about:blank",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return process, profile_dir
+
+
+def wait_for_worker(port: int, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            request("GET", f"http://127.0.0.1:{port}/json/version")
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def main(workers: int, sessions: int, api: str, base_port: int) -> None:
+    processes = [start_worker(base_port + i) for i in range(workers)]
+    try:
+        for i in range(workers):
+            wait_for_worker(base_port + i)
+
+        pool_id = request("POST", f"{api}/browser-pools", {"max_browsers": 1})["pool_id"]
+        for i in range(workers):
+            request(
+                "POST",
+                f"{api}/browser-pools/{pool_id}/workers",
+                {"ws_endpoint": f"http://127.0.0.1:{base_port + i}"},
+            )
+
+        started = time.perf_counter()
+        session_ids = await asyncio.gather(
+            *[
+                asyncio.to_thread(request, "GET", f"{api}/sessions/new?pool_id={pool_id}")
+                for _ in range(sessions)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+        print(f"Started {sessions} sessions in {elapsed:.2f} sec.")
+
+        # session-ID: <pool-ID>_<browser-ID>_<page-ID>
+        placements = collections.Counter(
+            [response["session_id"].split("_")[1] for response in session_ids]
+        )
+        workers_info = request("GET", f"{api}/browser-pools/{pool_id}/workers")["workers"]
+        for worker in workers_info:
+            print(
+                f"{worker['ws_endpoint']:<26} sessions={placements.get(worker['id'], 0):<4} "
+                f"free_slots={worker['free_slots']:<5} latency={worker['latency']}"
+            )
+
+        request("DELETE", f"{api}/browser-pools/{pool_id}?force=true")
+
+    finally:
+        for process, profile_dir in processes:
+            process.terminate()
+            process.wait()
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--api", default=f"http://localhost:{conf.host_port}{conf.v1_url_prefix}")
+    parser.add_argument("--base-port", type=int, default=9222)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.sessions, args.api, args.base_port))
@@ -0,0 +1,101 @@
+"""
+Measure the size & CPU cost of encoding large session responses (page contents, accessibility
+trees, JS coverage) with every negotiable combination of media type and content encoding.
+MessagePack & zstd combinations are measured when `msgpack` / `zstandard` are installed.
+
+Usage:
+    ENVIRONMENT=localhost PYTHONPATH=./src python benchmarks/response_encoding.py [--size-mb 4] [--rounds 20]
+"""
+
+import argparse
+import random
+import string
+import time
+
+from web_pilot.utils.encoding import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+    encode_body,
+    msgpack,
+    zstandard,
+)
+
+
+def random_text(length: int) -> str:
+    words = [
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(2, 10))) for _ in range(500)
+    ]
+    text = []
+    while sum(map(len, text)) < length:
+        text.append(random.choice(words))
+    return " ".join(text)
+
+
+def page_contents(size: int) -> dict:
+    paragraphs = [f'<p class="c{i % 7}">{random_text(400)}</p>' for i in range(size // 400)]
+    return {
+        "url": "https://example.com/",
+        "title": "benchmark",
+        "content": f"<html><body>{''.join(paragraphs)}</body></html>",
+        "cookies": [],
+    }
+
+
+def accessibility_tree(size: int) -> dict:
+    def node(depth: int) -> dict:
+        children = [node(depth + 1) for _ in range(4)] if depth < 6 else []
+        return {
+            "role": random.choice(["link", "text", "button"]),
+            "name": random_text(40),
+            "children": children,
+        }
+
+    return {"tree": [node(0) for _ in range(max(size // 250_000, 1))]}
+
+
+def js_coverage(size: int) -> dict:
+    return {
+        "coverage": [
+            {
+                "url": f"https://example.com/script-{i}.js",
+                "ranges": [{"start": j * 40, "end": j * 40 + 25} for j in range(200)],
+                "text": random_text(size // 50),
+            }
+            for i in range(50)
+        ]
+    }
+
+
+def main(size_mb: float, rounds: int) -> None:
+    size = int(size_mb * 1024 * 1024)
+    media_types = [JSON_MEDIA_TYPE] + ([MSGPACK_MEDIA_TYPES[0]] if msgpack else [])
+    encodings = [None, "gzip"] + (["zstd"] if zstandard else [])
+
+    print(
+        f"{'payload':<20}{'media type':<22}{'encoding':<10}{'bytes':>12}{'ratio':>8}{'cpu ms':>10}"
+    )
+    for name, payload in [
+        ("page contents", page_contents(size)),
+        ("accessibility tree", accessibility_tree(size)),
+        ("js coverage", js_coverage(size)),
+    ]:
+        baseline = None
+        for media_type in media_types:
+            for encoding in encodings:
+                started = time.process_time()
+                for _ in range(rounds):
+                    body, _ = encode_body(payload, media_type, encoding)
+                cpu_ms = (time.process_time() - started) / rounds * 1000
+                baseline = baseline or len(body)
+                print(
+                    f"{name:<20}{media_type:<22}{encoding or 'identity':<10}{len(body):>12,}"
+                    f"{len(body) / baseline:>8.2f}{cpu_ms:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.size_mb, args.rounds)
@@ -0,0 +1,119 @@
+"""
+Compare per-action latency of a page session driven over the REST action route against the
+websocket session channel, on a running WebPilot instance - sequentially (one action at a time)
+and pipelined (many actions in flight on the same session).
+The instance's RATE_LIMIT should allow the REST route's request rate.
+
+Usage:
+    PYTHONPATH=./src python benchmarks/ws_vs_rest_latency.py [--actions 500] [--pipeline 16] [--api http://localhost:8000/api/v1]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import httpx
+import websockets
+
+
+POOL_CONFIG = {
+    "headless": True,
+    "incognito": False,
+    "gpu": False,
+    "privacy": False,
+    "ignore_http_errors": True,
+    "spa_mode": False,
+    "proxy_server": None,
+    "platform": None,
+    "browser": None,
+    "launch_preset": "lean-scrape",
+}
+ACTION = {"action": "evaluate", "code": "() => document.title"}
+
+
+def summarize(name: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<22}{statistics.median(latencies):>10.2f}{p99:>10.2f}"
+        f"{len(latencies) / elapsed:>14.1f}"
+    )
+
+
+async def rest_actions(
+    client: httpx.AsyncClient, api: str, session_id: str, actions: int, pipeline: int
+) -> None:
+    latencies = []
+    semaphore = asyncio.Semaphore(pipeline)
+
+    async def act() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(f"{api}/sessions/action/{session_id}", json=ACTION)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[act() for _ in range(actions)])
+    summarize(f"rest (x{pipeline})", latencies, time.perf_counter() - started)
+
+
+async def ws_actions(api: str, session_id: str, actions: int, pipeline: int) -> None:
+    url = f"{api.replace('http', 'ws', 1)}/sessions/ws/{session_id}"
+    latencies = []
+    async with websockets.connect(url, max_size=None) as ws:
+        sent_at, replies = {}, asyncio.Queue()
+
+        async def receive() -> None:
+            async for message in ws:
+                message = json.loads(message)
+                if "id" in message:
+                    await replies.put(message)
+
+        receiver = asyncio.create_task(receive())
+        started = time.perf_counter()
+        next_id = 0
+        for _ in range(actions):
+            if len(sent_at) >= pipeline:
+                reply = await replies.get()
+                latencies.append((time.perf_counter() - sent_at.pop(reply["id"])) * 1000)
+            sent_at[next_id] = time.perf_counter()
+            await ws.send(json.dumps({"id": next_id, **ACTION}))
+            next_id += 1
+        while sent_at:
+            reply = await replies.get()
+            latencies.append((time.perf_counter() - sent_at.pop(reply["id"])) * 1000)
+        elapsed = time.perf_counter() - started
+        receiver.cancel()
+    summarize(f"websocket (x{pipeline})", latencies, elapsed)
+
+
+async def main(api: str, actions: int, pipeline: int) -> None:
+    async with httpx.AsyncClient(timeout=60) as client:
+        pool_config = dict(POOL_CONFIG, max_browsers=1)
+        pool_id = (await client.post(f"{api}/browser-pools", json=pool_config)).json()["pool_id"]
+        try:
+            session_id = (
+                await client.get(f"{api}/sessions/new", params={"pool_id": pool_id})
+            ).json()["session_id"]
+            await client.post(
+                f"{api}/sessions/action/{session_id}",
+                json={"action": "setContent", "content": "<title>benchmark</title>"},
+            )
+
+            print(f"{'channel':<22}{'p50 (ms)':>10}{'p99 (ms)':>10}{'actions/s':>14}")
+            for depth in sorted({1, pipeline}):
+                await rest_actions(client, api, session_id, actions, depth)
+                await ws_actions(api, session_id, actions, depth)
+        finally:
+            await client.delete(f"{api}/browser-pools/{pool_id}", params={"force": True})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, default=500)
+    parser.add_argument("--pipeline", type=int, default=16)
+    parser.add_argument("--api", default="http://localhost:8000/api/v1")
+    args = parser.parse_args()
+    asyncio.run(main(args.api, args.actions, args.pipeline))
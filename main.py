@@ -1,16 +1,63 @@
+import asyncio
+import multiprocessing
 import uvicorn
 
 from web_pilot.config import config as conf
+from web_pilot.utils.headless import HeadlessUtil
+from web_pilot.utils.profiles import ProfileManager
 
 
-if __name__ == "__main__":
+def run_worker(worker_id: int) -> None:
+    "A worker process of the multi-worker mode - only reachable through the dispatcher"
+    conf.worker_id = worker_id
     uvicorn.run(
         "web_pilot.api.app:app",
-        host=conf.host_address,
-        port=conf.host_port,
-        access_log=conf.access_log,
-        workers=conf.workers_count,
+        host="127.0.0.1",
+        port=conf.workers_base_port + worker_id,
+        access_log=False,
+        proxy_headers=True,
+        forwarded_allow_ips="127.0.0.1",
         limit_concurrency=conf.limit_concurrency,
-        limit_max_requests=conf.limit_max_requests,
         loop="uvloop",
     )
+
+
+if __name__ == "__main__":
+    if conf.workers_count > 1:
+        # pools & page sessions live in-process - uvicorn's own workers can't share them, so
+        # each worker runs its own server behind a dispatcher routing requests by session ID.
+        # Chromium & the template profile are prepared once, before the workers race to do it
+        HeadlessUtil.check_chromium()
+        if conf.ephemeral_profiles:
+            asyncio.run(ProfileManager.prepare_template())
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(worker_id,), daemon=True)
+            for worker_id in range(conf.workers_count)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            uvicorn.run(
+                "web_pilot.api.dispatcher:app",
+                host=conf.host_address,
+                port=conf.host_port,
+                access_log=conf.access_log,
+                limit_concurrency=conf.limit_concurrency * conf.workers_count,
+                limit_max_requests=conf.limit_max_requests,
+                loop="uvloop",
+            )
+        finally:
+            for worker in workers:
+                worker.terminate()
+                worker.join()
+
+    else:
+        uvicorn.run(
+            "web_pilot.api.app:app",
+            host=conf.host_address,
+            port=conf.host_port,
+            access_log=conf.access_log,
+            limit_concurrency=conf.limit_concurrency,
+            limit_max_requests=conf.limit_max_requests,
+            loop="uvloop",
+        )
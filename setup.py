@@ -23,8 +23,14 @@ setup(
         "redis>=5.2.0,<6.0.0",
         "psutil>=6.1.0,<7.0.0",
         "nanoid>=2.0.0,<3.0.0",
+        "httpx>=0.27.0,<1.0.0",
+        "websockets>=10.4,<11.0",
     ],
     extras_require={
+        "fast-encoding": [
+            "msgpack>=1.1.0,<2.0.0",
+            "zstandard>=0.23.0,<0.24.0",
+        ],
         "dev": [
             "pytest>=7.4.2,<8.0.0",
             "pytest-asyncio>=0.21.1,<1.0.0",
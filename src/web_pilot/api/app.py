@@ -6,14 +6,21 @@ from web_pilot.api.routes.browser_pool import router as BrowserPoolRouter
 from web_pilot.api.routes.sessions import router as SessionsRouter
 from web_pilot.config import config as conf
 from web_pilot.utils.headless import HeadlessUtil
+from web_pilot.utils.encoding import check_codecs
 from web_pilot.clients.pools_admin import PoolAdmin
 from web_pilot.utils.decorators import repeat_every
+from web_pilot.utils.resource_sampler import ResourceSampler
+from web_pilot.utils.profiles import ProfileManager
+from web_pilot.utils.response_cache import ResponseCache
+from web_pilot.utils.metadata_store import metadata_store
+from web_pilot.utils.expiry_scheduler import ExpiryScheduler
 from web_pilot.exc import (
     PoolIsInactiveError,
     PoolAlreadyExistsError,
     NoAvailableBrowserError,
     RateLimitsExceededError,
     InvalidSessionIDError,
+    SessionActionQueueFullError,
     PageSessionNotFoundError,
     BrowserPoolCapacityReachedError,
 )
@@ -69,6 +76,11 @@ async def rate_limit_exceeded_handler(request, exc):
     raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc))
 
 
+@app.exception_handler(SessionActionQueueFullError)
+async def session_action_queue_full_handler(request, exc):
+    raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(exc))
+
+
 @app.exception_handler(InvalidSessionIDError)
 async def invalid_session_id_handler(request, exc):
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
@@ -95,9 +107,30 @@ async def check_chromium():
     HeadlessUtil.check_chromium()
 
 
+@app.on_event("startup")
+async def check_response_codecs():
+    check_codecs()
+
+
+@app.on_event("startup")
+async def sweep_orphaned_profiles():
+    await ProfileManager.sweep_orphaned_profiles()
+
+
+@app.on_event("startup")
+async def sweep_orphaned_response_caches():
+    await ResponseCache.sweep_orphaned_dirs(conf.response_cache_dir)
+
+
+@app.on_event("startup")
+async def prepare_template_profile():
+    if conf.ephemeral_profiles:
+        await ProfileManager.prepare_template()
+
+
 @repeat_every(interval=conf.idle_pool_deletion_interval)
 async def delete_unused_pools():
-    PoolAdmin.remove_deletion_candidates()
+    await PoolAdmin.remove_deletion_candidates()
 
 
 @repeat_every(interval=conf.pools_scaling_check_interval)
@@ -105,7 +138,60 @@ async def manage_pools_scaling():
     await PoolAdmin.manage_pools_scaling()
 
 
+@repeat_every(interval=conf.warm_browsers_check_interval)
+async def maintain_warm_browsers():
+    await PoolAdmin.maintain_warm_browsers()
+
+
+@repeat_every(interval=conf.browsers_recycle_check_interval)
+async def manage_browsers_recycling():
+    await PoolAdmin.manage_browsers_recycling()
+
+
+@repeat_every(interval=conf.resource_sampling_interval)
+async def sample_browsers_resources():
+    await ResourceSampler.sample_all()
+    PoolAdmin.refresh_placement_indexes()
+
+
+@repeat_every(interval=conf.remote_browsers_health_check_interval)
+async def check_remote_browsers():
+    await PoolAdmin.check_remote_browsers()
+
+
+@repeat_every(interval=conf.metadata_flush_interval)
+async def flush_metadata():
+    await metadata_store.flush()
+
+
+@repeat_every(interval=conf.metadata_publish_interval)
+async def publish_metadata():
+    PoolAdmin.publish_metadata()
+
+
+@repeat_every(interval=conf.expiry_check_interval)
+async def expire_sessions():
+    await ExpiryScheduler.run_expirations()
+
+
+@app.on_event("shutdown")
+async def close_browsers():
+    await PoolAdmin.close_all_pools()
+
+
+@app.on_event("shutdown")
+async def close_metadata_store():
+    await metadata_store.close()
+
+
 @app.on_event("startup")
 async def register_background_tasks():
     asyncio.create_task(delete_unused_pools())
     asyncio.create_task(manage_pools_scaling())
+    asyncio.create_task(maintain_warm_browsers())
+    asyncio.create_task(sample_browsers_resources())
+    asyncio.create_task(manage_browsers_recycling())
+    asyncio.create_task(check_remote_browsers())
+    asyncio.create_task(flush_metadata())
+    asyncio.create_task(publish_metadata())
+    asyncio.create_task(expire_sessions())
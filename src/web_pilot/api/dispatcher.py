@@ -0,0 +1,325 @@
+import asyncio
+import itertools
+import httpx
+import websockets
+
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+from web_pilot.utils.limiter import rate_limiter
+from web_pilot.utils.sessions import worker_id_of_browser
+from web_pilot.exc import RateLimitsExceededError
+
+
+# headers describing a single connection - never forwarded by the proxy
+_HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+}
+
+
+class WorkerDispatcher:
+    """
+    Front proxy of the multi-worker mode. Every worker process owns its own pools' browsers and
+    page sessions - requests of a session are routed to the worker whose ID is embedded in the
+    session's browser ID, new sessions are spread across workers, and pool management requests
+    are broadcast, so every worker holds the same pools. A pool's browser counts (min/max browsers,
+    warm browsers) therefore apply per worker - its total is multiplied by the workers count.
+    """
+
+    workers: list[str]
+    _client: Optional[httpx.AsyncClient]
+
+    def __init__(self, workers_count: int, base_port: int) -> None:
+        self.workers = [f"http://127.0.0.1:{base_port + i}" for i in range(workers_count)]
+        self._next_worker = itertools.cycle(range(workers_count))
+        self._client = None
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(None, connect=5),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+        )
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.aclose()
+
+    def worker_of_session(self, session_id: str) -> Optional[int]:
+        parts = session_id.split("_")
+        if len(parts) != 3:
+            return None
+        return self.worker_of_browser(parts[1])
+
+    def worker_of_browser(self, browser_id: str) -> Optional[int]:
+        worker_id = worker_id_of_browser(browser_id)
+        if worker_id is None or worker_id >= len(self.workers):
+            return None
+        return worker_id
+
+    def next_worker(self) -> int:
+        return next(self._next_worker)
+
+    def _build_request(self, worker_id: int, request: Request, body: bytes) -> httpx.Request:
+        headers = {
+            key: value
+            for key, value in request.headers.items()
+            if key.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        # workers trust the dispatcher's forwarded headers - per-client rate limits keep working
+        headers["x-forwarded-for"] = request.client.host if request.client else "127.0.0.1"
+        return self._client.build_request(
+            request.method,
+            f"{self.workers[worker_id]}{request.url.path}",
+            params=request.query_params.multi_items(),
+            headers=headers,
+            content=body,
+        )
+
+    async def forward(self, worker_id: int, request: Request, body: bytes) -> Response:
+        "Proxy the request to a worker - the response is streamed back as it arrives"
+        try:
+            response = await self._client.send(
+                self._build_request(worker_id, request, body), stream=True
+            )
+        except httpx.TransportError as e:
+            raise _worker_unreachable(worker_id, e)
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={
+                key: value
+                for key, value in response.headers.items()
+                if key.lower() not in _HOP_BY_HOP_HEADERS
+            },
+            background=response.aclose,
+        )
+
+    async def broadcast(self, request: Request, body: bytes) -> list[httpx.Response]:
+        "Send the request to every worker, return their (fully read) responses"
+
+        async def send(worker_id: int) -> httpx.Response:
+            try:
+                return await self._client.send(self._build_request(worker_id, request, body))
+            except httpx.TransportError as e:
+                raise _worker_unreachable(worker_id, e)
+
+        return await asyncio.gather(*[send(worker_id) for worker_id in range(len(self.workers))])
+
+    async def forward_websocket(self, worker_id: int, websocket: WebSocket) -> None:
+        "Proxy a websocket to a worker - messages are relayed both ways until either side closes"
+        url = self.workers[worker_id].replace("http://", "ws://", 1) + websocket.url.path
+        if websocket.url.query:
+            url += f"?{websocket.url.query}"
+        try:
+            upstream = await websockets.connect(url, max_size=None, ping_interval=None)
+        except (OSError, websockets.InvalidHandshake) as e:
+            logger.warning(f"Worker {worker_id} refused the websocket: {e}")
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            return
+
+        await websocket.accept()
+
+        # frames are relayed as-is - text (JSON) or binary (screenshots, PDFs, screencast frames)
+        async def to_worker() -> None:
+            try:
+                while True:
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        break
+                    if message.get("bytes") is not None:
+                        await upstream.send(message["bytes"])
+                    else:
+                        await upstream.send(message.get("text") or "")
+            except (WebSocketDisconnect, websockets.ConnectionClosed):
+                pass
+
+        async def to_client() -> None:
+            try:
+                async for message in upstream:
+                    if isinstance(message, bytes):
+                        await websocket.send_bytes(message)
+                    else:
+                        await websocket.send_text(message)
+                await websocket.close(code=upstream.close_code or status.WS_1000_NORMAL_CLOSURE)
+            except (RuntimeError, websockets.ConnectionClosed):
+                pass  # RuntimeError - the client's socket is already closed
+
+        relays = [asyncio.create_task(to_worker()), asyncio.create_task(to_client())]
+        try:
+            await asyncio.wait(relays, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for relay in relays:
+                relay.cancel()
+            await upstream.close()
+
+    async def forward_with_failover(self, request: Request, body: bytes) -> Response:
+        "Try workers round-robin, moving on while they're at full capacity or unreachable"
+        response = None
+        for _ in range(len(self.workers)):
+            worker_id = self.next_worker()
+            try:
+                response = await self._client.send(self._build_request(worker_id, request, body))
+            except httpx.TransportError as e:
+                logger.warning(f"Worker {worker_id} is unreachable: {e}")
+                continue
+            if response.status_code != status.HTTP_503_SERVICE_UNAVAILABLE:
+                break
+
+        if response is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="No worker is available"
+            )
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            headers={
+                key: value
+                for key, value in response.headers.items()
+                if key.lower() not in _HOP_BY_HOP_HEADERS
+            },
+        )
+
+
+def _worker_unreachable(worker_id: int, error: httpx.TransportError) -> HTTPException:
+    "A worker that can't be connected to is unavailable (503) - one failing mid-request is a bad gateway (502)"
+    logger.warning(f"Worker {worker_id} is unreachable: {error}")
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Worker is unavailable"
+        )
+    return HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Worker failed to respond")
+
+
+def _first_response(responses: list[httpx.Response]) -> Response:
+    "Response of a broadcast - the first successful one, or the first error if all have failed"
+    response = next((response for response in responses if response.is_success), responses[0])
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type"),
+    )
+
+
+def _merge_pools(pool_id: str, responses: list[httpx.Response]) -> Response:
+    pools = [response.json()["pool"] for response in responses if response.is_success]
+    if not pools:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "pool": {
+                "id": pool_id,
+                **{
+                    key: sum([pool[key] for pool in pools])
+                    for key in ["browser_count", "total_pages", "capacity", "warm_browsers"]
+                },
+                "workers": pools,
+            }
+        },
+    )
+
+
+def _merge_remote_browsers(responses: list[httpx.Response]) -> Response:
+    listings = [response.json() for response in responses if response.is_success]
+    if not listings:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "remote_capacity": sum([listing["remote_capacity"] for listing in listings]),
+            "workers": [worker for listing in listings for worker in listing["workers"]],
+        },
+    )
+
+
+dispatcher = WorkerDispatcher(conf.workers_count, conf.workers_base_port)
+app = FastAPI(title="🌐🕹️ WebPilot Dispatcher", version=conf.app_version, openapi_url=None)
+
+
+@app.on_event("startup")
+async def start_dispatcher():
+    await dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def close_dispatcher():
+    await dispatcher.close()
+
+
+@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+async def dispatch(request: Request, path: str):
+    try:
+        rate_limiter(request)
+    except RateLimitsExceededError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+    body = await request.body()
+    segments = request.url.path.removeprefix(conf.v1_url_prefix).strip("/").split("/")
+    match segments:
+        case ["sessions", "new"]:
+            return await dispatcher.forward_with_failover(request, body)
+
+        case ["sessions", *_, session_id] if session_id != "actions":
+            worker_id = dispatcher.worker_of_session(session_id)
+            if worker_id is None:
+                # not a multi-worker session ID - let a worker reject it
+                worker_id = dispatcher.next_worker()
+            return await dispatcher.forward(worker_id, request, body)
+
+        case ["browser-pools"] if request.method == "POST":
+            return _first_response(await dispatcher.broadcast(request, body))
+
+        case ["browser-pools", pool_id] if pool_id != "list":
+            responses = await dispatcher.broadcast(request, body)
+            if request.method == "GET":
+                return _merge_pools(pool_id, responses)
+            return _first_response(responses)
+
+        case ["browser-pools", _, "workers"] if request.method == "GET":
+            return _merge_remote_browsers(await dispatcher.broadcast(request, body))
+
+        case ["browser-pools", _, "workers", browser_id]:
+            worker_id = dispatcher.worker_of_browser(browser_id)
+            if worker_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Worker not found"
+                )
+            return await dispatcher.forward(worker_id, request, body)
+
+        case _:
+            return await dispatcher.forward(dispatcher.next_worker(), request, body)
+
+
+@app.websocket("/{path:path}")
+async def dispatch_websocket(websocket: WebSocket, path: str):
+    try:
+        rate_limiter(websocket)
+    except RateLimitsExceededError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+
+    worker_id = dispatcher.worker_of_session(websocket.url.path.rstrip("/").split("/")[-1])
+    if worker_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Session not found")
+        return
+    await dispatcher.forward_websocket(worker_id, websocket)
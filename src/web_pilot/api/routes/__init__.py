@@ -2,6 +2,8 @@ from fastapi import APIRouter, status
 
 from web_pilot.config import config as conf
 from web_pilot.clients.pools_admin import PoolAdmin
+from web_pilot.utils.metadata_store import metadata_store
+from web_pilot.utils.expiry_scheduler import ExpiryScheduler
 
 
 router = APIRouter(prefix="")
@@ -17,5 +19,7 @@ async def index():
         version=conf.app_version,
         activity={
             "pools": PoolAdmin.list_pools(),
+            "cluster": await metadata_store.summary(),
+            "expiry": ExpiryScheduler.metrics(),
         },
     )
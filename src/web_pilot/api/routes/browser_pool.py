@@ -2,7 +2,9 @@ from fastapi import APIRouter, status, HTTPException, Query, Depends
 from fastapi.responses import JSONResponse
 from web_pilot.config import config as conf
 from web_pilot.clients.pools_admin import PoolAdmin
-from web_pilot.schemas.requests import PoolAdminCreateReq
+from web_pilot.schemas.requests import PoolAdminCreateReq, RemoteBrowserRegisterReq
+from web_pilot.exc import FailedToLaunchBrowser
+from web_pilot.utils.metadata_store import metadata_store
 from web_pilot.utils.limiter import rate_limiter
 
 
@@ -16,7 +18,7 @@ router = APIRouter(prefix=f"{conf.v1_url_prefix}/browser-pools", tags=["Browser-
     dependencies=[Depends(rate_limiter)],
 )
 async def create_browser_pool(config: PoolAdminCreateReq):
-    pool_id = PoolAdmin.create_new_pool(config.dict(exclude_none=True))
+    pool_id = PoolAdmin.create_new_pool(config.model_dump(mode="json", exclude_none=True))
     return JSONResponse(status_code=status.HTTP_201_CREATED, content={"pool_id": pool_id})
 
 
@@ -44,6 +46,20 @@ async def get_pool(pool_id: str):
     return JSONResponse(status_code=status.HTTP_200_OK, content={"pool": pool.__repr__()})
 
 
+@router.get(
+    "/{pool_id}/cluster",
+    status_code=status.HTTP_200_OK,
+    description="Get a browser-pool's capacity & sessions across all WebPilot processes",
+    dependencies=[Depends(rate_limiter)],
+)
+async def get_pool_cluster_view(pool_id: str):
+    summary = await metadata_store.summary(pool_id)
+    if not summary["pools"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content={"cluster": summary})
+
+
 @router.delete(
     "/{pool_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -51,4 +67,75 @@ async def get_pool(pool_id: str):
     dependencies=[Depends(rate_limiter)],
 )
 async def delete_pool(pool_id: str, force: bool = Query(default=False)):
-    PoolAdmin.delete_pool(pool_id, force)
+    await PoolAdmin.delete_pool(pool_id, force)
+
+
+@router.post(
+    "/{pool_id}/workers",
+    status_code=status.HTTP_201_CREATED,
+    description="Register a remote browser worker to a browser-pool by its CDP websocket endpoint",
+    dependencies=[Depends(rate_limiter)],
+)
+async def register_remote_browser(pool_id: str, worker: RemoteBrowserRegisterReq):
+    pool = PoolAdmin.get_pool(pool_id)
+    if not pool:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    try:
+        browser = await pool.register_remote_browser(worker.ws_endpoint, worker.max_pages)
+    except FailedToLaunchBrowser as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Unable to connect to remote browser: {e.message}",
+        )
+    return JSONResponse(status_code=status.HTTP_201_CREATED, content={"browser_id": browser.id_})
+
+
+@router.get(
+    "/{pool_id}/workers",
+    status_code=status.HTTP_200_OK,
+    description="List a browser-pool's remote browser workers and their capacity",
+    dependencies=[Depends(rate_limiter)],
+)
+async def list_remote_browsers(pool_id: str):
+    pool = PoolAdmin.get_pool(pool_id)
+    if not pool:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "remote_capacity": pool.remote_capacity,
+            "workers": [
+                dict(
+                    browser.__repr__(),
+                    max_pages=browser.max_pages,
+                    free_slots=(
+                        max(browser.max_pages - browser.load, 0) if browser.is_healthy else 0
+                    ),
+                )
+                for browser in pool.remote_browsers
+            ],
+        },
+    )
+
+
+@router.delete(
+    "/{pool_id}/workers/{browser_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="Detach a remote browser worker from a browser-pool - the worker itself keeps running",
+    dependencies=[Depends(rate_limiter)],
+)
+async def remove_remote_browser(pool_id: str, browser_id: str, force: bool = Query(default=False)):
+    pool = PoolAdmin.get_pool(pool_id)
+    if not pool:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    browser = pool.get_browser_by_id(browser_id)
+    if not browser or not browser.is_remote:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Worker not found")
+    if not await pool.remove_browser_by_id(browser_id, force=force):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Worker has live page sessions - use 'force' to detach it anyway",
+        )
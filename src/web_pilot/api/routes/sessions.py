@@ -1,14 +1,34 @@
 import asyncio
+import json
+import pydantic as pyd
 
-from fastapi import APIRouter, status, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from time import monotonic
+from typing import AsyncIterator, Literal, Optional
+from fastapi import (
+    APIRouter,
+    Request,
+    status,
+    HTTPException,
+    Depends,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from web_pilot.clients.pools_admin import PoolAdmin
+from web_pilot.clients.leased_browser import LeasedBrowser
 from web_pilot.config import config as conf
-from web_pilot.schemas.requests import PageActionRequest, PageActionType
+from web_pilot.schemas.requests import PageActionRequest, PageActionBatchRequest, PageActionType
 from web_pilot.schemas.responses import PageContentResponse
+from web_pilot.schemas.pages import BinaryContent
 from web_pilot.logger import logger
-from web_pilot.exc import PageSessionNotFoundError
+from web_pilot.exc import (
+    PageSessionNotFoundError,
+    RateLimitsExceededError,
+    UnableToPerformActionError,
+)
 from web_pilot.utils.limiter import rate_limiter
+from web_pilot.utils.encoding import encoded_response
 
 
 router = APIRouter(prefix=f"{conf.v1_url_prefix}/sessions", tags=["Page Sessions"])
@@ -46,12 +66,41 @@ async def start_page_session(pool_id: str) -> str:
     )
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    description="Start many page sessions at once - placed across the pool's browsers",
+    dependencies=[Depends(rate_limiter)],
+)
+async def start_page_sessions(pool_id: str, count: int = Query(gt=0, le=conf.bulk_sessions_max)):
+    pool = PoolAdmin.get_pool(pool_id)
+    if not pool:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pool not found")
+
+    session_ids, failures = await pool.start_page_sessions(count)
+    if not session_ids:
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    elif failures:
+        status_code = status.HTTP_207_MULTI_STATUS
+    else:
+        status_code = status.HTTP_201_CREATED
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "requested": count,
+            "created": len(session_ids),
+            "session_ids": session_ids,
+            "failures": failures,
+        },
+    )
+
+
 @router.get("/{session_id}", status_code=status.HTTP_200_OK)
-async def get_page_session_metrics(session_id: str):
+async def get_page_session_metrics(request: Request, session_id: str):
     try:
         _, _, page_session = PoolAdmin.get_session_parent_chain(session_id, peek=True)
         response = await page_session.get_page_metrics()
-        return JSONResponse(status_code=status.HTTP_200_OK, content=response)
+        return await encoded_response(request, response, status.HTTP_200_OK)
 
     except PageSessionNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
@@ -69,7 +118,7 @@ async def get_page_session_metrics(session_id: str):
 )
 async def close_page_session(session_id: str) -> None:
     try:
-        _, browser, page_session = PoolAdmin.get_session_parent_chain(session_id)
+        _, browser, page_session = PoolAdmin.get_session_parent_chain(session_id, peek=True)
         await browser.close_page_session(page_session.id_)
 
     except PageSessionNotFoundError:
@@ -87,22 +136,228 @@ async def close_page_session(session_id: str) -> None:
     description="Perform an action on a remote page session",
     dependencies=[Depends(rate_limiter)],
 )
-async def perform_action_on_page(session_id: str, args: PageActionRequest):
+async def perform_action_on_page(request: Request, session_id: str, args: PageActionRequest):
     with logger.contextualize(session_id=session_id, action=args.action.value):
-        # helper function
-        async def action_on_page(session_id: str, args: PageActionRequest):
-            _, browser, page = PoolAdmin.get_session_parent_chain(session_id)
-            response = await page.perform_page_action(**args.dict())
-            browser.put_page_session(page.id_, page)
+        try:
+            # the session stays in place - concurrent requests queue up behind its running action
+            _, browser, page = PoolAdmin.get_session_parent_chain(session_id, peek=True)
+            kwargs = args.dict()
+            if args.action == PageActionType.EXTRACT_PAGE_CONTENTS:
+                kwargs.setdefault("ifNoneMatch", request.headers.get("if-none-match"))
+            response = await page.submit_action(**kwargs)
+            browser.touch_page_session(page.id_)
+            if isinstance(response, BinaryContent):
+                # raw bytes - screenshots & PDFs
+                return Response(content=response.content, media_type=response.media_type)
             if isinstance(response, dict) and "error" in response:
-                return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=response)
-            return JSONResponse(status_code=status.HTTP_200_OK, content=response)
+                return await encoded_response(request, response, status.HTTP_400_BAD_REQUEST)
+            if isinstance(response, dict) and response.get("notModified"):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": response["etag"]}
+                )
+            encoded = await encoded_response(request, response, status.HTTP_200_OK)
+            if isinstance(response, dict) and "etag" in response:
+                encoded.headers["ETag"] = response["etag"]
+            return encoded
 
+        except KeyError as e:
+            logger.error(e)
+            raise HTTPException(status_code=status.HTTP_204_NO_CONTENT, detail=str(e))
+
+
+@router.post(
+    "/batch/{session_id}",
+    status_code=status.HTTP_200_OK,
+    description="Perform a sequence of actions on a remote page session, in a single request",
+    dependencies=[Depends(rate_limiter)],
+)
+async def perform_batch_on_page(request: Request, session_id: str, args: PageActionBatchRequest):
+    with logger.contextualize(session_id=session_id, action="batch"):
         try:
-            return await asyncio.wait_for(
-                action_on_page(session_id, args), timeout=conf.default_timeout
-            )
+            _, browser, page = PoolAdmin.get_session_parent_chain(session_id, peek=True)
+            response = await page.submit_batch([step.dict() for step in args.steps])
+            browser.touch_page_session(page.id_)
+            return await encoded_response(request, response, status.HTTP_200_OK)
 
         except KeyError as e:
             logger.error(e)
             raise HTTPException(status_code=status.HTTP_204_NO_CONTENT, detail=str(e))
+
+
+@router.websocket("/ws/{session_id}")
+async def page_session_channel(websocket: WebSocket, session_id: str):
+    """
+    A persistent channel to a page session - messages are actions (`{"id": ..., "action": ...}`),
+    each answered with `{"id": ..., "status": "ok" | "error", ...}` as soon as it completes.
+    Actions run through the session's queue, in order; page events are pushed as `{"event": ...}`.
+    """
+    try:
+        rate_limiter(websocket)
+        _, browser, page = PoolAdmin.get_session_parent_chain(session_id, peek=True)
+    except RateLimitsExceededError as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+    except PageSessionNotFoundError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Session not found")
+        return
+
+    await websocket.accept()
+    outgoing = page.subscribe_events()  # replies share the events' queue - one sender
+    in_flight = set()
+
+    async def perform(message: dict) -> None:
+        reply, data = {"id": message.get("id")}, None
+        try:
+            args = PageActionRequest(**message)
+            with logger.contextualize(session_id=session_id, action=args.action.value):
+                result = await page.submit_action(**args.dict(exclude={"id"}))
+            browser.touch_page_session(page.id_)
+            if isinstance(result, BinaryContent):
+                # the reply is followed by a binary message of the content
+                data = result.content
+                reply.update(
+                    status="ok",
+                    binary=True,
+                    result=dict(media_type=result.media_type, size=len(data)),
+                )
+            elif isinstance(result, dict) and "error" in result:
+                reply.update(status="error", error=result["error"])
+            else:
+                reply.update(status="ok", result=result)
+        except pyd.ValidationError as e:
+            reply.update(status="error", error=e.errors(include_url=False, include_context=False))
+        except asyncio.TimeoutError:
+            reply.update(status="error", error="Action has been timed-out!")
+        except Exception as e:
+            reply.update(status="error", error=str(e))
+        await outgoing.put((reply, data))
+
+    async def send() -> None:
+        while True:
+            message = await outgoing.get()
+            if isinstance(message, tuple):  # a reply, and its binary content
+                message, data = message
+                await websocket.send_json(message)
+                if data is not None:
+                    await websocket.send_bytes(data)
+                continue
+            await websocket.send_json(message)
+            if message.get("event") == "closed":
+                await websocket.close()
+                return
+
+    sender = asyncio.create_task(send())
+    closed = asyncio.create_task(page.wait_closed())
+    try:
+        while True:
+            receiving = asyncio.create_task(websocket.receive_text())
+            await asyncio.wait([receiving, closed], return_when=asyncio.FIRST_COMPLETED)
+            if not receiving.done():
+                # the session was closed - the sender ends the channel after its "closed" event
+                receiving.cancel()
+                await asyncio.wait([sender])
+                break
+            try:
+                message = json.loads(receiving.result())
+            except json.JSONDecodeError:
+                await outgoing.put(
+                    ({"id": None, "status": "error", "error": "Invalid JSON message"}, None)
+                )
+                continue
+            task = asyncio.create_task(perform(message if isinstance(message, dict) else {}))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # RuntimeError - the server has closed the socket, the session was closed
+
+    finally:
+        # the client is gone - its queued actions are dropped
+        for task in [sender, closed, *in_flight]:
+            task.cancel()
+        page.unsubscribe_events(outgoing)
+
+
+async def _touching(
+    frames: AsyncIterator[bytes], browser: LeasedBrowser, page_id: str
+) -> AsyncIterator[bytes]:
+    "A screencast's frames - the session's TTL is reset as they're sent, at most once an interval"
+    touched = None
+    async for frame in frames:
+        if touched is None or monotonic() - touched >= conf.screencast_touch_interval:
+            browser.touch_page_session(page_id)
+            touched = monotonic()
+        yield frame
+
+
+@router.get(
+    "/screencast/{session_id}",
+    status_code=status.HTTP_200_OK,
+    description="Stream a page session's screencast - as a multipart (MJPEG-like) stream of frames",
+    dependencies=[Depends(rate_limiter)],
+)
+async def stream_page_screencast(
+    session_id: str,
+    image_format: Literal["jpeg", "png"] = Query(default="jpeg", alias="format"),
+    quality: Optional[int] = Query(default=None, ge=0, le=100),
+    fps: int = Query(default=conf.screencast_max_fps, gt=0, le=conf.screencast_max_fps),
+    max_width: Optional[int] = Query(default=None, gt=0),
+    max_height: Optional[int] = Query(default=None, gt=0),
+):
+    _, browser, page = PoolAdmin.get_session_parent_chain(session_id, peek=True)
+    if page.is_screencasting:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Session is already being screencast"
+        )
+
+    async def multipart_frames():
+        frames = page.screencast(image_format, quality, fps, max_width, max_height)
+        try:
+            async for frame in _touching(frames, browser, page.id_):
+                yield (
+                    f"--frame\r\nContent-Type: image/{image_format}\r\n"
+                    f"Content-Length: {len(frame)}\r\n\r\n".encode()
+                )
+                yield frame
+                yield b"\r\n"
+        finally:
+            await frames.aclose()  # stops the screencast once the client is gone
+
+    return StreamingResponse(
+        multipart_frames(), media_type="multipart/x-mixed-replace; boundary=frame"
+    )
+
+
+@router.websocket("/screencast/{session_id}")
+async def page_screencast_channel(
+    websocket: WebSocket,
+    session_id: str,
+    image_format: Literal["jpeg", "png"] = Query(default="jpeg", alias="format"),
+    quality: Optional[int] = Query(default=None, ge=0, le=100),
+    fps: int = Query(default=conf.screencast_max_fps, gt=0, le=conf.screencast_max_fps),
+    max_width: Optional[int] = Query(default=None, gt=0),
+    max_height: Optional[int] = Query(default=None, gt=0),
+):
+    "A page session's screencast - every frame is a binary message"
+    try:
+        rate_limiter(websocket)
+        _, browser, page = PoolAdmin.get_session_parent_chain(session_id, peek=True)
+    except (RateLimitsExceededError, PageSessionNotFoundError) as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+        return
+    if page.is_screencasting:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Session is already being screencast"
+        )
+        return
+
+    await websocket.accept()
+    frames = page.screencast(image_format, quality, fps, max_width, max_height)
+    try:
+        async for frame in _touching(frames, browser, page.id_):
+            await websocket.send_bytes(frame)
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        await frames.aclose()
@@ -1,32 +1,88 @@
+import os
 import uuid
+import asyncio
 import pydantic as pyd
 
 from typing import Optional
 from web_pilot.config import config as conf
 from web_pilot.clients.leased_browser import LeasedBrowser
+from web_pilot.clients.browser_scheduler import BrowserScheduler
+from web_pilot.clients.scaling_policies import ScalingPolicy, get_scaling_policy
+from web_pilot.schemas.constants.placement_policy import PlacementPolicy
+from web_pilot.schemas.constants.scaling_policy import ScalingPolicyType
 from web_pilot.exc import (
     BrowserPoolCapacityReachedError,
     NoAvailableBrowserError,
 )
 from web_pilot.utils.decorators import run_if_pool_accepts_new_jobs
 from web_pilot.logger import logger
-from web_pilot.utils.sessions import generate_id
+from web_pilot.utils.response_cache import ResponseCache
+from web_pilot.utils.metadata_store import metadata_store
+from web_pilot.utils.sessions import generate_browser_id
 
 
 class BrowserPool:
     id_: str
     config_template: dict
     _pool: dict[uuid.UUID, LeasedBrowser]
+    _min_browsers: int
     _max_browsers: int
     _accepts_new_jobs: bool
+    min_warm_browsers: int
+    max_warm_browsers: int
+    recycle_max_pages: int
+    recycle_max_memory: int
+    recycle_max_age: int
+    _metrics: dict[str, int]
+    _scheduler: BrowserScheduler
+    _scaling_policy: ScalingPolicy
+    _session_arrivals: int
+    response_cache: Optional[ResponseCache]
 
     @pyd.validate_arguments
     def __init__(self, pool_id: str, config: dict) -> None:
         self.id_ = pool_id
+        config = dict(config)  # pool-level settings are popped, the rest is passed to browsers
+        self.min_warm_browsers = config.pop("min_warm_browsers", conf.pool_min_warm_browsers)
+        self.max_warm_browsers = max(
+            config.pop("max_warm_browsers", conf.pool_max_warm_browsers), self.min_warm_browsers
+        )
+        self.recycle_max_pages = config.pop("recycle_max_pages", conf.browser_recycle_max_pages)
+        self.recycle_max_memory = config.pop("recycle_max_memory", conf.browser_recycle_max_memory)
+        self.recycle_max_age = config.pop("recycle_max_age", conf.browser_recycle_max_age)
+        self._scheduler = BrowserScheduler(
+            PlacementPolicy(config.pop("placement_policy", conf.pool_placement_policy))
+        )
+        self._scaling_policy = get_scaling_policy(
+            ScalingPolicyType(config.pop("scaling_policy", conf.pool_scaling_policy))
+        )
+        self._min_browsers = config.pop("min_browsers", conf.browser_pool_min_size)
+        self._max_browsers = max(
+            config.pop("max_browsers", conf.browser_pool_max_size), self._min_browsers
+        )
+        # isolated sessions don't share their cookies & storage - nor a response cache
+        self.response_cache = (
+            ResponseCache(
+                disk_dir=os.path.join(conf.response_cache_dir, f"{os.getpid()}-{pool_id}"),
+                max_memory_bytes=conf.response_cache_memory_size * 1024 * 1024,
+                max_disk_bytes=conf.response_cache_disk_size * 1024 * 1024,
+                max_entry_bytes=conf.response_cache_max_entry_size * 1024 * 1024,
+                proxy_server=config.get("proxy_server"),
+            )
+            if config.pop("response_cache", conf.pool_response_cache)
+            and not config.get("context_isolation")
+            else None
+        )
         self.config_template = config  # used as a template to instantiate new browsers in the pool
         self._pool = {}
-        self._max_browsers = conf.browser_pool_max_size
+        self._session_arrivals = 0
         self._accepts_new_jobs = True
+        self._metrics = {
+            "warm_hits": 0,
+            "cold_launches": 0,
+            "recycled_browsers": 0,
+            "expired_sessions": 0,
+        }
 
     def __str__(self) -> str:
         return f"BrowserPool(id={self.id_.__str__()}, browser_count={len(self._pool)}, max_browsers={self._max_browsers}, total_pages={sum([browser.page_count for browser in self._pool.values()])})"
@@ -35,11 +91,29 @@ class BrowserPool:
         return dict(
             id=self.id_.__str__(),
             browser_count=len(self._pool),
+            min_browsers=self._min_browsers,
             max_browsers=self._max_browsers,
             total_pages=sum([browser.page_count for browser in self._pool.values()]),
+            capacity=self.capacity,
             is_idle=self.is_idle,
             accepts_new_jobs=self._accepts_new_jobs,
+            warm_browsers=len(self.warm_browsers),
+            min_warm_browsers=self.min_warm_browsers,
+            max_warm_browsers=self.max_warm_browsers,
+            launch_preset=self.config_template.get("launch_preset"),
+            placement_policy=self._scheduler.policy.value,
+            scaling_policy=self._scaling_policy.__repr__(),
+            recycle_policy=dict(
+                max_pages=self.recycle_max_pages,
+                max_memory=self.recycle_max_memory,
+                max_age=self.recycle_max_age,
+            ),
+            metrics=self.metrics,
+            response_cache=self.response_cache.__repr__() if self.response_cache else None,
+            remote_browsers=len(self.remote_browsers),
+            remote_capacity=self.remote_capacity,
             config=self.config_template,
+            browsers=[browser.__repr__() for browser in self._pool.values()],
         )
 
     @property
@@ -50,19 +124,137 @@ class BrowserPool:
     def is_idle(self) -> bool:
         return all([browser.is_idle for browser in self._pool.values()])
 
+    @property
+    def active_browsers(self) -> list[LeasedBrowser]:
+        "Browsers that aren't being drained for recycling"
+        return [browser for browser in self._pool.values() if not browser.is_draining]
+
+    @property
+    def local_browsers(self) -> list[LeasedBrowser]:
+        "Active browsers launched by the pool - the ones it scales, warms up & recycles"
+        return [browser for browser in self.active_browsers if not browser.is_remote]
+
+    @property
+    def remote_browsers(self) -> list[LeasedBrowser]:
+        "Registered remote browser workers"
+        return [browser for browser in self._pool.values() if browser.is_remote]
+
+    @property
+    def remote_capacity(self) -> int:
+        "Page sessions the pool's healthy remote workers can hold"
+        return sum(
+            [
+                browser.max_pages
+                for browser in self.remote_browsers
+                if browser.is_healthy and not browser.is_draining
+            ]
+        )
+
+    @property
+    def capacity(self) -> int:
+        "Total page sessions (pages, or isolated browser-contexts) the pool's browsers can hold"
+        return sum([browser.max_pages for browser in self._pool.values()])
+
+    @property
+    def load(self) -> int:
+        "Live (and starting) page sessions across the pool's active browsers"
+        return sum([browser.load for browser in self.active_browsers])
+
+    @property
+    def pages_per_browser(self) -> int:
+        return LeasedBrowser.max_pages_for(self.config_template)
+
+    @property
+    def page_utilization(self) -> float:
+        capacity = sum([browser.max_pages for browser in self.active_browsers])
+        return self.load / capacity if capacity else 0
+
+    @property
+    def avg_cpu_usage(self) -> float:
+        browsers = self.active_browsers
+        return (
+            sum([browser.monitor_browser[0] for browser in browsers]) / len(browsers)
+            if browsers
+            else 0
+        )
+
+    @property
+    def warm_browsers(self) -> list[LeasedBrowser]:
+        "Browsers that are already launched and not leased to any page session"
+        return [
+            browser
+            for browser in self._pool.values()
+            if browser.is_launched
+            and browser.is_unused
+            and not browser.is_draining
+            and not browser.is_remote
+        ]
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return dict(self._metrics)
+
     def mark_as_inactive(self) -> None:
         self._accepts_new_jobs = False
+        metadata_store.set("pool", self.id_, accepts_new_jobs=False)
+
+    def _on_browser_load_change(self, browser: LeasedBrowser) -> None:
+        self._scheduler.update(browser)
+        metadata_store.set("browser", browser.id_, ttl=conf.metadata_record_ttl, **browser.metadata)
+
+    def _on_session_expired(self, browser: LeasedBrowser) -> None:
+        self._metrics["expired_sessions"] += 1
+
+    def publish_metadata(self) -> None:
+        "Re-publish the pool's & its browsers' metadata - records of a dead process expire"
+        metadata_store.set(
+            "pool",
+            self.id_,
+            ttl=conf.metadata_record_ttl,
+            worker_id=conf.worker_id,
+            accepts_new_jobs=self._accepts_new_jobs,
+            config=self.config_template,
+        )
+        for browser in self._pool.values():
+            metadata_store.set(
+                "browser", browser.id_, ttl=conf.metadata_record_ttl, **browser.metadata
+            )
+
+    def clear_response_cache(self) -> None:
+        if self.response_cache:
+            self.response_cache.clear()
+
+    async def close(self) -> None:
+        "Close all of the pool's browsers (removing their profiles) - once it's discarded"
+        browsers = list(self._pool.values())
+        self._pool.clear()
+        for browser in browsers:
+            self._scheduler.remove(browser.id_)
+            browser.on_load_change = None
+        results = await asyncio.gather(
+            *[browser.close() for browser in browsers if browser.is_launched],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.bind(pool_id=self.id_).warning(f"Failed to close browser: {result}")
+        if self.response_cache:
+            await self.response_cache.close()
 
     @run_if_pool_accepts_new_jobs
     def create_new_browser(self) -> LeasedBrowser:
         "Create and return a new browser instance"
-        browser_id = generate_id()
-        if len(self._pool) >= self._max_browsers:
+        browser_id = generate_browser_id()
+        if len(self.local_browsers) >= self._max_browsers:
             raise BrowserPoolCapacityReachedError(
                 f"Max number of browsers in pool reached: {self._max_browsers}"
             )
         new_browser = LeasedBrowser(browser_id, parent=self.id_, **self.config_template)
+        new_browser.on_load_change = self._on_browser_load_change
+        new_browser.on_session_expired = self._on_session_expired
+        new_browser.response_cache = self.response_cache
         self._pool[browser_id] = new_browser
+        self._on_browser_load_change(new_browser)
         logger.bind(pool_id=self.id_).info(f"Browser '{browser_id}' has been added to the pool")
         return new_browser
 
@@ -70,13 +262,17 @@ class BrowserPool:
     @run_if_pool_accepts_new_jobs
     async def remove_browser_by_id(self, browser_id: str, force: bool = False) -> bool:
         "Remove browser from pool by its ID"
-        if browser_id not in self._pool or not force and self._pool[browser_id].page_count > 0:
+        browser = self._pool.get(browser_id)
+        if browser is None or not force and not browser.is_unused:
             return False
 
-        browser = self._pool[browser_id]
-        if browser and browser._browser:
-            await browser.close()
+        # unplaceable before the first await - no session may start on a closing browser
         del self._pool[browser_id]
+        self._scheduler.remove(browser_id)
+        browser.on_load_change = None
+        if browser._browser:
+            await browser.close()
+        metadata_store.delete("browser", browser_id)
         logger.bind(pool_id=self.id_).info(f"Browser '{browser_id}' has been removed from the pool")
         return True
 
@@ -89,70 +285,218 @@ class BrowserPool:
     @run_if_pool_accepts_new_jobs
     def get_least_busy_browser(self, create_if_none: bool) -> Optional[LeasedBrowser]:
         """
-        Get the next available browser in the pool.
+        Get the browser the next page session should be placed on, according to the pool's placement policy.
         If all browsers are full, raises an `NoAvailableBrowserError` exception.
         """
-        if len(self.browsers) == 0:
-            if create_if_none:
-                return self.create_new_browser()
-            return None
-
-        elif len(self.browsers) == 1:
-            return list(self._pool.values())[0]
-
-        least_busy_browser_idx = 0
-        for idx, browser in enumerate(self.browsers):
-            if (
-                not browser.is_idle
-                and browser.page_count > 0
-                and browser.page_count < self.browsers[least_busy_browser_idx].page_count
-            ):
-                least_busy_browser_idx = idx
-
-        if browser := self.browsers[least_busy_browser_idx].has_capacity:
-            return browser
-
-        raise NoAvailableBrowserError(
-            "All browsers are currently at full capacity! try again later."
-        )
+        browser = self._scheduler.place()
+        if browser is None:
+            if create_if_none and len(self.local_browsers) < self._max_browsers:
+                browser = self.create_new_browser()
+            elif len(self._pool) == 0:
+                return None
+            else:
+                raise NoAvailableBrowserError(
+                    "All browsers are currently at full capacity! try again later."
+                )
 
-    def auto_scale_up(self) -> Optional[LeasedBrowser]:
-        "Scale up the pool by creating a new browser instance"
-        # Check if the total number of pages across all browsers is greater than 50% of current capacity
-        total_page_cap = conf.browser_max_cached_items * len(self.browsers)
-        total_active_pages = sum([browser.page_count for browser in self._pool.values()])
-        avg_cpu_usage = sum(browser.monitor_browser[0] for browser in self.browsers) / len(
-            self.browsers
-        )
-        if total_active_pages > 0 and (
-            total_active_pages >= (total_page_cap * 0.6) or avg_cpu_usage >= 0.7
-        ):
+        self._metrics["warm_hits" if browser.is_launched else "cold_launches"] += 1
+        self._session_arrivals += 1
+        return browser
+
+    def pop_session_arrivals(self) -> int:
+        "Number of placements since the last call"
+        arrivals, self._session_arrivals = self._session_arrivals, 0
+        return arrivals
+
+    def refresh_placement_index(self) -> None:
+        "Re-index all browsers - picks up freshly sampled CPU & memory usage"
+        for browser in self._pool.values():
+            self._scheduler.update(browser)
+
+    async def maintain_warm_browsers(self) -> None:
+        "Keep between `min_warm_browsers` and `max_warm_browsers` launched, unleased browsers"
+        if not self._accepts_new_jobs:
+            return
+
+        warm_count = len(self.warm_browsers)
+        # launch browsers that were added (e.g. by scale-up) but not started yet
+        to_launch = [browser for browser in self._pool.values() if not browser.is_launched]
+        to_launch = to_launch[: max(self.max_warm_browsers - warm_count, 0)]
+        while warm_count + len(to_launch) < self.min_warm_browsers:
             try:
-                self.create_new_browser()
-                logger.bind(pool_id=self.id_, action="scale_up").info(
-                    f"Scaled up to {len(self.browsers)} browsers"
-                )
+                to_launch.append(self.create_new_browser())
+            except BrowserPoolCapacityReachedError:
+                break
 
-            except BrowserPoolCapacityReachedError as e:
-                logger.bind(pool_id=self.id_, action="scale_up").warning(f"Scaling up failed: {e}")
+        if to_launch:
+            results = await asyncio.gather(
+                *[browser.warm_up() for browser in to_launch], return_exceptions=True
+            )
+            for browser, result in zip(to_launch, results):
+                if isinstance(result, Exception):
+                    logger.bind(pool_id=self.id_, browser_id=browser.id_).warning(
+                        f"Failed to warm up browser: {result}"
+                    )
+            logger.bind(pool_id=self.id_, action="warm_up").debug(
+                f"Warm browsers: {len(self.warm_browsers)}/{self.min_warm_browsers}"
+            )
 
-    async def auto_scale_down(self) -> None:
-        "Scale down the pool by removing the least busy browser instance"
-        # Check if the total number of pages across all browsers is less than 25% of current capacity
-        total_page_cap = conf.browser_max_cached_items * len(self.browsers)
-        total_active_pages = sum([browser.page_count for browser in self._pool.values()])
-        avg_cpu_usage = sum(browser.monitor_browser[0] for browser in self.browsers) / len(
-            self.browsers
-        )
-        if total_active_pages <= (total_page_cap * 0.3) or avg_cpu_usage <= 0.3:
+        for browser in self.warm_browsers[self.max_warm_browsers :]:
+            await self.remove_browser_by_id(browser.id_)
+
+    def _recycle_reason(self, browser: LeasedBrowser) -> Optional[str]:
+        "The recycle threshold the browser has crossed, if any"
+        if self.recycle_max_pages and browser.pages_served >= self.recycle_max_pages:
+            return f"served {browser.pages_served} pages"
+        if self.recycle_max_memory and browser.monitor_browser[1] >= self.recycle_max_memory:
+            return f"uses {browser.monitor_browser[1]:.0f}MB of memory"
+        if self.recycle_max_age and browser.age >= self.recycle_max_age:
+            return f"is running for {browser.age:.0f} seconds"
+        return None
+
+    async def recycle_browsers(self) -> None:
+        """
+        Drain browsers that crossed any of the pool's recycle thresholds - launching their
+        replacements ahead of time - and close drained browsers once their sessions are done.
+        """
+        if not self._accepts_new_jobs:
+            return
+
+        replacements = []
+        for browser in self.local_browsers:
+            if not browser.is_launched or not (reason := self._recycle_reason(browser)):
+                continue
+
+            browser.mark_as_draining()
+            self._metrics["recycled_browsers"] += 1
+            logger.bind(pool_id=self.id_, browser_id=browser.id_, action="recycle").info(
+                f"Browser {reason} - draining it for recycling"
+            )
+            replacements.append(self.create_new_browser())
+
+        if replacements:
+            await asyncio.gather(
+                *[browser.warm_up() for browser in replacements], return_exceptions=True
+            )
+
+        for browser in list(self._pool.values()):
+            if browser.is_draining and browser.load == 0:
+                await self.remove_browser_by_id(browser.id_, force=True)
+
+    async def auto_scale(self) -> None:
+        "Grow or shrink the pool according to its scaling policy, within the pool's min/max size"
+        if not self._accepts_new_jobs:
+            return
+
+        current = len(self.local_browsers)
+        delta = self._scaling_policy.desired_delta(self)
+        target = min(max(current + delta, self._min_browsers), self._max_browsers)
+        if target > current:
+            new_browsers = [self.create_new_browser() for _ in range(target - current)]
+            # launch ahead of demand - placements shouldn't wait for a cold-start
+            await asyncio.gather(
+                *[browser.warm_up() for browser in new_browsers], return_exceptions=True
+            )
+            logger.bind(pool_id=self.id_, action="scale_up").info(
+                f"Scaled up to {len(self.local_browsers)} browsers"
+            )
+
+        elif target < current:
+            warm_standby = self.warm_browsers[: self.min_warm_browsers]
             candidates_for_deletion = [
-                browser for browser in self.browsers if browser.page_count == 0 or browser.is_idle
+                browser
+                for browser in self.local_browsers
+                if browser.is_unused and browser not in warm_standby
             ]
-            if len(candidates_for_deletion) > 0:
-                [
-                    await self.remove_browser_by_id(candidate.id_)
-                    for candidate in candidates_for_deletion
-                ]
-                logger.bind(pool_id=self.id_, action="scale_down").info(
-                    f"Scaled down to {len(self.browsers)} browsers"
+            for candidate in candidates_for_deletion[: current - target]:
+                await self.remove_browser_by_id(candidate.id_)
+            logger.bind(pool_id=self.id_, action="scale_down").info(
+                f"Scaled down to {len(self.local_browsers)} browsers"
+            )
+
+    @run_if_pool_accepts_new_jobs
+    async def register_remote_browser(
+        self, ws_endpoint: str, max_pages: Optional[int] = None
+    ) -> LeasedBrowser:
+        """
+        Attach a remote browser worker by its CDP websocket endpoint (or `http://host:port`
+        remote-debugging address) - it's placed on like any other browser of the pool.
+        """
+        if any([browser.ws_endpoint == ws_endpoint for browser in self.remote_browsers]):
+            raise ValueError(f"Remote browser '{ws_endpoint}' is already registered")
+
+        browser_id = generate_browser_id()
+        browser = LeasedBrowser(
+            browser_id,
+            parent=self.id_,
+            ws_endpoint=ws_endpoint,
+            capacity=max_pages,
+            **self.config_template,
+        )
+        browser.on_load_change = self._on_browser_load_change
+        browser.on_session_expired = self._on_session_expired
+        browser.response_cache = self.response_cache
+        await browser.launch()
+        self._pool[browser_id] = browser
+        self._on_browser_load_change(browser)
+        logger.bind(pool_id=self.id_).info(
+            f"Remote browser '{ws_endpoint}' has been added to the pool as '{browser_id}'"
+        )
+        return browser
+
+    @run_if_pool_accepts_new_jobs
+    def reserve_placements(self, count: int) -> list[LeasedBrowser]:
+        """
+        Place up to `count` page sessions at once, adding browsers up to the pool's limit -
+        a slot is reserved on the placed browser per session, until the session is started.
+        """
+        placements = []
+        for _ in range(count):
+            try:
+                browser = self.get_least_busy_browser(create_if_none=True)
+            except (NoAvailableBrowserError, BrowserPoolCapacityReachedError):
+                break
+            if browser is None:
+                break
+            browser.reserve_session()
+            placements.append(browser)
+        return placements
+
+    async def start_page_sessions(self, count: int) -> tuple[list[str], list[dict]]:
+        """
+        Start `count` page sessions concurrently - at most `bulk_sessions_browser_concurrency` pages
+        are opened on any single browser at a time.
+        Returns the IDs of the started sessions, and the failures.
+        """
+        placements = self.reserve_placements(count)
+        failures = []
+        if len(placements) < count:
+            failures.append(
+                dict(
+                    count=count - len(placements),
+                    error="All browsers are currently at full capacity! try again later.",
                 )
+            )
+
+        semaphores = {
+            browser.id_: asyncio.Semaphore(conf.bulk_sessions_browser_concurrency)
+            for browser in placements
+        }
+
+        async def start(browser: LeasedBrowser) -> Optional[str]:
+            async with semaphores[browser.id_]:
+                try:
+                    return await browser.start_page_session(
+                        session_id_prefix=f"{self.id_}_{browser.id_}", reserved=True
+                    )
+                except Exception as e:
+                    failures.append(dict(count=1, browser_id=browser.id_, error=str(e)))
+
+        results = await asyncio.gather(*[start(browser) for browser in placements])
+        return [session_id for session_id in results if session_id], failures
+
+    async def check_remote_browsers(self) -> None:
+        "Health-check the pool's remote workers, reconnecting the ones that were lost"
+        remote_browsers = self.remote_browsers
+        if remote_browsers:
+            await asyncio.gather(*[browser.check_health() for browser in remote_browsers])
@@ -0,0 +1,89 @@
+import heapq
+import itertools
+
+from typing import Optional
+from web_pilot.config import config as conf
+from web_pilot.clients.leased_browser import LeasedBrowser
+from web_pilot.schemas.constants.placement_policy import PlacementPolicy
+
+
+class BrowserScheduler:
+    """
+    Placement index over a pool's browsers - a heap keyed by the pool's placement policy.
+    Browsers are re-indexed incrementally whenever their load changes; outdated heap entries
+    are skipped lazily, so both updates and placements are O(log n).
+    Only browsers with free capacity are kept in the index.
+    """
+
+    policy: PlacementPolicy
+    _heap: list[tuple[tuple, int, str]]
+    _versions: dict[str, int]
+    _browsers: dict[str, LeasedBrowser]
+    _last_placed: dict[str, int]
+
+    def __init__(self, policy: PlacementPolicy) -> None:
+        self.policy = policy
+        self._heap = []
+        self._versions = {}
+        self._browsers = {}
+        self._last_placed = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._browsers)
+
+    @staticmethod
+    def load_score(browser: LeasedBrowser) -> float:
+        "Weighted load of a browser - live pages, sampled CPU & RSS"
+        cpu_usage, memory_usage = browser.monitor_browser
+        return (
+            conf.placement_pages_weight * browser.load / browser.max_pages
+            + conf.placement_cpu_weight * cpu_usage
+            + conf.placement_memory_weight * memory_usage / conf.placement_memory_reference
+        )
+
+    def _priority(self, browser: LeasedBrowser) -> tuple:
+        match self.policy:
+            case PlacementPolicy.LEAST_LOADED:
+                key = self.load_score(browser)
+            case PlacementPolicy.BIN_PACK:
+                key = -self.load_score(browser)
+            case PlacementPolicy.SPREAD:
+                key = self._last_placed.get(browser.id_, -1)
+            case _:
+                raise NotImplementedError(f"Placement policy '{self.policy}' is not supported!")
+        # already launched browsers always go first - they don't pay for a cold-start
+        return (not browser.is_launched, key)
+
+    def update(self, browser: LeasedBrowser) -> None:
+        "(Re-)index a browser after its load has changed"
+        version = next(self._sequence)
+        self._versions[browser.id_] = version
+        self._browsers[browser.id_] = browser
+        if browser.has_capacity:
+            heapq.heappush(self._heap, (self._priority(browser), version, browser.id_))
+        if len(self._heap) > 4 * len(self._browsers) + 16:
+            self._compact()
+
+    def remove(self, browser_id: str) -> None:
+        self._versions.pop(browser_id, None)
+        self._browsers.pop(browser_id, None)
+        self._last_placed.pop(browser_id, None)
+
+    def _compact(self) -> None:
+        "Drop outdated entries"
+        self._heap = [entry for entry in self._heap if self._versions.get(entry[2]) == entry[1]]
+        heapq.heapify(self._heap)
+
+    def place(self) -> Optional[LeasedBrowser]:
+        "Get the browser the next page session should be placed on, if any has capacity"
+        while self._heap:
+            _, version, browser_id = self._heap[0]
+            if self._versions.get(browser_id) != version:
+                heapq.heappop(self._heap)
+                continue
+
+            browser = self._browsers[browser_id]
+            self._last_placed[browser_id] = next(self._sequence)
+            return browser
+        return None
@@ -1,27 +1,65 @@
 import pyppeteer
-import psutil
 import pydantic as pyd
 import pyppeteer.browser
 import pyppeteer.launcher
+import pyppeteer.page
 import asyncio
+import json
+import urllib.request
 
-from typing import Optional
+from time import monotonic, time
+from typing import Callable, Optional
 from web_pilot.config import config as conf
 from web_pilot.logger import logger
 from web_pilot.utils.ttl_cache import TTLCache
+from web_pilot.utils.blank_pages import BlankPagePool
+from web_pilot.utils.resource_sampler import ResourceSampler
+from web_pilot.utils.profiles import ProfileManager
 from web_pilot.clients.page_session import PageSession
+from web_pilot.utils.launch_presets import get_launch_args
+from web_pilot.utils.response_cache import ResponseCache
+from web_pilot.utils.metadata_store import metadata_store
+from web_pilot.utils.expiry_scheduler import ExpiryScheduler
+from web_pilot.schemas.constants.launch_preset import LaunchPreset
 from web_pilot.utils.fake_ua import fake_user_agent, Platform, BrowserTypes
-from web_pilot.exc import FailedToLaunchBrowser
+from web_pilot.exc import CacheCapacityReachedError, FailedToLaunchBrowser
 from web_pilot.utils.sessions import generate_id
 
 
+def _resolve_ws_endpoint(browser_url: str) -> str:
+    "Blocking - the browser's websocket endpoint, by its remote-debugging address"
+    with urllib.request.urlopen(
+        f"{browser_url.rstrip('/')}/json/version", timeout=conf.remote_browser_connect_timeout
+    ) as response:
+        return json.loads(response.read())["webSocketDebuggerUrl"]
+
+
 class LeasedBrowser:
     id_: str
     _browser: pyppeteer.browser.Browser
+    _launch_task: Optional[asyncio.Task]
     pages: TTLCache
+    _blank_pages: BlankPagePool
     platform: Platform
     browser_type: BrowserTypes
     _parent: str
+    context_isolation: bool
+    launch_preset: Optional[LaunchPreset]
+    request_blocking: Optional[dict]
+    _pending_sessions: int
+    pages_served: int
+    launched_at: Optional[float]
+    is_draining: bool
+    _profile_dir: Optional[str]
+    on_load_change: Optional[Callable[["LeasedBrowser"], None]]
+    on_session_expired: Optional[Callable[["LeasedBrowser"], None]]
+    response_cache: Optional[ResponseCache]
+    ws_endpoint: Optional[str]
+    _capacity: Optional[int]
+    is_healthy: bool
+    latency: Optional[float]
+    reconnects: int
+    _failed_health_checks: int
 
     @pyd.validate_arguments
     def __init__(
@@ -37,12 +75,35 @@ class LeasedBrowser:
         proxy_server: Optional[str] = None,
         platform: Optional[Platform] = None,
         browser: Optional[BrowserTypes] = None,
+        context_isolation: bool = False,
+        launch_preset: Optional[LaunchPreset] = None,
+        request_blocking: Optional[dict] = None,
+        ws_endpoint: Optional[str] = None,
+        capacity: Optional[pyd.PositiveInt] = None,
     ) -> None:
         "Create Browser instance"
         self.id_ = id_
+        # set for remote browser workers - connected instead of launched
+        self.ws_endpoint = ws_endpoint
+        self._capacity = capacity
+        self.is_healthy = True
+        self.latency = None
+        self.reconnects = 0
+        self._failed_health_checks = 0
+        self.context_isolation = context_isolation
         self._browser = None
+        self._launch_task = None
         self._parent = parent
-        self.pages = TTLCache()
+        self._pending_sessions = 0
+        self.pages_served = 0
+        self.launched_at = None
+        self.is_draining = False
+        self._profile_dir = None
+        self.on_load_change = None  # set by the owning pool to keep its placement index updated
+        self.on_session_expired = None  # set by the owning pool to count expirations
+        self.response_cache = None  # shared by the owning pool's browsers
+        self.pages = TTLCache(max_items=self.max_pages, ttl=None)
+        self._blank_pages = BlankPagePool(self._new_blank_page, self._dispose_blank_page)
         self.config = self._load_browser_config(
             headless,
             incognito,
@@ -53,18 +114,34 @@ class LeasedBrowser:
             proxy_server,
             platform,
             browser,
+            launch_preset,
         )
         self.platform = platform
         self.browser_type = browser
-        asyncio.ensure_future(self.pages.periodic_cleanup())
+        self.launch_preset = launch_preset
+        self.request_blocking = request_blocking  # pool-level default for new page sessions
 
     def __repr__(self) -> dict:
+        cpu_usage, memory_usage = self.monitor_browser
         return dict(
             id=self.id_,
             page_count=self.page_count,
-            platform=self.platform.value,
-            browser=self.browser_type.value,
+            platform=self.platform.value if self.platform else None,
+            browser=self.browser_type.value if self.browser_type else None,
             is_idle=self.is_idle,
+            is_launched=self.is_launched,
+            context_isolation=self.context_isolation,
+            launch_preset=self.launch_preset.value if self.launch_preset else None,
+            is_draining=self.is_draining,
+            pages_served=self.pages_served,
+            age=self.age,
+            cpu_usage=cpu_usage,
+            memory_usage=memory_usage,
+            remote=self.is_remote,
+            ws_endpoint=self.ws_endpoint,
+            is_healthy=self.is_healthy,
+            latency=self.latency,
+            reconnects=self.reconnects,
         )
 
     def _load_browser_config(
@@ -78,6 +155,7 @@ class LeasedBrowser:
         proxy_server: Optional[str],
         platform: Optional[Platform],
         browser: Optional[BrowserTypes],
+        launch_preset: Optional[LaunchPreset],
     ) -> dict:
         config = {
             "headless": True if headless else False,
@@ -111,21 +189,191 @@ class LeasedBrowser:
             config["args"].append(f"--user-agent={fake_user_agent(type=browser)}")
         if platform:
             config["args"].append(f"--platform={platform}")
+        config["args"].extend(get_launch_args(launch_preset))
         return config
 
+    async def _connect(self) -> None:
+        "Attach to a remote browser worker over its CDP websocket endpoint"
+        ws_endpoint = self.ws_endpoint
+        if not ws_endpoint.startswith("ws"):
+            # a `http://host:port` debugging address - resolved on every (re)connect,
+            # since the websocket endpoint changes whenever the worker is restarted
+            ws_endpoint = await asyncio.to_thread(_resolve_ws_endpoint, ws_endpoint)
+        self._browser = await asyncio.wait_for(
+            pyppeteer.connect(
+                browserWSEndpoint=ws_endpoint,
+                ignoreHTTPSErrors=self.config.get("ignoreHTTPSErrors", False),
+            ),
+            timeout=conf.remote_browser_connect_timeout,
+        )
+        self._browser.on("disconnected", self._on_disconnected)
+        if self.launched_at:
+            self.reconnects += 1
+        self.launched_at = monotonic()
+        self.is_healthy = True
+        self._failed_health_checks = 0
+        self._blank_pages.schedule_refill()
+
+    def _on_disconnected(self) -> None:
+        "The connection to a remote worker was lost - its pages are gone, reconnected by the health-check"
+        lost_sessions = self.page_count
+        for page_id, page_session in list(self.pages._cache.items()):
+            metadata_store.delete("session", self._session_id(page_id))
+            ExpiryScheduler.cancel(self._session_id(page_id))
+            page_session.discard()
+        self._browser = None
+        self.is_healthy = False
+        self._blank_pages.discard()
+        self.pages = TTLCache(max_items=self.max_pages, ttl=None)
+        logger.bind(browser_id=self.id_).warning(
+            f"Lost connection to remote browser '{self.ws_endpoint}' - {lost_sessions} page sessions were lost"
+        )
+        self._notify_load_change()
+
     async def _instantiate_browser(self) -> None:
         "Create Pyppeteer browser instance"
+        if self.is_remote:
+            try:
+                await self._connect()
+                return
+            except Exception as e:
+                logger.bind(browser_id=self.id_).error(
+                    f"Failed to connect to remote browser '{self.ws_endpoint}': {e}"
+                )
+                raise FailedToLaunchBrowser(e)
+
         try:
+            if conf.ephemeral_profiles:
+                self._profile_dir = await ProfileManager.create_profile(self.id_)
+                self.config["userDataDir"] = self._profile_dir
             self._browser = await pyppeteer.launch(**self.config)
+            self.launched_at = monotonic()
+            ResourceSampler.register(self.id_, self.pid)
+            if not self.context_isolation:
+                self._blank_pages.seed(await self._browser.pages())
+            self._blank_pages.schedule_refill()
 
         except Exception as e:
             logger.bind(browser_id=self.id_).error(f"Failed to launch browser: {e}", exc_info=True)
+            if self._browser:
+                # launched, but failed to be set up - Chromium must exit before its profile is removed
+                browser, self._browser = self._browser, None
+                ResourceSampler.unregister(self.id_)
+                self._blank_pages.discard()
+                try:
+                    await browser.close()
+                except Exception as close_error:
+                    logger.bind(browser_id=self.id_).error(
+                        f"Failed to close browser after a failed launch: {close_error}"
+                    )
+            await self._remove_profile()
             raise FailedToLaunchBrowser(e)
 
+    async def _remove_profile(self) -> None:
+        if self._profile_dir:
+            await ProfileManager.remove_profile(self._profile_dir)
+            self._profile_dir = None
+
+    async def _new_blank_page(self) -> pyppeteer.page.Page:
+        if self.context_isolation:
+            context = await self._browser.createIncognitoBrowserContext()
+            return await context.newPage()
+        return await self._browser.newPage()
+
+    async def _dispose_blank_page(self, page: pyppeteer.page.Page) -> None:
+        if self.context_isolation:
+            await page.target.browserContext.close()
+        else:
+            await page.close()
+
+    async def launch(self) -> None:
+        """
+        Launch the browser if it isn't running yet.
+        Concurrent callers share a single in-flight launch, and a `FailedToLaunchBrowser` is raised to all of them.
+        """
+        if self._browser:
+            return
+
+        if self._launch_task is None:
+            self._launch_task = asyncio.ensure_future(self._instantiate_browser())
+            self._launch_task.add_done_callback(self._on_launch_done)
+
+        # shielded - a cancelled waiter must not abort the launch for everyone else
+        await asyncio.shield(self._launch_task)
+
+    def _on_launch_done(self, task: asyncio.Future) -> None:
+        # cleared by the task itself - even if all of its waiters were cancelled meanwhile
+        if not task.cancelled():
+            task.exception()  # retrieved - no "never retrieved" warning if nobody waited
+        if self._launch_task is task:
+            self._launch_task = None  # allow a retry after a failed launch
+            self._notify_load_change()
+
+    def _notify_load_change(self) -> None:
+        if self.on_load_change:
+            self.on_load_change(self)
+
+    async def warm_up(self) -> None:
+        "Launch the browser ahead of time - so the first page session won't pay for the cold-start"
+        await self.launch()
+
     @property
     def page_count(self) -> int:
         return len(self.pages)
 
+    @property
+    def load(self) -> int:
+        "Live pages, including page sessions that are being started"
+        return self.page_count + self._pending_sessions
+
+    @property
+    def is_unused(self) -> bool:
+        "No pages, no reserved (or starting) page sessions & no launch in flight - safe to close"
+        return self.load == 0 and self._launch_task is None
+
+    @property
+    def max_pages(self) -> int:
+        if self._capacity:
+            return self._capacity
+        return self.max_pages_for(dict(context_isolation=self.context_isolation))
+
+    @staticmethod
+    def max_pages_for(config: dict) -> int:
+        "Page sessions a browser created from the given pool config can hold"
+        if config.get("context_isolation"):
+            return conf.browser_max_contexts
+        return conf.browser_max_cached_items
+
+    @property
+    def is_launched(self) -> bool:
+        return self._browser is not None
+
+    @property
+    def is_remote(self) -> bool:
+        return self.ws_endpoint is not None
+
+    @property
+    def metadata(self) -> dict:
+        "Shared metadata of the browser - see `MetadataStore`"
+        return dict(
+            pool_id=self._parent,
+            worker_id=conf.worker_id,
+            ws_endpoint=self._browser.wsEndpoint if self._browser else self.ws_endpoint,
+            remote=self.is_remote,
+            max_pages=self.max_pages,
+            load=self.load,
+            is_healthy=self.is_healthy,
+            is_draining=self.is_draining,
+        )
+
+    def _session_id(self, page_id: str) -> str:
+        return f"{self._parent}_{self.id_}_{page_id}"
+
+    @property
+    def age(self) -> float:
+        "Seconds since the browser has been launched"
+        return monotonic() - self.launched_at if self.launched_at else 0
+
     @property
     def pid(self) -> int:
         process = self._browser.process
@@ -133,17 +381,9 @@ class LeasedBrowser:
 
     @property
     def monitor_browser(self) -> tuple[float, float]:
-        """Monitor the resource usage of a browser process."""
-        try:
-            process = psutil.Process(self.pid)
-            cpu_usage = (
-                process.cpu_percent(interval=0.1) / psutil.cpu_count()
-            )  # CPU usage of the process
-            memory_usage = process.memory_info().rss / (1024 * 1024)  # Memory in MB
-            return cpu_usage, memory_usage
-
-        except psutil.NoSuchProcess:
-            return 0, 0
+        "Latest sampled resource usage of the browser's process tree - (CPU share, memory in MB)"
+        sample = ResourceSampler.latest(self.id_)
+        return sample.cpu_usage, sample.memory_usage
 
     @property
     def is_idle(self) -> bool:
@@ -151,21 +391,120 @@ class LeasedBrowser:
 
     @property
     def has_capacity(self) -> bool:
-        return self.page_count < conf.browser_max_cached_items
+        return not self.is_draining and self.is_healthy and self.load < self.max_pages
+
+    def mark_as_draining(self) -> None:
+        "Stop accepting new page sessions - the browser is closed once its sessions are done"
+        self.is_draining = True
+        self._notify_load_change()
+
+    async def check_health(self) -> bool:
+        """
+        Ping a remote browser worker - reconnecting it if the connection was lost.
+        After `remote_browser_max_failed_checks` consecutive failed pings the connection is dropped,
+        so the next check reconnects from scratch.
+        """
+        if not self.is_remote:
+            return True
+
+        started = monotonic()
+        try:
+            await self.launch()
+            await asyncio.wait_for(
+                self._browser.version(), timeout=conf.remote_browser_connect_timeout
+            )
+            self.latency = monotonic() - started
+            self._failed_health_checks = 0
+            healthy = True
+
+        except Exception as e:
+            self._failed_health_checks += 1
+            healthy = False
+            logger.bind(browser_id=self.id_).warning(
+                f"Remote browser '{self.ws_endpoint}' failed health-check: {e}"
+            )
+            if (
+                self._browser
+                and self._failed_health_checks >= conf.remote_browser_max_failed_checks
+            ):
+                browser = self._browser
+                browser.remove_listener("disconnected", self._on_disconnected)
+                self._on_disconnected()
+                await browser.disconnect()
+
+        if healthy != self.is_healthy:
+            self.is_healthy = healthy
+            self._notify_load_change()
+        return healthy
 
     async def close(self) -> None:
-        await self._browser.close()
+        for page_id in list(self.pages._cache.keys()):
+            ExpiryScheduler.cancel(self._session_id(page_id))
+        await self._blank_pages.close()
+        if self.is_remote:
+            if not self._browser:
+                return
+            # the worker outlives the pool - only close the pages opened on it, then detach
+            self._browser.remove_listener("disconnected", self._on_disconnected)
+            await asyncio.gather(
+                *[page.cleanup() for page in self.pages._cache.values()], return_exceptions=True
+            )
+            await self._browser.disconnect()
+            return
 
-    async def start_page_session(self, session_id_prefix: str) -> str:
-        "Created new page and store it in cache by it's session-ID"
-        if not self._browser:
-            await self._instantiate_browser()
+        ResourceSampler.unregister(self.id_)
+        try:
+            await self._browser.close()
+        finally:
+            # their pages were closed along with the browser
+            for page_session in self.pages._cache.values():
+                page_session.discard()
+            await self._remove_profile()
+
+    def reserve_session(self) -> None:
+        "Hold a page-session slot, ahead of a `start_page_session(reserved=True)` call"
+        self._pending_sessions += 1
+        self._notify_load_change()
 
+    async def start_page_session(self, session_id_prefix: str, reserved: bool = False) -> str:
+        "Created new page and store it in cache by it's session-ID"
+        # reserve the slot before the first await - so concurrent placements see it
+        if not reserved:
+            self.reserve_session()
         try:
+            await self.launch()
             page_id = generate_id()
-            new_page_session = PageSession(page_obj=await self._browser.newPage(), page_id=page_id)
-            self.pages.set_item(page_id, new_page_session)
+            page = await self._blank_pages.acquire()
+            new_page_session = PageSession(
+                page_obj=page,
+                page_id=page_id,
+                context=page.target.browserContext if self.context_isolation else None,
+            )
+            if self.request_blocking:
+                await new_page_session.enable_request_interception(**self.request_blocking)
+            if self.response_cache:
+                await new_page_session.enable_response_cache(self.response_cache)
+            try:
+                self.pages.set_item(page_id, new_page_session)
+            except CacheCapacityReachedError:
+                await new_page_session.cleanup()
+                raise
+            self.pages_served += 1
             session_id = f"{session_id_prefix}_{str(page_id)}"
+            ExpiryScheduler.schedule(
+                session_id, conf.cache_ttl, lambda: self.expire_page_session(page_id)
+            )
+            metadata_store.set(
+                "session",
+                session_id,
+                ttl=conf.cache_ttl,
+                pool_id=self._parent,
+                browser_id=self.id_,
+                worker_id=conf.worker_id,
+                ws_endpoint=self._browser.wsEndpoint,
+                created_at=time(),
+                last_used=time(),
+            )
             logger.bind(browser_id=self.id_).info(
                 f"Created new page session: '{session_id}' successfully"
             )
@@ -177,6 +516,10 @@ class LeasedBrowser:
             )
             raise e
 
+        finally:
+            self._pending_sessions -= 1
+            self._notify_load_change()
+
     def pop_page_session(self, page_id: str) -> PageSession:
         "Retrieves a page-session from cache memory"
         page_session: PageSession = self.pages.pop_item(page_id)
@@ -191,13 +534,22 @@ class LeasedBrowser:
             return page_session
         raise KeyError(f"Page not found [page: '{page_id}'] - session has already been closed!")
 
-    def put_page_session(self, page_id: str, page: PageSession) -> None:
-        "Puts a page-session back to cache memory - resetting the TTL"
-        self.pages.set_item(page_id, page)
+    def touch_page_session(self, page_id: str) -> None:
+        "Resets a page-session's TTL - if it's still open"
+        if page_id not in self.pages._cache:
+            return
+        ExpiryScheduler.schedule(
+            self._session_id(page_id), conf.cache_ttl, lambda: self.expire_page_session(page_id)
+        )
+        metadata_store.set(
+            "session", self._session_id(page_id), ttl=conf.cache_ttl, last_used=time()
+        )
 
     async def close_page_session(self, page_id: str) -> None:
         "Closes and removes a cached page-session from memory - ending the session"
         page_session = self.pop_page_session(page_id)
+        metadata_store.delete("session", self._session_id(page_id))
+        ExpiryScheduler.cancel(self._session_id(page_id))
         try:
             await page_session.cleanup()
         except Exception as e:
@@ -207,4 +559,28 @@ class LeasedBrowser:
             logger.bind(browser_id=self.id_, session_id=page_id).info(
                 "Page session closed successfully"
             )
-            self.pages.delete_item(page_id)  # maybe uneccessary right now since we use pop_item()
+            self._notify_load_change()
+
+    async def expire_page_session(self, page_id: str) -> bool:
+        """
+        Close a page session whose TTL has passed - called by the `ExpiryScheduler`.
+        Sessions with running or queued actions are left alone.
+        """
+        page_session = self.pages._cache.get(page_id)
+        if page_session is None:
+            return False
+        if page_session.is_busy:
+            self.touch_page_session(page_id)  # expires once idle for a whole TTL
+            return False
+
+        self.pages._cache.pop(page_id)
+
+        metadata_store.delete("session", self._session_id(page_id))
+        try:
+            await page_session.cleanup()
+        finally:
+            logger.bind(browser_id=self.id_, session_id=page_id).info("Page session expired")
+            self._notify_load_change()
+            if self.on_session_expired:
+                self.on_session_expired(self)
+        return True
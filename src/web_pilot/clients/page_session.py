@@ -1,24 +1,54 @@
 import pydantic as pyd
 import pyppeteer
+import pyppeteer.browser
+import pyppeteer.network_manager
+import pyppeteer.frame_manager
+import pyppeteer.dialog
 import asyncio
+import cachetools
+import contextvars
+import functools
+import re
+import time
 
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from web_pilot.schemas.constants.page_action_type import PageActionType
 from web_pilot.logger import logger
 from web_pilot.utils.decorators import log_elapsed_time
-from web_pilot.exc import UnableToPerformActionError
+from web_pilot.exc import (
+    UnableToPerformActionError,
+    PageSessionNotFoundError,
+    SessionActionQueueFullError,
+)
 from web_pilot.config import config as conf
+from web_pilot.utils.blocklist import RequestBlocklist, get_blocklist
+from web_pilot.utils.response_cache import ResponseCache, has_credentials
+from web_pilot.schemas.pages import BinaryContent
+from web_pilot.utils.expiry_scheduler import ExpiryScheduler
+from web_pilot.utils.content_tracking import (
+    MUTATION_OBSERVER_SCRIPT,
+    DOCUMENT_STATE_SCRIPT,
+    CHANGED_SUBTREES_SCRIPT,
+    content_hash,
+    parse_etags,
+)
+from web_pilot.utils.wait_engine import network_activity, readiness_conditions, wait_until
 from web_pilot.utils.sessions import (
     perform_action_click,
     perform_action_authenticate,
     perform_action_setUserAgent,
     perform_action_screenshot,
+    perform_action_pdf,
+    decode_base64,
+    encode_base64,
     perform_action_goto,
     perform_action_goBack,
     perform_action_goForward,
     perform_action_evaluate,
     perform_action_extractPageContents,
+    perform_action_extract,
     perform_action_exposeFunction,
     perform_action_removeFunction,
     perform_action_setViewport,
@@ -29,6 +59,9 @@ from web_pilot.utils.sessions import (
     perform_action_addScriptTag,
     perform_action_removeScriptTag,
     perform_action_setGeoLocation,
+    perform_action_waitFor,
+    perform_action_waitForSelector,
+    perform_action_waitForText,
     perform_action_clearGeolocation,
     perform_action_emulateMedia,
     perform_action_getAccessibilityTree,
@@ -39,15 +72,96 @@ from web_pilot.utils.sessions import (
 )
 
 
+# static assets served from the pool's shared response cache
+_CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet", "image", "font"}
+_CACHE_HIT_HEADER = "x-web-pilot-cache"
+# request-IDs known to have sent or set cookies - kept for the responses still being stored
+_CREDENTIALED_REQUESTS_KEPT = 1024
+
+# readiness strategies of actions not set with one - others default to `none`
+_DEFAULT_READINESS = {PageActionType.EVALUATE: "load"}
+
+# a batch step's argument referencing an earlier step's output - `$<step-id>[.<key>|.<index>]...`
+_STEP_REFERENCE = re.compile(r"^\$([A-Za-z_][\w-]*)((?:\.[\w-]+)*)$")
+
+
+def _resolve_references(value: Any, outputs: dict[str, Any]) -> Any:
+    "Substitute references to earlier steps' outputs - strings not referencing a step are kept"
+    if isinstance(value, dict):
+        return {key: _resolve_references(item, outputs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_references(item, outputs) for item in value]
+    if not isinstance(value, str) or not (match := _STEP_REFERENCE.match(value)):
+        return value
+    step_id, path = match.groups()
+    if step_id not in outputs:
+        return value
+
+    resolved = outputs[step_id]
+    for part in filter(None, path.split(".")):
+        try:
+            resolved = resolved[int(part) if isinstance(resolved, list) else part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Unable to resolve reference '{value}'")
+    return resolved
+
+
 class PageSession:
     _page: pyppeteer.page.Page
+    _context: Optional[pyppeteer.browser.BrowserContext]
     id_: str
     _last_used: Optional[datetime]
-
-    def __init__(self, page_obj: pyppeteer.page.Page, page_id: int, **kwargs) -> None:
+    _blocklist: Optional[RequestBlocklist]
+    _response_cache: Optional[ResponseCache]
+    _intercepting: bool
+    _request_types: dict[str, str]
+    _credentialed_requests: cachetools.LRUCache
+    _network_stats: defaultdict[str, dict[str, int]]
+    _actions: asyncio.Queue
+    _actions_worker: Optional[asyncio.Task]
+    _running_action: Optional[asyncio.Task]
+    _event_subscribers: set[asyncio.Queue]
+    _closed_event: asyncio.Event
+    _screencasting: bool
+    _tracking_mutations: bool
+    _content_versions: cachetools.LRUCache
+
+    def __init__(
+        self,
+        page_obj: pyppeteer.page.Page,
+        page_id: int,
+        context: Optional[pyppeteer.browser.BrowserContext] = None,
+        **kwargs,
+    ) -> None:
         self._page = page_obj
+        self._context = context  # isolated (incognito) browser-context owned by this session
         self.id_ = page_id
         self._last_used = datetime.now()
+        self._closed = False
+        self._actions = asyncio.Queue(maxsize=conf.session_action_queue_size)
+        self._actions_worker = None
+        self._running_action = None
+        self._event_subscribers = set()
+        self._closed_event = asyncio.Event()
+        self._screencasting = False
+        self._tracking_mutations = False
+        # ETag -> (document ID, mutation count) of the contents' recent versions
+        self._content_versions = cachetools.LRUCache(maxsize=conf.content_versions_kept)
+        network_activity(page_obj)  # in-flight requests, for `networkIdle` waits
+        self._blocklist = None
+        self._response_cache = None
+        self._intercepting = False
+        self._request_types = {}  # request-ID -> resource type, of requests in flight
+        self._credentialed_requests = cachetools.LRUCache(maxsize=_CREDENTIALED_REQUESTS_KEPT)
+        self._network_stats = defaultdict(
+            lambda: {
+                "blocked_requests": 0,
+                "allowed_requests": 0,
+                "allowed_bytes": 0,
+                "cached_requests": 0,
+                "cached_bytes": 0,
+            }
+        )
 
     def __repr__(self) -> dict:
         return dict(
@@ -58,12 +172,34 @@ class PageSession:
         )
 
     def __del__(self):
-        # Schedule the cleanup asynchronously when the object is deleted (garbage collected)
-        asyncio.ensure_future(self.cleanup())
+        # sessions are closed explicitly (or by the expiry scheduler) - one reaching GC still
+        # open is a leaked tab; schedule its cleanup, if there's still a loop to run it on
+        if self._closed:
+            return
+        ExpiryScheduler.record_leaked_tab()
+        try:
+            asyncio.get_running_loop().create_task(self.cleanup())
+        except RuntimeError:
+            logger.bind(page_id=self.id_).warning("Leaked page session can't be closed")
+
+    def discard(self) -> None:
+        "End the session without closing its page - it's already gone, e.g. along with its browser"
+        if self._closed:
+            return
+        self._closed = True
+        self._closed_event.set()
+        self._cancel_actions()
+        self._publish_event("closed")
 
     async def cleanup(self) -> None:
+        if self._closed:
+            return
+        self.discard()
         try:
-            await self._page.close()
+            if self._context:
+                await self._context.close()  # closes the page along with the context
+            else:
+                await self._page.close()
             logger.bind(page_id=self.id_).debug("Page is closed successfully")
         except Exception as e:
             logger.bind(page_id=self.id_).error(f"Error during page cleanup: {e}")
@@ -78,6 +214,433 @@ class PageSession:
             return True
         return False
 
+    @property
+    def is_busy(self) -> bool:
+        "An action is running, or queued"
+        return self._running_action is not None or not self._actions.empty()
+
+    async def submit_action(self, **kwargs) -> Any:
+        """
+        Queue an action & wait for its result - actions of a session run one at a time, in order.
+        Cancelling the wait (e.g. the client went away) drops the action, or cancels it if running.
+        """
+        return await self._submit(
+            functools.partial(self.perform_page_action, **kwargs), timeout=conf.default_timeout
+        )
+
+    async def submit_batch(self, steps: list[dict]) -> dict:
+        "Queue a sequence of actions, run as a single queued item - see `perform_batch`"
+        return await self._submit(
+            functools.partial(self.perform_batch, steps), timeout=conf.batch_timeout
+        )
+
+    async def _submit(self, call: Callable[[], Awaitable], timeout: float) -> Any:
+        if self._closed:
+            raise PageSessionNotFoundError("Page session not found")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            # the action runs in the submitter's context - keeping its log context
+            self._actions.put_nowait((future, contextvars.copy_context(), call, timeout))
+        except asyncio.QueueFull:
+            raise SessionActionQueueFullError(
+                f"Too many pending actions on page session [max: {conf.session_action_queue_size}]"
+            )
+        if self._actions_worker is None or self._actions_worker.done():
+            self._actions_worker = asyncio.create_task(self._run_actions())
+        return await future
+
+    async def _run_actions(self) -> None:
+        while not self._closed:
+            future, context, call, timeout = await self._actions.get()
+            if future.done():
+                continue  # cancelled while queued
+
+            action = asyncio.create_task(asyncio.wait_for(call(), timeout=timeout), context=context)
+            future.add_done_callback(
+                lambda f, action=action: action.cancel() if f.cancelled() else None
+            )
+            self._running_action = action
+            try:
+                await asyncio.wait([action])
+            finally:
+                self._running_action = None
+                action.cancel()  # no-op unless the worker itself was cancelled
+
+            if future.done():
+                continue
+            if action.cancelled():
+                future.set_exception(PageSessionNotFoundError("Page session was closed"))
+            elif action.exception():
+                future.set_exception(action.exception())
+            else:
+                future.set_result(action.result())
+
+    def _cancel_actions(self) -> None:
+        "Fail the pending actions - the session is closing"
+        if self._running_action:
+            self._running_action.cancel()  # the worker fails its caller, then stops
+        elif self._actions_worker:
+            self._actions_worker.cancel()
+        while not self._actions.empty():
+            future, *_ = self._actions.get_nowait()
+            if not future.done():
+                future.set_exception(PageSessionNotFoundError("Page session was closed"))
+
+    def subscribe_events(self) -> asyncio.Queue:
+        "Page events (navigation, console messages, dialogs, errors) are pushed to the queue"
+        if not self._event_subscribers:
+            self._page.on("framenavigated", self._on_frame_navigated)
+            self._page.on("console", self._on_console)
+            self._page.on("dialog", self._on_dialog)
+            self._page.on("pageerror", self._on_page_error)
+        queue = asyncio.Queue(maxsize=conf.session_event_queue_size)
+        self._event_subscribers.add(queue)
+        if self._closed:
+            self._push_event(queue, "closed")
+        return queue
+
+    async def wait_closed(self) -> None:
+        "Returns once the session is closed - regardless of its subscribers' queues"
+        await self._closed_event.wait()
+
+    def unsubscribe_events(self, queue: asyncio.Queue) -> None:
+        self._event_subscribers.discard(queue)
+        if self._event_subscribers or self._closed:
+            return
+        self._page.remove_listener("framenavigated", self._on_frame_navigated)
+        self._page.remove_listener("console", self._on_console)
+        self._page.remove_listener("dialog", self._on_dialog)
+        self._page.remove_listener("pageerror", self._on_page_error)
+
+    @staticmethod
+    def _push_event(queue: asyncio.Queue, event: str, **fields) -> None:
+        message = {"event": event, "timestamp": time.time(), **fields}
+        if event == "closed" and queue.full():
+            queue.get_nowait()  # the subscriber's last message - its oldest one makes room
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass  # a slow subscriber misses events, rather than stalling the page
+
+    def _publish_event(self, event: str, **fields) -> None:
+        for queue in self._event_subscribers:
+            self._push_event(queue, event, **fields)
+
+    def _on_frame_navigated(self, frame: pyppeteer.frame_manager.Frame) -> None:
+        if frame.parentFrame is None:
+            self._publish_event("navigation", url=frame.url)
+
+    def _on_console(self, message: pyppeteer.page.ConsoleMessage) -> None:
+        self._publish_event("console", type=message.type, text=message.text)
+
+    def _on_dialog(self, dialog: pyppeteer.dialog.Dialog) -> None:
+        self._publish_event("dialog", type=dialog.type, message=dialog.message)
+
+    def _on_page_error(self, error: Exception) -> None:
+        self._publish_event("pageerror", error=str(error))
+
+    @property
+    def is_screencasting(self) -> bool:
+        return self._screencasting
+
+    async def screencast(
+        self,
+        image_format: str = "jpeg",
+        quality: Optional[int] = None,
+        max_fps: int = conf.screencast_max_fps,
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the page's screencast frames (decoded images), at most `max_fps` a second -
+        frames arriving faster, or faster than they're consumed, are replaced by the latest one.
+        """
+        if self._screencasting:
+            raise UnableToPerformActionError("Page session is already being screencast")
+        self._screencasting = True
+        client = self._page._client
+        latest_frame = asyncio.Queue(maxsize=1)
+        min_interval = 1 / max(min(max_fps, conf.screencast_max_fps), 1)
+
+        def on_frame(event: dict) -> None:
+            # acked right away - the browser holds back new frames until the last one is acked
+            ack = asyncio.ensure_future(
+                client.send("Page.screencastFrameAck", {"sessionId": event["sessionId"]})
+            )
+            ack.add_done_callback(lambda task: task.cancelled() or task.exception())
+            if latest_frame.full():
+                latest_frame.get_nowait()
+            latest_frame.put_nowait(event["data"])
+
+        params = dict(
+            format=image_format,
+            quality=quality,
+            maxWidth=max_width,
+            maxHeight=max_height,
+            everyNthFrame=1,
+        )
+        client.on("Page.screencastFrame", on_frame)
+        try:
+            await client.send(
+                "Page.startScreencast", {key: value for key, value in params.items() if value}
+            )
+            while not self._closed:
+                try:
+                    # frames are only sent on changes - a static page sends none
+                    data = await asyncio.wait_for(latest_frame.get(), timeout=1)
+                except asyncio.TimeoutError:
+                    continue
+                started = time.monotonic()
+                yield await decode_base64(data)
+                await asyncio.sleep(min_interval - (time.monotonic() - started))
+
+        finally:
+            client.remove_listener("Page.screencastFrame", on_frame)
+            self._screencasting = False
+            if not self._closed:
+                try:
+                    await client.send("Page.stopScreencast")
+                except Exception as e:
+                    logger.bind(page_id=self.id_).warning(f"Failed to stop screencast: {e}")
+
+    async def _start_intercepting(self) -> None:
+        if self._intercepting:
+            return
+        await self._page.setRequestInterception(True)
+        self._page.on("request", self._on_request)
+        self._page.on("response", self._on_response)
+        self._page._client.on("Network.loadingFinished", self._on_loading_finished)
+        self._intercepting = True
+
+    async def _stop_intercepting(self) -> None:
+        if not self._intercepting:
+            return
+        self._page.remove_listener("request", self._on_request)
+        self._page.remove_listener("response", self._on_response)
+        self._page._client.remove_listener("Network.loadingFinished", self._on_loading_finished)
+        await self._page.setRequestInterception(False)
+        self._intercepting = False
+
+    async def enable_request_interception(
+        self,
+        resource_types: Optional[list[str]] = None,
+        domains: Optional[list[str]] = None,
+        blocklists: Optional[list[str]] = None,
+    ) -> None:
+        "Block requests by resource type, (sub)domain & named blocklists - everything else continues"
+        self._blocklist = await get_blocklist(resource_types, domains, blocklists)
+        await self._start_intercepting()
+
+    async def disable_request_interception(self) -> None:
+        self._blocklist = None
+        if not self._response_cache:
+            await self._stop_intercepting()
+
+    async def enable_response_cache(self, response_cache: ResponseCache) -> None:
+        "Serve cacheable static assets from the pool's shared response cache"
+        self._response_cache = response_cache
+        # cookies are only reported on the wire headers - not on intercepted requests & responses
+        self._page._client.on("Network.requestWillBeSentExtraInfo", self._on_request_extra_info)
+        self._page._client.on("Network.responseReceivedExtraInfo", self._on_response_extra_info)
+        await self._start_intercepting()
+
+    def _on_request(self, request: pyppeteer.network_manager.Request) -> None:
+        resource_type = request.resourceType
+        if self._blocklist and self._blocklist.is_blocked(resource_type, request.url):
+            self._network_stats[resource_type]["blocked_requests"] += 1
+            asyncio.ensure_future(request.abort("blockedbyclient"))
+            return
+
+        if self._is_cacheable(request):
+            asyncio.ensure_future(self._continue_from_cache(request))
+        else:
+            self._network_stats[resource_type]["allowed_requests"] += 1
+            self._request_types[request._requestId] = resource_type
+            asyncio.ensure_future(request.continue_())
+
+    def _is_cacheable(self, request: pyppeteer.network_manager.Request) -> bool:
+        return (
+            self._response_cache is not None
+            and request.method == "GET"
+            and request.resourceType in _CACHEABLE_RESOURCE_TYPES
+            and request.url.startswith("http")
+        )
+
+    async def _continue_from_cache(self, request: pyppeteer.network_manager.Request) -> None:
+        try:
+            cached = await self._response_cache.get(request.url, request.headers)
+        except Exception as e:
+            logger.bind(page_id=self.id_).warning(f"Response cache lookup failed: {e}")
+            cached = None
+
+        stats = self._network_stats[request.resourceType]
+        if cached is None:
+            stats["allowed_requests"] += 1
+            self._request_types[request._requestId] = request.resourceType
+            await request.continue_()
+            return
+
+        stats["cached_requests"] += 1
+        stats["cached_bytes"] += cached.size
+        await request.respond(
+            {
+                "status": cached.status,
+                "headers": {**cached.headers, _CACHE_HIT_HEADER: "1"},
+                "body": cached.body,
+            }
+        )
+
+    def _on_response(self, response: pyppeteer.network_manager.Response) -> None:
+        if (
+            self._is_cacheable(response.request)
+            and _CACHE_HIT_HEADER not in response.headers
+            and not response.fromCache
+        ):
+            asyncio.ensure_future(self._store_response(response))
+
+    def _on_request_extra_info(self, event: dict) -> None:
+        if has_credentials(event.get("headers", {})):
+            self._credentialed_requests[event["requestId"]] = True
+
+    def _on_response_extra_info(self, event: dict) -> None:
+        if any(key.lower() == "set-cookie" for key in event.get("headers", {})):
+            self._credentialed_requests[event["requestId"]] = True
+
+    async def _store_response(self, response: pyppeteer.network_manager.Response) -> None:
+        try:
+            body = await response.buffer()
+            if self._credentialed_requests.pop(response.request._requestId, None):
+                return
+            await self._response_cache.put(
+                response.url, response.status, response.headers, body, response.request.headers
+            )
+        except Exception as e:
+            logger.bind(page_id=self.id_).debug(f"Response not cached: {e}")
+
+    def _on_loading_finished(self, event: dict) -> None:
+        resource_type = self._request_types.pop(event.get("requestId"), None)
+        if resource_type:
+            self._network_stats[resource_type]["allowed_bytes"] += int(event["encodedDataLength"])
+
+    @property
+    def interception_metrics(self) -> dict:
+        """
+        Blocked, allowed & cache-served requests and bytes, per resource type.
+        Blocked requests are never downloaded - their bytes are estimated by the average size
+        of allowed responses of the same resource type.
+        """
+        by_resource_type = {}
+        for resource_type, stats in self._network_stats.items():
+            avg_size = (
+                stats["allowed_bytes"] / stats["allowed_requests"]
+                if stats["allowed_requests"]
+                else 0
+            )
+            by_resource_type[resource_type] = dict(
+                stats, blocked_bytes=int(avg_size * stats["blocked_requests"])
+            )
+
+        return {
+            "enabled": self._blocklist is not None,
+            "blocklist": self._blocklist.__repr__() if self._blocklist else None,
+            "response_cache": self._response_cache is not None,
+            **{
+                key: sum([stats[key] for stats in by_resource_type.values()])
+                for key in [
+                    "blocked_requests",
+                    "blocked_bytes",
+                    "allowed_requests",
+                    "allowed_bytes",
+                    "cached_requests",
+                    "cached_bytes",
+                ]
+            },
+            "by_resource_type": by_resource_type,
+        }
+
+    async def perform_action_blockRequests(self, page: pyppeteer.page.Page, **kwargs) -> dict:
+        if not kwargs.pop("enabled", True):
+            await self.disable_request_interception()
+        else:
+            await self.enable_request_interception(
+                resource_types=kwargs.pop("resourceTypes", None),
+                domains=kwargs.pop("domains", None),
+                blocklists=kwargs.pop("blocklists", None),
+            )
+        return self.interception_metrics
+
+    async def _track_mutations(self) -> None:
+        "Count DOM mutations from now on - of the current document, and every new one"
+        if self._tracking_mutations or not conf.content_mutation_tracking:
+            return
+        await self._page.evaluateOnNewDocument(MUTATION_OBSERVER_SCRIPT)
+        await self._page.evaluate(MUTATION_OBSERVER_SCRIPT)
+        self._tracking_mutations = True
+
+    async def perform_action_extractPageContents(self, page: pyppeteer.page.Page, **kwargs) -> dict:
+        """
+        The page's contents, along with their ETag - unchanged contents (same document & no DOM
+        mutations since) aren't re-read to be hashed.
+        When the ETag matches `ifNoneMatch`, only `notModified` is returned; with `diff`, only the
+        subtrees that changed since the `ifNoneMatch` version, if they're known.
+        """
+        client_etags = parse_etags(kwargs.pop("ifNoneMatch", None) or "")
+        diff = kwargs.pop("diff", False)
+        await self._track_mutations()
+        document_id, mutations = await page.evaluate(DOCUMENT_STATE_SCRIPT)
+        version = (document_id, mutations) if document_id else None
+
+        content = None
+        etag = next(
+            (
+                etag
+                for etag, known in self._content_versions.items()
+                if version and known == version
+            ),
+            None,
+        )
+        if etag is None:
+            content = await page.content()
+            etag = await content_hash(content)
+            if version:
+                self._content_versions[etag] = version
+
+        if etag in client_etags or "*" in client_etags:
+            return dict(notModified=True, etag=etag)
+
+        if diff:
+            base = next((etag for etag in client_etags if etag in self._content_versions), None)
+            base_version = self._content_versions.get(base)
+            if version and base_version and base_version[0] == document_id:
+                changes = await page.evaluate(
+                    CHANGED_SUBTREES_SCRIPT,
+                    document_id,
+                    base_version[1],
+                    conf.content_diff_max_subtrees,
+                )
+                if changes is not None:
+                    return dict(
+                        url=page.url,
+                        title=await page.title(),
+                        etag=etag,
+                        diff=True,
+                        base=base,
+                        changes=changes,
+                    )
+
+        contents = dict(
+            url=page.url,
+            title=await page.title(),
+            content=content if content is not None else await page.content(),
+            etag=etag,
+        )
+        if diff:
+            contents["diff"] = False  # the client's version is unknown - the full contents
+        return contents
+
+    async def perform_action_getPageMetrics(self, page: pyppeteer.page.Page, **kwargs) -> dict:
+        return await self.get_page_metrics()
+
     async def get_page_metrics(self) -> dict:
         dom_size = await self._page.evaluate("document.getElementsByTagName('*').length")
         navigation_timing = await self._page.evaluate("JSON.stringify(window.performance.timing)")
@@ -95,12 +658,16 @@ class PageSession:
             "load_time": load_time,
             "viewport": viewport,
             "metrics": metrics,
+            "request_interception": self.interception_metrics,
         }
 
     @pyd.validate_arguments
     @log_elapsed_time
     async def perform_page_action(self, action: PageActionType, **kwargs) -> Any:
         return_page_contents = kwargs.pop("returnPageContents", False)
+        # conditions awaited before the action - e.g. `none` for hot loops on a loaded page
+        readiness = kwargs.pop("readiness", _DEFAULT_READINESS.get(action, "none"))
+        readiness_timeout = kwargs.pop("readinessTimeout", None)
 
         match action:
             case PageActionType.CLICK:
@@ -115,6 +682,9 @@ class PageSession:
             case PageActionType.SCREENSHOT:
                 call_method = perform_action_screenshot
 
+            case PageActionType.PDF:
+                call_method = perform_action_pdf
+
             case PageActionType.GOTO:
                 call_method = perform_action_goto
 
@@ -128,7 +698,10 @@ class PageSession:
                 call_method = perform_action_evaluate
 
             case PageActionType.EXTRACT_PAGE_CONTENTS:
-                call_method = perform_action_extractPageContents
+                call_method = self.perform_action_extractPageContents
+
+            case PageActionType.EXTRACT:
+                call_method = perform_action_extract
 
             case PageActionType.EXPOSE_FUNCTION:
                 call_method = perform_action_exposeFunction
@@ -173,7 +746,10 @@ class PageSession:
                 call_method = perform_action_stopJSCoverage
 
             case PageActionType.GET_PAGE_METRICS:
-                call_method = self.get_page_metrics
+                call_method = self.perform_action_getPageMetrics
+
+            case PageActionType.BLOCK_REQUESTS:
+                call_method = self.perform_action_blockRequests
 
             case PageActionType.GET_ACCESSIBILITY_TREE:
                 call_method = perform_action_getAccessibilityTree
@@ -184,10 +760,20 @@ class PageSession:
             case PageActionType.SET_EXTRA_HTTP_HEADERS:
                 call_method = perform_action_setExtraHttpHeaders
 
+            case PageActionType.WAIT_FOR:
+                call_method = perform_action_waitFor
+
+            case PageActionType.WAIT_FOR_SELECTOR:
+                call_method = perform_action_waitForSelector
+
+            case PageActionType.WAIT_FOR_TEXT:
+                call_method = perform_action_waitForText
+
             case _:
                 raise NotImplementedError(f"Action '{action}' is not supported!")
 
         try:
+            await wait_until(self._page, readiness_conditions(readiness), readiness_timeout)
             res = await call_method(self._page, **kwargs)
             if return_page_contents and action != PageActionType.EXTRACT_PAGE_CONTENTS:
                 return await perform_action_extractPageContents(self._page)
@@ -201,3 +787,53 @@ class PageSession:
 
         finally:
             self.update_last_used()
+
+    async def perform_batch(self, steps: list[dict]) -> dict:
+        """
+        Perform a sequence of actions - each step's output is kept under its `id`, and may be
+        referenced by later steps' arguments (`$<step-id>.<key>`).
+        A failed step stops the batch, unless it's set with `stopOnError: false`.
+        """
+        outputs, results = {}, []
+        started = time.perf_counter()
+        stopped = False
+        for index, step in enumerate(steps):
+            step = dict(step)
+            step_id = step.pop("id", None) or str(index)
+            timeout = step.pop("timeout", None) or conf.default_timeout
+            stop_on_error = step.pop("stopOnError", True)
+            result = {"id": step_id, "action": PageActionType(step["action"]).value}
+            if stopped:
+                results.append({**result, "status": "skipped"})
+                continue
+
+            step_started = time.perf_counter()
+            try:
+                output = await asyncio.wait_for(
+                    self.perform_page_action(**_resolve_references(step, outputs)),
+                    timeout=timeout,
+                )
+                if isinstance(output, dict) and "error" in output:
+                    raise UnableToPerformActionError(output["error"])
+                if isinstance(output, BinaryContent):
+                    # a batch's results are a single JSON document
+                    output = dict(
+                        media_type=output.media_type,
+                        data=await encode_base64(output.content),
+                    )
+                outputs[step_id] = output
+                result.update(status="ok", result=output)
+
+            except Exception as e:
+                error = "Step has been timed-out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                result.update(status="error", error=error)
+                stopped = stop_on_error
+
+            result["elapsed_ms"] = round((time.perf_counter() - step_started) * 1000, 2)
+            results.append(result)
+
+        return dict(
+            completed=not stopped,
+            steps=results,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
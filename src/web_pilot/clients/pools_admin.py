@@ -2,13 +2,14 @@ import uuid
 import pydantic as pyd
 
 from hashlib import sha1
-from typing import Optional, Tuple
+from typing import Awaitable, Callable, Optional, Tuple
 from web_pilot.logger import logger
 from web_pilot.clients.browser_pool import BrowserPool
-from web_pilot.exc import PoolAlreadyExistsError, PageSessionNotFoundError
+from web_pilot.exc import PoolAlreadyExistsError, PageSessionNotFoundError, PoolIsInactiveError
 from web_pilot.clients.leased_browser import LeasedBrowser
 from web_pilot.clients.page_session import PageSession
 from web_pilot.utils.sessions import break_session_id_to_parts
+from web_pilot.utils.metadata_store import metadata_store
 
 
 class PoolAdmin:
@@ -47,15 +48,24 @@ class PoolAdmin:
     #     "Get all pools"
     #     return cls._pools
 
+    @classmethod
+    async def _discard_pool(cls, pool_id: str) -> None:
+        pool = cls._pools.pop(pool_id)
+        pool.clear_response_cache()
+        for browser in pool.browsers:
+            metadata_store.delete("browser", browser.id_)
+        metadata_store.delete("pool", pool_id)
+        await pool.close()
+
     @classmethod
     @pyd.validate_arguments
-    def delete_pool(cls, pool_id: str, force: bool = False) -> bool:
+    async def delete_pool(cls, pool_id: str, force: bool = False) -> bool:
         "Remove pool by its ID"
         if pool_id not in cls._pools:
             return False
 
         if force:
-            del cls._pools[pool_id]
+            await cls._discard_pool(pool_id)
         else:
             cls._deletion_candidates.append(pool_id)
             cls._pools[pool_id].mark_as_inactive()
@@ -63,16 +73,16 @@ class PoolAdmin:
 
     @classmethod
     @pyd.validate_arguments
-    def remove_deletion_candidates(cls) -> None:
+    async def remove_deletion_candidates(cls) -> None:
         logger.debug("Removing pools marked for deletion...")
-        for p_idx, pool_id in enumerate(cls._deletion_candidates):
+        for pool_id in list(cls._deletion_candidates):
             if pool_id not in cls._pools or not cls._pools[pool_id].is_idle:
                 logger.bind(pool_id=pool_id).info(
                     "Is candidate for deletion, but is currently busy - skipping deletion"
                 )
                 continue
-            del cls._pools[pool_id]
-            cls._deletion_candidates.pop(p_idx)
+            cls._deletion_candidates.remove(pool_id)
+            await cls._discard_pool(pool_id)
             logger.bind(pool_id=pool_id).info("Pool deleted successfully")
 
     @classmethod
@@ -82,12 +92,59 @@ class PoolAdmin:
         pool_id = sha1(str(config).encode()).hexdigest()
         if pool_id not in cls._pools:
             cls._pools[pool_id] = BrowserPool(pool_id, config)
+            cls._pools[pool_id].publish_metadata()
         return pool_id
 
+    @classmethod
+    async def _for_each_pool(
+        cls, task: str, func: Callable[[BrowserPool], Awaitable[None]]
+    ) -> None:
+        "Run a maintenance task on every pool - one pool failing (e.g. deleted meanwhile) doesn't stop the rest"
+        for pool_id, pool in list(cls._pools.items()):
+            try:
+                await func(pool)
+            except PoolIsInactiveError:
+                logger.bind(pool_id=pool_id).debug(f"Pool became inactive - skipping its {task}")
+            except Exception as e:
+                logger.bind(pool_id=pool_id).error(f"Pool {task} failed: {e}")
+
     @classmethod
     async def manage_pools_scaling(cls) -> None:
         "Scale-up and scale-down pools"
         logger.debug("Checking Scaling conditions for pools...")
+        await cls._for_each_pool("auto-scaling", lambda pool: pool.auto_scale())
+
+    @classmethod
+    async def maintain_warm_browsers(cls) -> None:
+        "Keep warm standby browsers launched in every pool"
+        logger.debug("Maintaining warm standby browsers for pools...")
+        await cls._for_each_pool("warm-up", lambda pool: pool.maintain_warm_browsers())
+
+    @classmethod
+    async def close_all_pools(cls) -> None:
+        "Close every pool's browsers - on shutdown"
+        for pool_id in list(cls._pools):
+            await cls._discard_pool(pool_id)
+
+    @classmethod
+    def refresh_placement_indexes(cls) -> None:
+        "Re-index pools' browsers after their resource usage has been sampled"
+        for _, pool in cls._pools.items():
+            pool.refresh_placement_index()
+
+    @classmethod
+    async def check_remote_browsers(cls) -> None:
+        "Health-check pools' remote browser workers"
+        await cls._for_each_pool("health-check", lambda pool: pool.check_remote_browsers())
+
+    @classmethod
+    def publish_metadata(cls) -> None:
+        "Re-publish pools' & browsers' metadata to the shared metadata store"
         for _, pool in cls._pools.items():
-            pool.auto_scale_up()
-            await pool.auto_scale_down()
+            pool.publish_metadata()
+
+    @classmethod
+    async def manage_browsers_recycling(cls) -> None:
+        "Recycle pools' browsers that crossed their pool's recycle thresholds"
+        logger.debug("Checking recycling conditions for browsers...")
+        await cls._for_each_pool("recycling", lambda pool: pool.recycle_browsers())
@@ -0,0 +1,106 @@
+import math
+
+from time import monotonic
+from typing import TYPE_CHECKING
+from web_pilot.config import config as conf
+from web_pilot.schemas.constants.scaling_policy import ScalingPolicyType
+
+if TYPE_CHECKING:
+    from web_pilot.clients.browser_pool import BrowserPool
+
+
+class ScalingPolicy:
+    "Decides by how many browsers a pool should grow (positive) or shrink (negative) on a scaling check"
+
+    def desired_delta(self, pool: "BrowserPool") -> int:
+        raise NotImplementedError
+
+    def __repr__(self) -> dict:
+        return dict(type=self.type_.value)
+
+
+class ThresholdScalingPolicy(ScalingPolicy):
+    "Fixed page-utilization & CPU thresholds - adds or removes one browser at a time"
+
+    type_ = ScalingPolicyType.THRESHOLD
+
+    def desired_delta(self, pool: "BrowserPool") -> int:
+        pool.pop_session_arrivals()  # not used by this policy
+        utilization, cpu_usage = pool.page_utilization, pool.avg_cpu_usage
+        if pool.load > 0 and (utilization >= 0.6 or cpu_usage >= 0.7):
+            return 1
+        if utilization <= 0.3 and cpu_usage <= 0.3:
+            return -1
+        return 0
+
+
+class PredictiveScalingPolicy(ScalingPolicy):
+    """
+    Tracks an EWMA of the session-arrival rate, page utilization & CPU usage, and provisions
+    enough browsers for the demand expected within the look-ahead window - several at once if needed.
+    Scale-downs require the smoothed utilization to drop below a low watermark (hysteresis),
+    and both directions are guarded by cooldowns to prevent flapping.
+    """
+
+    type_ = ScalingPolicyType.PREDICTIVE
+
+    def __init__(self) -> None:
+        self.arrival_rate = None  # sessions per second
+        self.utilization = None
+        self.cpu_usage = None
+        self._last_check = monotonic()
+        self._last_scale_up = 0.0
+        self._last_scale_down = 0.0
+
+    def __repr__(self) -> dict:
+        return dict(
+            type=self.type_.value,
+            arrival_rate=self.arrival_rate,
+            utilization=self.utilization,
+            cpu_usage=self.cpu_usage,
+        )
+
+    @staticmethod
+    def _ewma(previous, value: float) -> float:
+        if previous is None:
+            return value
+        return conf.scaling_ewma_alpha * value + (1 - conf.scaling_ewma_alpha) * previous
+
+    def desired_delta(self, pool: "BrowserPool") -> int:
+        now = monotonic()
+        elapsed, self._last_check = max(now - self._last_check, 1.0), now
+        self.arrival_rate = self._ewma(self.arrival_rate, pool.pop_session_arrivals() / elapsed)
+        self.utilization = self._ewma(self.utilization, pool.page_utilization)
+        self.cpu_usage = self._ewma(self.cpu_usage, pool.avg_cpu_usage)
+
+        current = len(pool.local_browsers)
+        expected_load = pool.load + self.arrival_rate * conf.scaling_lookahead
+        # remote workers absorb their share of the load - only the rest is provisioned locally
+        local_load = max(expected_load - pool.remote_capacity * conf.scaling_target_utilization, 0)
+        desired = math.ceil(local_load / (pool.pages_per_browser * conf.scaling_target_utilization))
+        if self.cpu_usage >= conf.scaling_high_cpu:
+            desired = max(desired, current + 1)
+
+        if desired > current and now - self._last_scale_up >= conf.scaling_up_cooldown:
+            self._last_scale_up = now
+            return min(desired - current, conf.scaling_max_step)
+
+        if (
+            desired < current
+            and self.utilization <= conf.scaling_low_utilization
+            and self.cpu_usage < conf.scaling_high_cpu
+            and now - max(self._last_scale_down, self._last_scale_up) >= conf.scaling_down_cooldown
+        ):
+            self._last_scale_down = now
+            return -min(current - desired, conf.scaling_max_step)
+        return 0
+
+
+def get_scaling_policy(type_: ScalingPolicyType) -> ScalingPolicy:
+    match type_:
+        case ScalingPolicyType.THRESHOLD:
+            return ThresholdScalingPolicy()
+        case ScalingPolicyType.PREDICTIVE:
+            return PredictiveScalingPolicy()
+        case _:
+            raise ValueError(f"Unsupported scaling policy: {type_}")
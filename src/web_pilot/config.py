@@ -3,8 +3,10 @@ import os
 from pyppeteer import executablePath
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import Literal, Union
+from typing import Literal, Optional, Union
 from web_pilot.schemas.constants.cache import CacheProvider
+from web_pilot.schemas.constants.placement_policy import PlacementPolicy
+from web_pilot.schemas.constants.scaling_policy import ScalingPolicyType
 
 
 class BaseConfig(BaseSettings):
@@ -22,6 +24,11 @@ class BaseConfig(BaseSettings):
     host_address: str = "0.0.0.0"
     host_port: int = 8000
     default_timeout: int = 60
+    # multi-worker mode - with `workers_count` > 1, a dispatcher listening on `host_port` routes
+    # requests to worker processes listening on consecutive ports from `workers_base_port`.
+    # Every worker holds each pool - the pools' browser counts (incl. warm ones) apply per worker
+    workers_base_port: int = 8100
+    worker_id: Optional[int] = None  # set in each worker process
 
     # logging config
     export_logs: bool = False
@@ -31,14 +38,94 @@ class BaseConfig(BaseSettings):
     max_pools: int = 10
     idle_pool_deletion_interval: int = 30
     pools_scaling_check_interval: int = 60
+    warm_browsers_check_interval: int = 5
+    resource_sampling_interval: int = 5
+    resource_samples_history: int = 12  # samples kept per browser
+    browsers_recycle_check_interval: int = 10
+    remote_browsers_health_check_interval: int = 10
 
     # browser pool config
+    browser_pool_min_size: int = 0  # default per-pool min/max number of browsers
     browser_pool_max_size: int = 1
     browser_max_cached_items: int = 100  # max pages cached in memory
-    user_data_dir: str = "./user_data"
+    browser_max_contexts: int = 500  # max sessions per browser when isolated by browser-contexts
+    pool_min_warm_browsers: int = 1  # launched & unleased browsers kept ready per pool (& worker)
+    pool_max_warm_browsers: int = 1
+    # browsers crossing any of these thresholds are drained & replaced, 0 disables the threshold
+    browser_recycle_max_pages: int = 1000  # pages served
+    browser_recycle_max_memory: int = 2048  # RSS in MB
+    browser_recycle_max_age: int = 3600  # seconds since launch
+    user_data_dir: str = "./user_data"  # template profile, cloned for each browser
+    ephemeral_profiles: bool = True  # give each browser its own (removed on close) profile dir
+    profiles_root_dir: str = "/dev/shm/web_pilot_profiles"  # preferably RAM-backed
+    browser_min_blank_pages: int = 1  # pre-opened `about:blank` pages kept per browser
+    browser_max_blank_pages: int = 5
+    blank_pages_rate_window: int = 30  # seconds of session-creation history used to size the pool
+    blank_pages_refill_horizon: int = 2  # seconds of expected demand to keep pre-opened
+    # shared per-pool cache of static assets (scripts, stylesheets, images & fonts)
+    pool_response_cache: bool = False
+    response_cache_memory_size: int = 64  # MB
+    response_cache_disk_size: int = 512  # MB
+    response_cache_max_entry_size: int = 8  # MB
+    response_cache_dir: str = "./response_cache"
+
+    # remote browser workers - Chromium instances attached over their CDP websocket endpoint
+    remote_browser_connect_timeout: int = 10
+    remote_browser_max_failed_checks: int = 3  # consecutive failed pings before reconnecting
+
+    # browser placement
+    pool_placement_policy: PlacementPolicy = PlacementPolicy.LEAST_LOADED
+    # weights of the browser's load score
+    placement_pages_weight: float = 0.6
+    placement_cpu_weight: float = 0.3
+    placement_memory_weight: float = 0.1
+    placement_memory_reference: int = 2048  # RSS (MB) considered as a fully loaded browser
+
+    # auto-scaling
+    pool_scaling_policy: ScalingPolicyType = ScalingPolicyType.PREDICTIVE
+    scaling_ewma_alpha: float = 0.3
+    scaling_lookahead: int = 60  # seconds of expected session arrivals to provision for
+    scaling_target_utilization: float = 0.7
+    scaling_low_utilization: float = 0.3  # smoothed utilization below which scaling down is allowed
+    scaling_high_cpu: float = 0.7
+    scaling_max_step: int = 3  # max browsers added or removed per check
+    scaling_up_cooldown: int = 30
+    scaling_down_cooldown: int = 300
 
     # Page Session config
     page_idle_timeout: int = 180  # 3 minutes
+    blocklists_dir: str = "./blocklists"  # named request-blocklists - `<name>.txt` files
+    blocklist_cache_size: int = 64  # compiled request-blocklists, by their rules
+    extract_script_cache_size: int = 256  # compiled `extract` schemas
+    content_mutation_tracking: bool = True  # unchanged pages' contents aren't re-read to be hashed
+    content_versions_kept: int = 16  # per session - versions clients can ask for a diff from
+    content_diff_max_changes: int = 10000  # mutated nodes kept by the in-page observer
+    content_diff_max_subtrees: int = 200  # more changed subtrees - the full contents are returned
+    wait_timeout: int = 30000  # ms - of wait conditions & actions' readiness strategies
+    wait_network_idle_ms: int = 500  # default quiet period of `networkIdle` conditions
+    wait_dom_stable_ms: int = 500  # default quiet period of `domStable` conditions
+    wait_scan_interval_ms: int = 100  # min interval between full-document checks of a wait
+    session_action_queue_size: int = 32  # pending actions per session, beyond them requests get 429
+    batch_max_steps: int = 50
+    batch_timeout: int = 120  # of a whole batch - steps are limited by `default_timeout` each
+    session_event_queue_size: int = 256  # page events buffered per websocket client
+    bulk_sessions_max: int = 500  # sessions per bulk request
+    bulk_sessions_browser_concurrency: int = 4  # pages a bulk request opens at once per browser
+    binary_stream_chunk_size: int = 1024 * 1024  # read from the browser at a time, e.g. of PDFs
+    screencast_max_fps: int = 30
+    screencast_touch_interval: float = 5  # seconds between TTL resets of a screencast session
+
+    # Response encoding - negotiated by session routes (msgpack & zstd when installed)
+    response_compression_min_size: int = 1024  # smaller bodies aren't compressed
+    response_offload_threshold: int = 256 * 1024  # larger bodies are encoded in a worker thread
+    response_gzip_level: int = 5
+    response_zstd_level: int = 3
+
+    # sessions expire `cache_ttl` seconds after their last use
+    expiry_check_interval: int = 1  # resolution of the expiry timer wheel
+    expiry_wheel_slots: int = 512  # later deadlines are re-bucketed lazily
+    expiry_batch_size: int = 50
+    expiry_max_concurrency: int = 10  # expired pages closed concurrently
 
     # Chromium
     chromium_path: str = Field(default_factory=executablePath)
@@ -46,7 +133,14 @@ class BaseConfig(BaseSettings):
     # caching
     cache_ttl: float = 300  # 5 minutes
     cache_provider: CacheProvider = CacheProvider.IN_MEMORY
-    cache_cleanup_interval: int = 60  # 1 minute
+    # metadata of pools, browsers & sessions - shared between processes with the redis provider
+    redis_url: str = "redis://localhost:6379/0"
+    metadata_key_prefix: str = "web_pilot"
+    metadata_flush_interval: float = 0.5  # pending writes are pipelined to redis at this interval
+    metadata_publish_interval: int = 10
+    metadata_record_ttl: int = 30  # pools' & browsers' records expire unless re-published
+    metadata_local_ttl: float = 1  # seconds reads are served from the local cache
+    metadata_local_cache_size: int = 10000
 
     class Config:
         case_sensitive = False
@@ -3,6 +3,11 @@ class BrowserPoolCapacityReachedError(Exception):
         self.message = message
 
 
+class CacheCapacityReachedError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+
+
 class NoAvailableBrowserError(Exception):
     def __init__(self, message: str):
         self.message = message
@@ -38,6 +43,11 @@ class RateLimitsExceededError(Exception):
         self.message = message
 
 
+class SessionActionQueueFullError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+
+
 class InvalidSessionIDError(Exception):
     def __init__(self, message: str):
         self.message = message
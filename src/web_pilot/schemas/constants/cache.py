@@ -3,3 +3,4 @@ from enum import Enum
 
 class CacheProvider(Enum):
     IN_MEMORY = "in_memory"
+    REDIS = "redis"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class LaunchPreset(Enum):
+    LEAN_SCRAPE = "lean-scrape"  # fast & light - no images, no background services
+    FULL_RENDER = "full-render"  # faithful rendering, no background throttling
+    LOW_MEMORY = "low-memory"  # fewest processes & smallest heaps/caches
@@ -6,6 +6,7 @@ class PageActionType(Enum):
     AUTHENTICATE = "authenticate"
     SET_USER_AGENT = "setUserAgent"
     SCREENSHOT = "screenshot"
+    PDF = "pdf"
     GOTO = "goto"
     GO_BACK = "goBack"
     GO_FORWARD = "goForward"
@@ -14,10 +15,12 @@ class PageActionType(Enum):
     CLEAR_GEOLOCATION = "clearGeoLocation"
     SET_VIEWPORT = "setViewport"
     EXTRACT_PAGE_CONTENTS = "extractPageContents"
+    EXTRACT = "extract"
     EXPOSE_FUNCTION = "exposeFunction"
     REMOVE_FUNCTION = "removeFunction"
     WAIT_FOR_SELECTOR = "waitForSelector"
-    # WAIT_FOR_TEXT = "waitForText"
+    WAIT_FOR_TEXT = "waitForText"
+    WAIT_FOR = "waitFor"
     ADD_SCRIPT_TAG = "addScriptTag"
     REMOVE_SCRIPT_TAG = "removeScriptTag"
     EVALUATE_HANDLE = "evaluateHandle"
@@ -31,3 +34,4 @@ class PageActionType(Enum):
     GET_ACCESSIBILITY_TREE = "getAccessibilityTree"
     SET_CONTENT = "setContent"
     SET_EXTRA_HTTP_HEADERS = "setExtraHttpHeaders"
+    BLOCK_REQUESTS = "blockRequests"
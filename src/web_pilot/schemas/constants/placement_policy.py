@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PlacementPolicy(Enum):
+    LEAST_LOADED = "least-loaded"  # lowest weighted load first
+    BIN_PACK = "bin-pack"  # fill the most loaded browser that still has capacity
+    SPREAD = "spread"  # round-robin - least recently placed browser first
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ScalingPolicyType(Enum):
+    THRESHOLD = "threshold"  # fixed utilization thresholds, one browser per check
+    PREDICTIVE = "predictive"  # EWMA demand tracking, scales ahead of demand
@@ -0,0 +1,51 @@
+import pydantic as pyd
+
+from typing import Any, Literal, Optional, Union
+
+
+class ExtractionField(pyd.BaseModel):
+    """
+    A field of an `extract` action's schema - a string value is shorthand for a CSS selector
+    whose element's text is extracted.
+    Without a selector, the field is extracted from its parent's element (e.g. to group fields).
+    """
+
+    selector: Optional[str] = None  # CSS
+    xpath: Optional[str] = None
+    attribute: Optional[str] = None  # e.g. href - as written in the markup
+    property: Optional[str] = None  # e.g. href (resolved), value, innerHTML - of the DOM element
+    type: Literal["string", "number", "boolean"] = "string"
+    default: Any = None  # when the element, or its value, is missing
+    multiple: bool = False  # every matching element - a list
+    offset: pyd.NonNegativeInt = 0  # pagination of multiple elements
+    limit: Optional[pyd.PositiveInt] = None
+    fields: Optional[dict[str, Union[str, "ExtractionField"]]] = None  # nested object(s)
+
+    class Config:
+        extra = "forbid"
+
+    @pyd.field_validator("fields")
+    @classmethod
+    def expand_shorthands(cls, fields: Optional[dict]) -> Optional[dict]:
+        if fields is None:
+            return None
+        if not fields:
+            raise ValueError("'fields' can't be empty")
+        return {
+            name: ExtractionField(selector=field) if isinstance(field, str) else field
+            for name, field in fields.items()
+        }
+
+    @pyd.model_validator(mode="after")
+    def validate_field(self):
+        if self.selector and self.xpath:
+            raise ValueError("A field can have either a 'selector' or an 'xpath'")
+        if self.attribute and self.property:
+            raise ValueError("A field can have either an 'attribute' or a 'property'")
+        if self.fields and (self.attribute or self.property):
+            raise ValueError("A field with nested 'fields' can't have an 'attribute' or 'property'")
+        if self.multiple and not (self.selector or self.xpath):
+            raise ValueError("A 'multiple' field must have a 'selector' or an 'xpath'")
+        if (self.offset or self.limit) and not self.multiple:
+            raise ValueError("'offset' & 'limit' apply to 'multiple' fields only")
+        return self
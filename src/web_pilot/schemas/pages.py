@@ -18,3 +18,10 @@ class Snapshot(pyd.BaseModel):
     timestamp: str = pyd.Field(default="")
     user_agent: str = pyd.Field(default="")
     viewport_size: dict = pyd.Field(default={})
+
+
+class BinaryContent(pyd.BaseModel):
+    "Binary output of an action (screenshots, PDFs) - sent to the client as raw bytes"
+
+    media_type: str
+    content: bytes
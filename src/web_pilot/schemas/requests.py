@@ -1,7 +1,36 @@
 import pydantic as pyd
 
 from typing import Optional
+from web_pilot.config import config as conf
 from web_pilot.schemas.constants.page_action_type import PageActionType
+from web_pilot.schemas.constants.placement_policy import PlacementPolicy
+from web_pilot.schemas.constants.scaling_policy import ScalingPolicyType
+from web_pilot.schemas.constants.launch_preset import LaunchPreset
+
+
+class RequestBlockingConfig(pyd.BaseModel):
+    resource_types: Optional[list[str]] = None  # e.g. image, font, media, stylesheet
+    domains: Optional[list[str]] = None  # blocked along with their subdomains
+    blocklists: Optional[list[str]] = None  # names of blocklist files in `blocklists_dir`
+
+    class Config:
+        extra = "forbid"
+
+
+class RemoteBrowserRegisterReq(pyd.BaseModel):
+    # `ws://host:port/devtools/browser/<id>`, or a `http://host:port` debugging address
+    ws_endpoint: str
+    max_pages: Optional[pyd.PositiveInt] = None
+
+    class Config:
+        extra = "forbid"
+
+    @pyd.field_validator("ws_endpoint")
+    @classmethod
+    def validate_ws_endpoint(cls, value: str) -> str:
+        if not value.startswith(("ws://", "wss://", "http://", "https://")):
+            raise ValueError("'ws_endpoint' must be a websocket or http(s) URL")
+        return value
 
 
 class PoolAdminCreateReq(pyd.BaseModel):
@@ -14,13 +43,65 @@ class PoolAdminCreateReq(pyd.BaseModel):
     proxy_server: Optional[str]
     platform: Optional[str]
     browser: Optional[str]
+    context_isolation: Optional[bool] = None
+    launch_preset: Optional[LaunchPreset] = None
+    request_blocking: Optional[RequestBlockingConfig] = None
+    response_cache: Optional[bool] = None
+    min_warm_browsers: Optional[pyd.NonNegativeInt] = None
+    max_warm_browsers: Optional[pyd.NonNegativeInt] = None
+    placement_policy: Optional[PlacementPolicy] = None
+    scaling_policy: Optional[ScalingPolicyType] = None
+    min_browsers: Optional[pyd.NonNegativeInt] = None
+    max_browsers: Optional[pyd.PositiveInt] = None
+    recycle_max_pages: Optional[pyd.NonNegativeInt] = None
+    recycle_max_memory: Optional[pyd.NonNegativeInt] = None
+    recycle_max_age: Optional[pyd.NonNegativeInt] = None
 
     class Config:
         extra = "forbid"
 
+    @pyd.model_validator(mode="after")
+    def validate_min_max_settings(self):
+        if (
+            self.min_warm_browsers is not None
+            and self.max_warm_browsers is not None
+            and self.min_warm_browsers > self.max_warm_browsers
+        ):
+            raise ValueError("'min_warm_browsers' can't be greater than 'max_warm_browsers'")
+        if (
+            self.min_browsers is not None
+            and self.max_browsers is not None
+            and self.min_browsers > self.max_browsers
+        ):
+            raise ValueError("'min_browsers' can't be greater than 'max_browsers'")
+        return self
+
 
 class PageActionRequest(pyd.BaseModel):
     action: PageActionType
 
     class Config:
         extra = "allow"
+
+
+class BatchStepRequest(PageActionRequest):
+    id: Optional[str] = None  # later steps reference its output as `$<id>`, defaults to its index
+    timeout: Optional[pyd.PositiveFloat] = None
+    stopOnError: bool = True
+
+
+class PageActionBatchRequest(pyd.BaseModel):
+    steps: list[BatchStepRequest] = pyd.Field(min_length=1)
+
+    class Config:
+        extra = "forbid"
+
+    @pyd.field_validator("steps")
+    @classmethod
+    def validate_steps(cls, steps: list[BatchStepRequest]) -> list[BatchStepRequest]:
+        if len(steps) > conf.batch_max_steps:
+            raise ValueError(f"A batch can't have more than {conf.batch_max_steps} steps")
+        ids = [step.id for step in steps if step.id is not None]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Step IDs must be unique")
+        return steps
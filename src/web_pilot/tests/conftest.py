@@ -0,0 +1,4 @@
+import os
+
+# the configuration is loaded on import - tests run against the local one
+os.environ.setdefault("ENVIRONMENT", "localhost")
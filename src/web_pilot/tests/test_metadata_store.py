@@ -0,0 +1,165 @@
+import json
+import pytest
+
+from web_pilot.config import config as conf
+from web_pilot.utils.metadata_store import MetadataStore, RedisMetadataStore
+
+
+class FakeRedis:
+    "Just enough of `redis.asyncio.Redis` (decoding responses) for the metadata store"
+
+    def __init__(self) -> None:
+        self.hashes = {}
+        self.sets = {}
+        self.ttls = {}
+        self.pipelines = []  # commands of every executed pipeline
+        self.before_execute = None
+        self.fail_next = False
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def _hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def _sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def _srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    def _expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def _delete(self, key):
+        self.hashes.pop(key, None)
+        self.ttls.pop(key, None)
+
+    def _hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def srem(self, key, *members):
+        self._srem(key, *members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, command: str):
+        return lambda *args, **kwargs: self._commands.append((command, args, kwargs))
+
+    async def execute(self) -> list:
+        client = self._client
+        client.pipelines.append([command for command, _, _ in self._commands])
+        if client.before_execute:
+            client.before_execute()
+        if client.fail_next:
+            client.fail_next = False
+            raise ConnectionError("Connection refused")
+        return [
+            getattr(client, f"_{command}")(*args, **kwargs)
+            for command, args, kwargs in self._commands
+        ]
+
+
+def key(kind: str, id_: str = None) -> str:
+    return f"{conf.metadata_key_prefix}:{kind}" + (f":{id_}" if id_ else "")
+
+
+def test_metadata_store_is_abstract():
+    with pytest.raises(TypeError):
+        MetadataStore()
+
+
+@pytest.mark.asyncio
+async def test_writes_are_coalesced_into_a_single_flush():
+    client = FakeRedis()
+    store = RedisMetadataStore(client=client)
+    store.set("browser", "b1", load=1)
+    store.set("browser", "b1", load=2, max_pages=5)
+    store.set("pool", "p1", max_browsers=3)
+    store.delete("session", "s1")
+    assert client.pipelines == []  # writes never reach redis before a flush
+
+    await store.flush()
+    await store.flush()
+    assert client.pipelines == [["hset", "sadd", "hset", "sadd", "delete", "srem"]]
+    assert client.hashes[key("browser", "b1")] == {"load": "2", "max_pages": "5"}
+    assert client.sets[key("browser")] == {"b1"}
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_requeued():
+    client = FakeRedis()
+    store = RedisMetadataStore(client=client)
+    store.set("browser", "b1", load=1, worker_id="w1")
+    store.set("browser", "b2", load=1)
+    store.delete("browser", "b3")
+    # a newer change, made while the failing flush is in flight
+    client.before_execute = lambda: store.set("browser", "b1", load=2)
+    client.fail_next = True
+    await store.flush()
+    assert client.hashes == {}
+
+    client.before_execute = None
+    await store.flush()
+    assert client.hashes[key("browser", "b1")] == {"load": "2", "worker_id": json.dumps("w1")}
+    assert client.hashes[key("browser", "b2")] == {"load": "1"}
+    assert client.pipelines[-1].count("delete") == 1
+    assert await RedisMetadataStore(client=client).list("browser") == {
+        "b1": {"load": 2, "worker_id": "w1"},
+        "b2": {"load": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_records_expire_by_their_ttl():
+    client = FakeRedis()
+    store = RedisMetadataStore(client=client)
+    store.set("browser", "b1", ttl=30, load=1)
+    store.set("browser", "b1", load=2)  # keeps the pending TTL
+    store.set("session", "s1", last_used=1)
+    await store.flush()
+    assert client.ttls == {key("browser", "b1"): 30}
+
+    store.set("browser", "b1", load=3)
+    await store.flush()
+    assert "expire" not in client.pipelines[-1]  # redis keeps the record's TTL
+
+    del client.hashes[key("browser", "b1")]  # expired
+    other_worker = RedisMetadataStore(client=client)
+    assert await other_worker.list("browser") == {}
+    assert client.sets[key("browser")] == set()  # expired records are dropped from the index
+
+
+@pytest.mark.asyncio
+async def test_list_and_summary_across_workers():
+    client = FakeRedis()
+    worker_a, worker_b = RedisMetadataStore(client=client), RedisMetadataStore(client=client)
+    worker_a.set("pool", "p1", max_browsers=2)
+    worker_a.set("browser", "b1", pool_id="p1", worker_id="a", max_pages=10, load=3)
+    worker_a.set("session", "s1", pool_id="p1")
+    worker_b.set("pool", "p2", max_browsers=1)
+    worker_b.set("browser", "b2", pool_id="p1", worker_id="b", max_pages=10, load=1)
+    worker_b.set("browser", "b3", pool_id="p2", worker_id="b", max_pages=5, load=5)
+    worker_b.set("browser", "b4", pool_id="p2", worker_id="b", max_pages=5, is_healthy=False)
+    await worker_a.flush()
+    await worker_b.flush()
+    worker_a.set("session", "s2", pool_id="p2")  # not flushed yet - listed by its own worker
+
+    assert set(await worker_a.list("session")) == {"s1", "s2"}
+    assert set(await worker_b.list("session")) == {"s1"}
+    assert await worker_b.summary() == dict(
+        pools=2, browsers=4, sessions=1, capacity=25, load=9, workers=["a", "b"]
+    )
+    assert await worker_a.summary(pool_id="p2") == dict(
+        pools=1, browsers=2, sessions=1, capacity=5, load=5, workers=["b"]
+    )
@@ -0,0 +1,115 @@
+import asyncio
+import socket
+import subprocess
+import pytest
+import pytest_asyncio
+
+from web_pilot.config import config as conf
+from web_pilot.clients.browser_pool import BrowserPool
+from web_pilot.exc import NoAvailableBrowserError
+
+
+def chromium_runs() -> bool:
+    try:
+        return (
+            subprocess.run([conf.chromium_path, "--version"], capture_output=True).returncode == 0
+        )
+    except OSError:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not chromium_runs(), reason="Chromium can't run here")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_chromium(port: int, user_data_dir: str) -> subprocess.Popen:
+    "A standalone Chromium, as a remote worker - ready once its debugging endpoint answers"
+    process = subprocess.Popen(
+        [
+            conf.chromium_path,
+            "--headless",
+            "--no-sandbox",
+            "--disable-gpu",
+            "--disable-dev-shm-usage",
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "about:blank",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return process
+        except OSError:
+            await asyncio.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Chromium didn't start")
+
+
+def stop_chromium(process: subprocess.Popen) -> None:
+    process.kill()
+    process.wait()
+
+
+@pytest_asyncio.fixture
+async def pool():
+    # no local browsers - sessions can only be placed on remote workers
+    pool = BrowserPool(
+        "remote-test", dict(min_browsers=0, max_browsers=0, min_warm_browsers=0, headless=True)
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_remote_browser_lifecycle(pool, tmp_path):
+    port = free_port()
+    chromium = await start_chromium(port, str(tmp_path / "profile"))
+    try:
+        browser = await pool.register_remote_browser(f"http://127.0.0.1:{port}", max_pages=2)
+        assert browser.is_remote and browser.is_healthy
+        assert pool.remote_browsers == [browser] and pool.local_browsers == []
+        with pytest.raises(ValueError):
+            await pool.register_remote_browser(f"http://127.0.0.1:{port}")
+
+        # placement
+        assert pool.get_least_busy_browser(create_if_none=True) is browser
+        session_id = await browser.start_page_session(session_id_prefix="remote-test")
+        assert session_id.startswith("remote-test") and browser.page_count == 1
+        assert pool.remote_capacity == 2
+
+        # health-check
+        await pool.check_remote_browsers()
+        assert browser.is_healthy and browser.latency > 0
+
+        # disconnect - the worker's sessions are gone, and it's no longer placed on
+        stop_chromium(chromium)
+        for _ in range(50):
+            if not browser.is_healthy:
+                break
+            await asyncio.sleep(0.1)
+        assert not browser.is_healthy
+        assert browser.page_count == 0
+        with pytest.raises(NoAvailableBrowserError):
+            pool.get_least_busy_browser(create_if_none=True)
+        await pool.check_remote_browsers()
+        assert not browser.is_healthy
+
+        # the worker is back - the health-check reconnects it
+        chromium = await start_chromium(port, str(tmp_path / "restarted-profile"))
+        await pool.check_remote_browsers()
+        assert browser.is_healthy and browser.reconnects == 1
+        assert pool.get_least_busy_browser(create_if_none=True) is browser
+
+        assert await pool.remove_browser_by_id(browser.id_)
+        assert pool.remote_browsers == []
+    finally:
+        stop_chromium(chromium)
@@ -0,0 +1,148 @@
+import os
+import threading
+import httpx
+import pytest
+import pytest_asyncio
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from web_pilot.utils.response_cache import ResponseCache
+
+
+ASSETS = {
+    "/app.js": (b"console.log('app');" * 32, {"Cache-Control": "max-age=3600"}),
+    "/style.css": (b"body { color: red; }" * 10, {"Cache-Control": "no-cache", "ETag": '"v1"'}),
+    "/logo.png": (b"\x89PNG" * 150, {"Cache-Control": "max-age=3600"}),
+    "/font.woff2": (b"wOF2" * 150, {"Cache-Control": "max-age=3600"}),
+    "/i18n.js": (b"var lang;", {"Cache-Control": "max-age=3600", "Vary": "Accept-Language"}),
+    "/session.js": (b"var user;", {"Cache-Control": "max-age=3600", "Set-Cookie": "id=1"}),
+}
+
+
+class AssetsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body, headers = ASSETS[self.path]
+        self.server.requests.append((self.path, dict(self.headers)))
+        etag = headers.get("ETag")
+        status = 304 if etag and self.headers.get("If-None-Match") == etag else 200
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body) if status == 200 else 0))
+        self.end_headers()
+        if status == 200:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def assets_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AssetsHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def response_cache(tmp_path):
+    cache = ResponseCache(
+        disk_dir=str(tmp_path / "cache"),
+        max_memory_bytes=1024,
+        max_disk_bytes=1024,
+        max_entry_bytes=1024,
+    )
+    yield cache
+    await cache.close()
+
+
+async def fetch(server, path: str, request_headers: dict = {}) -> tuple[str, httpx.Response]:
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    async with httpx.AsyncClient() as client:
+        return url, await client.get(url, headers=request_headers)
+
+
+async def cache_asset(
+    cache: ResponseCache, server, path: str, request_headers: dict = {}
+) -> tuple[str, bool]:
+    url, response = await fetch(server, path, request_headers)
+    stored = await cache.put(
+        url, response.status_code, dict(response.headers), response.content, request_headers
+    )
+    return url, stored
+
+
+@pytest.mark.asyncio
+async def test_fresh_response_is_served_from_cache(response_cache, assets_server):
+    url, stored = await cache_asset(response_cache, assets_server, "/app.js")
+    assert stored
+
+    cached = await response_cache.get(url)
+    assert cached.status == 200
+    assert cached.body == ASSETS["/app.js"][0]
+    assert len(assets_server.requests) == 1  # served without reaching the server
+    assert response_cache.__repr__()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_response_is_revalidated(response_cache, assets_server):
+    url, stored = await cache_asset(response_cache, assets_server, "/style.css")
+    assert stored
+
+    cached = await response_cache.get(url)
+    assert cached.body == ASSETS["/style.css"][0]
+    path, headers = assets_server.requests[-1]
+    assert path == "/style.css" and headers["If-None-Match"] == '"v1"'  # answered with a 304
+    assert response_cache.__repr__()["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_responses_spill_over_to_disk(response_cache, assets_server):
+    js_url, _ = await cache_asset(response_cache, assets_server, "/app.js")
+    png_url, _ = await cache_asset(response_cache, assets_server, "/logo.png")
+    font_url, _ = await cache_asset(response_cache, assets_server, "/font.woff2")
+
+    stats = response_cache.__repr__()
+    assert stats["memory_bytes"] <= 1024 and stats["disk_bytes"] <= 1024
+    assert stats["memory_entries"] == 1 and stats["disk_entries"] == 1
+    assert await response_cache.get(js_url) is None  # evicted from disk as well
+    cached = await response_cache.get(png_url)  # read back from disk
+    assert cached.body == ASSETS["/logo.png"][0]
+    assert len(os.listdir(response_cache.disk_dir)) == 1
+
+
+@pytest.mark.asyncio
+async def test_responses_are_only_shared_without_credentials(response_cache, assets_server):
+    _, stored = await cache_asset(response_cache, assets_server, "/session.js")
+    assert not stored  # sets a cookie
+
+    url, stored = await cache_asset(response_cache, assets_server, "/app.js", {"Cookie": "id=1"})
+    assert not stored
+    url, stored = await cache_asset(response_cache, assets_server, "/app.js")
+    assert stored
+    assert await response_cache.get(url, {"Cookie": "id=1"}) is None
+
+
+@pytest.mark.asyncio
+async def test_responses_are_matched_by_their_vary_headers(response_cache, assets_server):
+    url, stored = await cache_asset(
+        response_cache, assets_server, "/i18n.js", {"Accept-Language": "en"}
+    )
+    assert stored
+
+    assert await response_cache.get(url, {"Accept-Language": "fr"}) is None
+    assert await response_cache.get(url, {"accept-language": "en"}) is not None
+
+
+def test_disk_directory_is_wiped_on_creation(tmp_path):
+    disk_dir = tmp_path / "cache"
+    disk_dir.mkdir()
+    (disk_dir / "left-over").write_bytes(b"unindexed")
+
+    ResponseCache(
+        disk_dir=str(disk_dir), max_memory_bytes=1024, max_disk_bytes=1024, max_entry_bytes=1024
+    )
+    assert not disk_dir.exists()
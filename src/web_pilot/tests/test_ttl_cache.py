@@ -0,0 +1,20 @@
+import pytest
+
+from web_pilot.exc import CacheCapacityReachedError
+from web_pilot.utils.ttl_cache import TTLCache
+
+
+def test_full_cache_refuses_new_items():
+    cache = TTLCache(max_items=2, ttl=None)
+    cache.set_item("a", 1)
+    cache.set_item("b", 2)
+
+    with pytest.raises(CacheCapacityReachedError):
+        cache.set_item("c", 3)
+    assert len(cache) == 2
+    assert cache.get_item("a") == 1 and cache.get_item("b") == 2
+
+    cache.set_item("a", 10)  # replacing an item doesn't need room
+    cache.delete_item("b")
+    cache.set_item("c", 3)
+    assert cache.get_item("a") == 10 and cache.get_item("c") == 3
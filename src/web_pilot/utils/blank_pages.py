@@ -0,0 +1,103 @@
+import asyncio
+import math
+import pyppeteer.page
+
+from collections import deque
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+
+
+class BlankPagePool:
+    """
+    Pre-opened `about:blank` pages, refilled in the background.
+    The pool size follows the recent page-acquisition rate, bounded by the configured min/max sizes.
+    """
+
+    _pages: deque[pyppeteer.page.Page]
+    _acquisitions: deque[float]
+    _refill_task: Optional[asyncio.Task]
+
+    def __init__(
+        self,
+        page_factory: Callable[[], Awaitable[pyppeteer.page.Page]],
+        page_disposer: Optional[Callable[[pyppeteer.page.Page], Awaitable[None]]] = None,
+        min_size: int = conf.browser_min_blank_pages,
+        max_size: int = conf.browser_max_blank_pages,
+    ) -> None:
+        self._page_factory = page_factory
+        self._page_disposer = page_disposer or (lambda page: page.close())
+        self._pages = deque()
+        self._acquisitions = deque()
+        self._refill_task = None
+        self._closed = False
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    @property
+    def target_size(self) -> int:
+        "Number of pages expected to be requested within the refill horizon"
+        now = monotonic()
+        while self._acquisitions and now - self._acquisitions[0] > conf.blank_pages_rate_window:
+            self._acquisitions.popleft()
+        rate = len(self._acquisitions) / conf.blank_pages_rate_window
+        expected = math.ceil(rate * conf.blank_pages_refill_horizon)
+        return min(max(expected, self.min_size), self.max_size)
+
+    def seed(self, pages: list[pyppeteer.page.Page]) -> None:
+        "Adopt already opened blank pages (e.g. the tab Chromium opens on launch)"
+        for page in pages[: max(self.max_size - len(self._pages), 0)]:
+            self._pages.append(page)
+
+    async def acquire(self) -> pyppeteer.page.Page:
+        "Take a ready page from the pool, or open a new one if the pool has run dry"
+        self._acquisitions.append(monotonic())
+        page = None
+        while self._pages and page is None:
+            candidate = self._pages.popleft()
+            if not candidate.isClosed():
+                page = candidate
+
+        if page is None:
+            page = await self._page_factory()
+        self.schedule_refill()
+        return page
+
+    def schedule_refill(self) -> None:
+        if self._closed:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.ensure_future(self._refill())
+
+    async def _refill(self) -> None:
+        try:
+            while not self._closed and len(self._pages) < self.target_size:
+                page = await self._page_factory()
+                if self._closed:
+                    await self._page_disposer(page)
+                    return
+                self._pages.append(page)
+
+            while len(self._pages) > self.target_size:
+                await self._page_disposer(self._pages.pop())
+
+        except Exception as e:
+            logger.warning(f"Failed to refill blank pages pool: {e}")
+
+    def discard(self) -> None:
+        "Forget all pre-opened pages without closing them (e.g. their browser is gone)"
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
+        self._pages.clear()
+
+    async def close(self) -> None:
+        "Close all pre-opened pages and stop refilling"
+        self._closed = True
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
+        pages, self._pages = list(self._pages), deque()
+        await asyncio.gather(*[self._page_disposer(page) for page in pages], return_exceptions=True)
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import re
+import cachetools
+
+from hashlib import sha1
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+
+
+_BLOCKLIST_NAME = re.compile(r"^[\w.-]+$")
+_TERMINAL = ""  # hostname labels are never empty - marks the end of a rule in the trie
+
+
+class HostnameTrie:
+    """
+    Suffix trie over hostname labels ("ads.example.com" is stored as com -> example -> ads).
+    A host matches if it equals any stored domain or is one of its subdomains,
+    in O(host length) regardless of how many domains are stored.
+    """
+
+    def __init__(self, domains: Iterable[str] = ()) -> None:
+        self._root: dict = {}
+        self._size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, domain: str) -> None:
+        labels = domain.strip().strip(".").lower().split(".")
+        if not all(labels):
+            return
+        node = self._root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        if _TERMINAL not in node:
+            node[_TERMINAL] = True
+            self._size += 1
+
+    def matches(self, host: str) -> bool:
+        node = self._root
+        for label in reversed(host.lower().split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+
+class RequestBlocklist:
+    "Compiled request-blocking rules - by resource type and by (sub)domain"
+
+    resource_types: frozenset[str]
+    domains: HostnameTrie
+
+    def __init__(self, resource_types: Iterable[str], domains: HostnameTrie) -> None:
+        self.resource_types = frozenset(resource_type.lower() for resource_type in resource_types)
+        self.domains = domains
+
+    def __repr__(self) -> dict:
+        return dict(resource_types=sorted(self.resource_types), domains=len(self.domains))
+
+    def is_blocked(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        if not len(self.domains):
+            return False
+        host = urlsplit(url).hostname
+        return bool(host) and self.domains.matches(host)
+
+
+def _parse_rule(line: str) -> Optional[str]:
+    "Domain of a blocklist line - plain domains, hosts-file entries & `||domain^` rules are supported"
+    line = line.split("#", 1)[0].strip()
+    if not line or line.startswith("!"):
+        return None
+    if line.startswith("||"):
+        return line[2:].split("^", 1)[0]
+    parts = line.split()
+    domain = parts[1] if len(parts) > 1 else parts[0]
+    return domain.removeprefix("*.")
+
+
+def _load_named_blocklist(name: str) -> list[str]:
+    if not _BLOCKLIST_NAME.match(name):
+        raise ValueError(f"Invalid blocklist name: '{name}'")
+
+    path = os.path.join(conf.blocklists_dir, f"{name}.txt")
+    if not os.path.isfile(path):
+        raise ValueError(f"Blocklist '{name}' does not exist")
+    with open(path, encoding="utf-8", errors="ignore") as file:
+        return [domain for line in file if (domain := _parse_rule(line))]
+
+
+def _compile_blocklist(
+    resource_types: list[str], domains: list[str], blocklists: list[str]
+) -> RequestBlocklist:
+    trie = HostnameTrie(domains)
+    for name in blocklists:
+        for domain in _load_named_blocklist(name):
+            trie.add(domain)
+    return RequestBlocklist(resource_types, trie)
+
+
+# compiled blocklists, by their rules' hash
+_compiled_blocklists = cachetools.LRUCache(maxsize=conf.blocklist_cache_size)
+
+
+async def get_blocklist(
+    resource_types: Optional[list[str]] = None,
+    domains: Optional[list[str]] = None,
+    blocklists: Optional[list[str]] = None,
+) -> RequestBlocklist:
+    """
+    Compile the rules into a blocklist - compiled once and shared by every session using the same rules.
+    Blocklist files are read & compiled in a worker thread.
+    """
+    resource_types, domains, blocklists = (
+        sorted(set(resource_types or [])),
+        sorted(set(domains or [])),
+        sorted(set(blocklists or [])),
+    )
+    key = sha1(repr((resource_types, domains, blocklists)).encode()).hexdigest()
+    blocklist = _compiled_blocklists.get(key)
+    if blocklist is None:
+        blocklist = await asyncio.to_thread(_compile_blocklist, resource_types, domains, blocklists)
+        _compiled_blocklists[key] = blocklist
+        logger.debug(f"Compiled request blocklist with {len(blocklist.domains)} domains")
+    return blocklist
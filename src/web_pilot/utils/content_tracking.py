@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+
+from web_pilot.config import config as conf
+
+
+# counts the document's DOM mutations, and keeps the most recent mutated nodes - injected into
+# every new document of a tracked page (and into the current one)
+MUTATION_OBSERVER_SCRIPT = (
+    """
+() => {
+    if (window.__webPilotDom) return;
+    const state = window.__webPilotDom = {
+        id: Math.random().toString(36).slice(2, 10),
+        mutations: 0,
+        changes: [],
+        dropped: 0,
+    };
+    new MutationObserver((records) => {
+        for (const record of records) state.changes.push([++state.mutations, record.target]);
+        const overflow = state.changes.length - %d;
+        if (overflow > 0) state.dropped = state.changes.splice(0, overflow).pop()[0];
+    }).observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+}
+"""
+    % conf.content_diff_max_changes
+)
+
+# the document's ID & mutation count, if tracked - cheap to call on every extraction
+DOCUMENT_STATE_SCRIPT = """
+() => {
+    const state = window.__webPilotDom;
+    return [state ? state.id : null, state ? state.mutations : null];
+}
+"""
+
+# the top-most subtrees that changed since the given mutation count - null if they're unknown
+CHANGED_SUBTREES_SCRIPT = """
+(documentId, since, maxSubtrees) => {
+    const state = window.__webPilotDom;
+    if (!state || state.id !== documentId || since < state.dropped) return null;
+    const changed = new Set();
+    for (const [count, node] of state.changes) {
+        const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+        if (count > since && element && element.isConnected) changed.add(element);
+    }
+    const roots = [...changed].filter((element) => {
+        for (let parent = element.parentElement; parent; parent = parent.parentElement) {
+            if (changed.has(parent)) return false;
+        }
+        return true;
+    });
+    if (roots.length > maxSubtrees) return null;
+
+    const path = (element) => {
+        const parts = [];
+        for (; element.parentElement; element = element.parentElement) {
+            const index = Array.prototype.indexOf.call(element.parentElement.children, element);
+            parts.unshift(`${element.localName}:nth-child(${index + 1})`);
+        }
+        return [element.localName, ...parts].join(" > ");
+    };
+    return roots.map((element) => ({path: path(element), html: element.outerHTML}));
+}
+"""
+
+
+async def content_hash(content: str) -> str:
+    "An ETag of the content - hashed off the event-loop when large"
+    if len(content) >= conf.response_offload_threshold:
+        digest = await asyncio.to_thread(lambda: hashlib.sha256(content.encode()).hexdigest())
+    else:
+        digest = hashlib.sha256(content.encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def parse_etags(header: str) -> list[str]:
+    "ETags of an `If-None-Match` header - weak ones compare as strong"
+    return [etag.strip().removeprefix("W/") for etag in header.split(",") if etag.strip()]
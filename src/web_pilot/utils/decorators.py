@@ -32,22 +32,23 @@ def log_elapsed_time(func):
 
 def repeat_every(interval: int):
     def wrapper(func):
+        # a failed run is logged - the next one still runs on schedule
         async def async_wrapper(*args, **kwargs):
-            try:
-                while True:
+            while True:
+                try:
                     await func(*args, **kwargs)
-                    await asyncio.sleep(interval)
-            except Exception as e:
-                logger.error(f"Error in exectuion of repeating function: {e}")
+                except Exception as e:
+                    logger.error(f"Error in exectuion of repeating function: {e}")
+                await asyncio.sleep(interval)
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            try:
-                while True:
+            while True:
+                try:
                     func(*args, **kwargs)
-                    time.sleep(interval)
-            except Exception as e:
-                logger.error(f"Error in exectuion of repeating function: {e}")
+                except Exception as e:
+                    logger.error(f"Error in exectuion of repeating function: {e}")
+                time.sleep(interval)
 
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
@@ -0,0 +1,122 @@
+import asyncio
+import gzip
+import json
+
+from typing import Any, Optional
+from fastapi import Request, Response
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+
+# optional - negotiated only when installed
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+def check_codecs() -> None:
+    "Log the optional codecs that aren't installed (the `fast-encoding` extra)"
+    if msgpack is None:
+        logger.warning("msgpack is not installed - responses are served as JSON only")
+    if zstandard is None:
+        logger.warning("zstandard is not installed - responses are compressed with gzip only")
+
+
+def _parse_qualities(header: Optional[str]) -> dict[str, float]:
+    "`Accept` / `Accept-Encoding` values by their q-values"
+    qualities = {}
+    for item in (header or "").split(","):
+        value, *params = [part.strip() for part in item.split(";")]
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[value.lower()] = quality
+    return qualities
+
+
+def negotiate(request: Request) -> tuple[str, Optional[str]]:
+    "The response's media type & content encoding, by the request's `Accept` headers"
+    accept = _parse_qualities(request.headers.get("accept"))
+    media_type = JSON_MEDIA_TYPE
+    if msgpack and max([accept.get(type_, 0) for type_ in MSGPACK_MEDIA_TYPES]) > max(
+        accept.get(JSON_MEDIA_TYPE, 0), accept.get("*/*", 0)
+    ):
+        media_type = next(type_ for type_ in MSGPACK_MEDIA_TYPES if accept.get(type_))
+
+    accept_encoding = _parse_qualities(request.headers.get("accept-encoding"))
+    supported = ["zstd", "gzip"] if zstandard else ["gzip"]
+    encodings = [
+        encoding
+        for encoding in supported
+        if accept_encoding.get(encoding, accept_encoding.get("*", 0)) > 0
+    ]
+    # the client's preference, then ours - zstd first
+    return media_type, max(
+        encodings,
+        key=lambda encoding: accept_encoding.get(encoding, accept_encoding.get("*", 0)),
+        default=None,
+    )
+
+
+def estimate_size(content: Any, limit: int) -> int:
+    "Rough serialized size - counting strings' lengths, up to `limit`"
+    size, pending = 0, [content]
+    while pending and size < limit:
+        item = pending.pop()
+        if isinstance(item, (str, bytes)):
+            size += len(item)
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+            size += len(item) * 8
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+            size += len(item) * 2
+        else:
+            size += 8
+    return size
+
+
+def encode_body(content: Any, media_type: str, encoding: Optional[str]) -> tuple[bytes, bool]:
+    "Serialize & compress - returns the body, and whether it was compressed"
+    if media_type == JSON_MEDIA_TYPE:
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+    else:
+        body = msgpack.packb(content, use_bin_type=True)
+
+    if not encoding or len(body) < conf.response_compression_min_size:
+        return body, False
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=conf.response_zstd_level).compress(body), True
+    return gzip.compress(body, compresslevel=conf.response_gzip_level), True
+
+
+async def encoded_response(request: Request, content: Any, status_code: int) -> Response:
+    """
+    A response of the content, encoded as the client prefers - JSON or MessagePack, gzip or zstd.
+    Large bodies are serialized & compressed in a worker thread, off the event-loop.
+    """
+    media_type, encoding = negotiate(request)
+    if estimate_size(content, conf.response_offload_threshold) >= conf.response_offload_threshold:
+        body, compressed = await asyncio.to_thread(encode_body, content, media_type, encoding)
+    else:
+        body, compressed = encode_body(content, media_type, encoding)
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if compressed:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,104 @@
+import asyncio
+import math
+
+from time import monotonic
+from typing import Awaitable, Callable
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+
+
+class ExpiryScheduler:
+    """
+    Process-wide expiry of page sessions - a hashed timer wheel of `expiry_wheel_slots` slots,
+    one per `expiry_check_interval` tick.
+    Scheduling & touching are O(1): a touch only moves the key's deadline forward, and keys are
+    re-bucketed lazily once their (outdated) slot comes up - as are deadlines beyond one rotation.
+    Expired keys' handlers are run in batches, with bounded concurrency.
+    """
+
+    _deadlines: dict[str, float] = {}
+    _handlers: dict[str, Callable[[], Awaitable[bool]]] = {}
+    _wheel: list[set[str]] = [set() for _ in range(conf.expiry_wheel_slots)]
+    _tick: int = 0  # last processed tick
+    _started: float = monotonic()
+    _metrics: dict[str, int] = {"expired_sessions": 0, "failed_expirations": 0, "leaked_tabs": 0}
+
+    @classmethod
+    def metrics(cls) -> dict[str, int]:
+        return dict(cls._metrics, scheduled=len(cls._deadlines))
+
+    @classmethod
+    def _tick_of(cls, deadline: float) -> int:
+        return math.ceil((deadline - cls._started) / conf.expiry_check_interval)
+
+    @classmethod
+    def _bucket(cls, key: str, deadline: float) -> None:
+        tick = max(cls._tick_of(deadline), cls._tick + 1)
+        cls._wheel[tick % len(cls._wheel)].add(key)
+
+    @classmethod
+    def schedule(cls, key: str, ttl: float, on_expire: Callable[[], Awaitable[bool]]) -> None:
+        "Expire the key `ttl` seconds from now - rescheduling (touching) it if already scheduled"
+        deadline = monotonic() + ttl
+        previous = cls._deadlines.get(key)
+        cls._deadlines[key] = deadline
+        cls._handlers[key] = on_expire
+        if previous is None or deadline < previous:
+            cls._bucket(key, deadline)
+
+    @classmethod
+    def cancel(cls, key: str) -> None:
+        # the key is dropped from its slot lazily
+        cls._deadlines.pop(key, None)
+        cls._handlers.pop(key, None)
+
+    @classmethod
+    def record_leaked_tab(cls) -> None:
+        cls._metrics["leaked_tabs"] += 1
+
+    @classmethod
+    def _advance(cls) -> list[str]:
+        "Move the wheel up to now - return the expired keys"
+        now = monotonic()
+        start, cls._tick = cls._tick, int((now - cls._started) / conf.expiry_check_interval)
+        expired = []
+        # after a stall longer than a rotation, a single rotation already covers every slot
+        for tick in range(start + 1, min(cls._tick, start + len(cls._wheel)) + 1):
+            slot = cls._wheel[tick % len(cls._wheel)]
+            cls._wheel[tick % len(cls._wheel)] = set()
+            for key in slot:
+                deadline = cls._deadlines.get(key)
+                if deadline is None:
+                    continue  # cancelled
+                if deadline <= now:
+                    expired.append(key)
+                else:
+                    cls._bucket(key, deadline)  # touched since, or beyond this rotation
+        return expired
+
+    @classmethod
+    async def _expire(cls, semaphore: asyncio.Semaphore, key: str, handler: Callable) -> None:
+        async with semaphore:
+            try:
+                if await asyncio.wait_for(handler(), timeout=conf.default_timeout):
+                    cls._metrics["expired_sessions"] += 1
+            except Exception as e:
+                cls._metrics["failed_expirations"] += 1
+                logger.bind(session_id=key).error(f"Failed to expire page session: {e}")
+
+    @classmethod
+    async def run_expirations(cls) -> None:
+        "Run the handlers of every expired key"
+        expired = [
+            (key, cls._handlers.pop(key))
+            for key in cls._advance()
+            if cls._deadlines.pop(key, None) is not None
+        ]
+        if not expired:
+            return
+
+        semaphore = asyncio.Semaphore(conf.expiry_max_concurrency)
+        for i in range(0, len(expired), conf.expiry_batch_size):
+            batch = expired[i : i + conf.expiry_batch_size]
+            await asyncio.gather(*[cls._expire(semaphore, key, handler) for key, handler in batch])
+        logger.debug(f"Expired {len(expired)} page sessions")
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import cachetools
+
+from typing import Optional
+from web_pilot.config import config as conf
+from web_pilot.schemas.extraction import ExtractionField
+
+
+# shared by every compiled extractor
+_PREAMBLE = r"""
+const $one = (ctx, sel, xpath) => xpath
+    ? document.evaluate(sel, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : ctx.querySelector(sel);
+const $all = (ctx, sel, xpath) => {
+    if (!xpath) return Array.from(ctx.querySelectorAll(sel));
+    const result = document.evaluate(sel, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: result.snapshotLength}, (_, i) => result.snapshotItem(i));
+};
+const $text = (el) => (el.textContent || "").replace(/\s+/g, " ").trim();
+const $number = (value) => {
+    if (value === null || value === undefined) return null;
+    const number = parseFloat(String(value).replace(/[^0-9.eE+-]/g, ""));
+    return Number.isNaN(number) ? null : number;
+};
+const $boolean = (value) => value !== null && value !== undefined && value !== "" && value !== "false";
+const $totals = {};
+"""
+
+# compiled extractors, by their schema's hash
+_scripts = cachetools.LRUCache(maxsize=conf.extract_script_cache_size)
+
+
+def _value(field: ExtractionField, path: Optional[str]) -> str:
+    "JS expression of the field's value, of the element `el`"
+    if field.fields:
+        return (
+            "({"
+            + ", ".join(
+                f"{json.dumps(name)}: {_compile(child, _child_path(path, name, field))}"
+                for name, child in field.fields.items()
+            )
+            + "})"
+        )
+
+    if field.attribute:
+        value = f"el.getAttribute({json.dumps(field.attribute)})"
+    elif field.property:
+        value = f"el[{json.dumps(field.property)}]"
+    else:
+        value = "$text(el)"
+    if field.type != "string":
+        value = f"${field.type}({value})"
+    return f"({value} ?? {json.dumps(field.default)})"
+
+
+def _child_path(path: Optional[str], name: str, parent: ExtractionField) -> Optional[str]:
+    # totals are only reported for lists at a fixed path - not under another list
+    if path is None or parent.multiple:
+        return None
+    return f"{path}.{name}" if path else name
+
+
+def _compile(field: ExtractionField, path: Optional[str], ctx: str = "el") -> str:
+    "JS expression of the field - relative to its parent's element, `ctx`"
+    selector = json.dumps(field.xpath or field.selector)
+    is_xpath = "true" if field.xpath else "false"
+    if field.multiple:
+        end = f"{field.offset + field.limit}" if field.limit else "undefined"
+        total = f"$totals[{json.dumps(path)}] = els.length; " if path else ""
+        return (
+            f"((els) => {{ {total}return els.slice({field.offset}, {end})"
+            f".map((el) => {_value(field, path)}); }})($all({ctx}, {selector}, {is_xpath}))"
+        )
+
+    element = f"$one({ctx}, {selector}, {is_xpath})" if field.selector or field.xpath else ctx
+    return f"((el) => el ? {_value(field, path)} : {json.dumps(field.default)})({element})"
+
+
+def compile_extractor(schema: dict) -> str:
+    """
+    Compile an extraction schema (field name -> field) into a single in-page function, returning
+    the extracted data & the total number of elements of each paginated list.
+    Compiled functions are cached by the schema's hash.
+    """
+    key = hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+    script = _scripts.get(key)
+    if script is None:
+        root = ExtractionField(fields=schema)
+        script = (
+            f"() => {{ {_PREAMBLE}\n"
+            f"const data = {_compile(root, path='', ctx='document')};\n"
+            "return {data, totals: $totals}; }"
+        )
+        _scripts[key] = script
+    return script
@@ -0,0 +1,57 @@
+from typing import Optional
+from web_pilot.schemas.constants.launch_preset import LaunchPreset
+
+
+# Chromium services a headless automation browser never needs
+_LEAN_BASE_ARGS = [
+    "--no-first-run",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-breakpad",
+    "--disable-client-side-phishing-detection",
+    "--disable-hang-monitor",
+    "--disable-prompt-on-repost",
+    "--metrics-recording-only",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--mute-audio",
+]
+
+LAUNCH_PRESETS: dict[LaunchPreset, list[str]] = {
+    LaunchPreset.LEAN_SCRAPE: [
+        *_LEAN_BASE_ARGS,
+        "--blink-settings=imagesEnabled=false",
+        "--hide-scrollbars",
+        "--renderer-process-limit=4",
+        "--js-flags=--max-old-space-size=512",
+    ],
+    LaunchPreset.FULL_RENDER: [
+        *_LEAN_BASE_ARGS,
+        "--disable-background-timer-throttling",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-renderer-backgrounding",
+        "--force-color-profile=srgb",
+        "--hide-scrollbars",
+    ],
+    LaunchPreset.LOW_MEMORY: [
+        *_LEAN_BASE_ARGS,
+        "--blink-settings=imagesEnabled=false",
+        "--renderer-process-limit=2",
+        "--process-per-site",
+        "--disable-site-isolation-trials",
+        "--js-flags=--max-old-space-size=256",
+        "--disk-cache-size=1",
+        "--media-cache-size=1",
+        "--aggressive-cache-discard",
+    ],
+}
+
+
+def get_launch_args(preset: Optional[LaunchPreset]) -> list[str]:
+    "Chromium switches of a launch preset"
+    if preset is None:
+        return []
+    return list(LAUNCH_PRESETS[preset])
@@ -0,0 +1,227 @@
+import json
+import cachetools
+
+from abc import ABC, abstractmethod
+from time import time
+from typing import Optional
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+from web_pilot.schemas.constants.cache import CacheProvider
+
+
+class MetadataStore(ABC):
+    """
+    Metadata of pools, browsers & page sessions (ownership, capacity, last-used time, TTL,
+    websocket endpoints) - records are flat dicts of JSON-serializable fields, grouped by kind.
+    Writes never block the caller; reads go through a short-lived local cache.
+    """
+
+    def __init__(self) -> None:
+        self._local = cachetools.TTLCache(
+            maxsize=conf.metadata_local_cache_size, ttl=conf.metadata_local_ttl
+        )
+
+    @abstractmethod
+    def set(self, kind: str, id_: str, ttl: Optional[float] = None, **fields) -> None:
+        "Create or update (merge) a record, optionally expiring `ttl` seconds from now"
+
+    @abstractmethod
+    def delete(self, kind: str, id_: str) -> None:
+        "Remove a record"
+
+    async def get(self, kind: str, id_: str) -> Optional[dict]:
+        return (await self.get_many(kind, [id_])).get(id_)
+
+    @abstractmethod
+    async def get_many(self, kind: str, ids: list[str]) -> dict[str, dict]:
+        "Records of a kind, by ID - the missing (or expired) ones are left out"
+
+    @abstractmethod
+    async def list(self, kind: str) -> dict[str, dict]:
+        "All (unexpired) records of a kind, by ID"
+
+    async def flush(self) -> None:
+        "Write pending changes to the backing store"
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def summary(self, pool_id: Optional[str] = None) -> dict:
+        "Capacity & sessions across every process sharing the store - of all pools, or of one"
+        pools, browsers, sessions = [
+            {
+                id_: record
+                for id_, record in (await self.list(kind)).items()
+                if pool_id is None or record.get("pool_id", id_) == pool_id
+            }
+            for kind in ("pool", "browser", "session")
+        ]
+        healthy = [browser for browser in browsers.values() if browser.get("is_healthy", True)]
+        return dict(
+            pools=len(pools),
+            browsers=len(browsers),
+            sessions=len(sessions),
+            capacity=sum([browser.get("max_pages", 0) for browser in healthy]),
+            load=sum([browser.get("load", 0) for browser in healthy]),
+            workers=sorted({record.get("worker_id") for record in browsers.values()}, key=str),
+        )
+
+
+class InMemoryMetadataStore(MetadataStore):
+    "Process-local store - a single process' view"
+
+    _records: dict[tuple[str, str], tuple[dict, Optional[float]]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._records = {}
+
+    def _get_record(self, key: tuple[str, str]) -> Optional[dict]:
+        record = self._records.get(key)
+        if record is None:
+            return None
+        fields, expires_at = record
+        if expires_at is not None and expires_at <= time():
+            del self._records[key]
+            return None
+        return fields
+
+    def set(self, kind: str, id_: str, ttl: Optional[float] = None, **fields) -> None:
+        key = (kind, id_)
+        current = self._get_record(key) or {}
+        expires_at = time() + ttl if ttl else self._records.get(key, (None, None))[1]
+        self._records[key] = ({**current, **fields}, expires_at)
+
+    def delete(self, kind: str, id_: str) -> None:
+        self._records.pop((kind, id_), None)
+
+    async def get_many(self, kind: str, ids: list[str]) -> dict[str, dict]:
+        records = {id_: self._get_record((kind, id_)) for id_ in ids}
+        return {id_: dict(fields) for id_, fields in records.items() if fields is not None}
+
+    async def list(self, kind: str) -> dict[str, dict]:
+        ids = [id_ for record_kind, id_ in list(self._records) if record_kind == kind]
+        return await self.get_many(kind, ids)
+
+
+class RedisMetadataStore(MetadataStore):
+    """
+    Redis-backed store, shared by multiple WebPilot processes.
+    Every record is a hash (`<prefix>:<kind>:<id>`, JSON-encoded fields) indexed by a set per kind.
+    Writes are coalesced per record in memory and flushed periodically in a single pipeline;
+    reads are served from the local cache, and misses are fetched together in one pipeline.
+    """
+
+    _pending: dict[tuple[str, str], Optional[tuple[dict, Optional[float]]]]
+
+    def __init__(self, client=None) -> None:
+        super().__init__()
+        if client is None:
+            import redis.asyncio
+
+            client = redis.asyncio.Redis.from_url(conf.redis_url, decode_responses=True)
+        self._client = client
+        self._pending = {}  # record -> (fields, ttl) to merge, or None to delete
+
+    def _key(self, kind: str, id_: str = None) -> str:
+        return f"{conf.metadata_key_prefix}:{kind}" + (f":{id_}" if id_ else "")
+
+    def set(self, kind: str, id_: str, ttl: Optional[float] = None, **fields) -> None:
+        key = (kind, id_)
+        pending_fields, pending_ttl = self._pending.get(key) or ({}, None)
+        self._pending[key] = ({**pending_fields, **fields}, ttl or pending_ttl)
+        if key in self._local:
+            self._local[key] = {**self._local[key], **fields}
+
+    def delete(self, kind: str, id_: str) -> None:
+        self._pending[(kind, id_)] = None
+        self._local.pop((kind, id_), None)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        pipeline = self._client.pipeline(transaction=False)
+        for (kind, id_), change in pending.items():
+            if change is None:
+                pipeline.delete(self._key(kind, id_))
+                pipeline.srem(self._key(kind), id_)
+                continue
+
+            fields, ttl = change
+            pipeline.hset(
+                self._key(kind, id_),
+                mapping={name: json.dumps(value) for name, value in fields.items()},
+            )
+            pipeline.sadd(self._key(kind), id_)
+            if ttl:
+                pipeline.expire(self._key(kind, id_), int(ttl))
+
+        try:
+            await pipeline.execute()
+        except Exception as e:
+            logger.error(f"Failed to flush metadata to redis: {e}")
+            # keep the changes for the next flush - newer changes are merged over them
+            for key, change in pending.items():
+                newer = self._pending.get(key, False)
+                if newer is False:
+                    self._pending[key] = change
+                elif newer is not None and change is not None:
+                    self._pending[key] = ({**change[0], **newer[0]}, newer[1] or change[1])
+
+    async def get_many(self, kind: str, ids: list[str]) -> dict[str, dict]:
+        records, missing = {}, []
+        for id_ in ids:
+            if (kind, id_) in self._local:
+                records[id_] = dict(self._local[(kind, id_)])
+            elif self._pending.get((kind, id_), False) is not None:
+                missing.append(id_)
+
+        if missing:
+            pipeline = self._client.pipeline(transaction=False)
+            for id_ in missing:
+                pipeline.hgetall(self._key(kind, id_))
+            expired = []
+            for id_, raw in zip(missing, await pipeline.execute()):
+                fields = {name: json.loads(value) for name, value in raw.items()}
+                if pending := self._pending.get((kind, id_)):
+                    fields.update(pending[0])  # not flushed yet
+                if not fields:
+                    expired.append(id_)
+                    continue
+                self._local[(kind, id_)] = fields
+                records[id_] = dict(fields)
+            if expired:
+                await self._client.srem(self._key(kind), *expired)
+        return records
+
+    async def list(self, kind: str) -> dict[str, dict]:
+        if (kind, None) not in self._local:
+            self._local[(kind, None)] = await self._client.smembers(self._key(kind))
+        ids = {
+            *self._local[(kind, None)],
+            *[
+                id_
+                for (pending_kind, id_), change in self._pending.items()
+                if pending_kind == kind and change is not None
+            ],
+        }
+        return await self.get_many(kind, list(ids))
+
+    async def close(self) -> None:
+        await self.flush()
+        await self._client.aclose()
+
+
+def get_metadata_store() -> MetadataStore:
+    match conf.cache_provider:
+        case CacheProvider.IN_MEMORY:
+            return InMemoryMetadataStore()
+        case CacheProvider.REDIS:
+            return RedisMetadataStore()
+        case _:
+            raise ValueError("Unsupported cache provider")
+
+
+metadata_store = get_metadata_store()
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import pyppeteer
+
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+
+
+# Chromium's profile-lock files - never copied from the template
+_LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+
+class ProfileManager:
+    """
+    Ephemeral per-browser profile directories, cloned from a pre-initialized template profile
+    (`user_data_dir`) into a RAM-backed location, and removed once the browser is closed.
+    """
+
+    @staticmethod
+    def profiles_root() -> str:
+        "The configured profiles root, or the temp-dir if its parent doesn't exist (e.g. no /dev/shm)"
+        root = conf.profiles_root_dir
+        if os.path.isdir(os.path.dirname(os.path.abspath(root))):
+            return root
+        return os.path.join(tempfile.gettempdir(), os.path.basename(root))
+
+    @staticmethod
+    async def prepare_template() -> None:
+        "Build the template profile once, so first-run state, preferences & caches are ready to clone"
+        template = conf.user_data_dir
+        if os.path.isdir(template) and os.listdir(template):
+            logger.debug("Template profile is ready")
+            return
+
+        try:
+            logger.info("Building template profile...")
+            browser = await pyppeteer.launch(
+                headless=True,
+                autoClose=False,
+                userDataDir=template,
+                executablePath=conf.chromium_path,
+                args=["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"],
+            )
+            page = await browser.newPage()
+            await page.goto("about:blank")
+            await browser.close()
+            logger.info("Template profile built successfully")
+
+        except Exception as e:
+            logger.error(f"Failed to build template profile: {e}")
+
+    @classmethod
+    def _clone_template(cls, profile_dir: str) -> None:
+        if os.path.isdir(conf.user_data_dir):
+            shutil.copytree(
+                conf.user_data_dir,
+                profile_dir,
+                symlinks=True,
+                ignore=shutil.ignore_patterns(*_LOCK_FILES),
+                dirs_exist_ok=True,
+            )
+        else:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @classmethod
+    async def create_profile(cls, browser_id: str) -> str:
+        "Clone the template profile into a new directory for the browser, return its path"
+        profile_dir = os.path.join(cls.profiles_root(), f"{os.getpid()}-{browser_id}")
+        await asyncio.to_thread(cls._clone_template, profile_dir)
+        return profile_dir
+
+    @staticmethod
+    async def remove_profile(profile_dir: str) -> None:
+        await asyncio.to_thread(shutil.rmtree, profile_dir, ignore_errors=True)
+
+    @staticmethod
+    def is_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # owned by another user
+        return True
+
+    @classmethod
+    def _orphaned_profiles(cls) -> list[str]:
+        "Profile directories of processes that are gone - e.g. crashed, or killed before closing their browsers"
+        root = cls.profiles_root()
+        if not os.path.isdir(root):
+            return []
+        orphaned = []
+        for name in os.listdir(root):
+            pid, _, _ = name.partition("-")
+            if pid.isdigit() and int(pid) != os.getpid() and not cls.is_running(int(pid)):
+                orphaned.append(os.path.join(root, name))
+        return orphaned
+
+    @classmethod
+    async def sweep_orphaned_profiles(cls) -> None:
+        "Remove the profiles left behind by dead processes - they're RAM-backed"
+        orphaned = await asyncio.to_thread(cls._orphaned_profiles)
+        for profile_dir in orphaned:
+            await cls.remove_profile(profile_dir)
+        if orphaned:
+            logger.info(f"Removed {len(orphaned)} orphaned browser profiles")
@@ -0,0 +1,102 @@
+import asyncio
+import psutil
+
+from collections import deque
+from time import time
+from typing import NamedTuple, Optional
+from web_pilot.config import config as conf
+from web_pilot.logger import logger
+
+
+class ResourceSample(NamedTuple):
+    timestamp: float
+    cpu_usage: float  # share of the host's total CPU (0-1)
+    memory_usage: float  # RSS in MB
+
+
+class ResourceSampler:
+    """
+    Samples CPU & RSS of registered browsers' whole process-trees (browser + renderers, GPU etc.)
+    in a worker thread, keeping a ring-buffer of recent samples per browser.
+    Readers only ever get cached values - nothing is measured inline.
+    """
+
+    _roots: dict[str, int] = {}
+    _processes: dict[str, dict[int, psutil.Process]] = {}
+    _samples: dict[str, deque[ResourceSample]] = {}
+
+    @classmethod
+    def register(cls, browser_id: str, pid: int) -> None:
+        cls._roots[browser_id] = pid
+        cls._processes[browser_id] = {}
+        cls._samples[browser_id] = deque(maxlen=conf.resource_samples_history)
+
+    @classmethod
+    def unregister(cls, browser_id: str) -> None:
+        cls._roots.pop(browser_id, None)
+        cls._processes.pop(browser_id, None)
+        cls._samples.pop(browser_id, None)
+
+    @classmethod
+    def latest(cls, browser_id: str) -> ResourceSample:
+        "Most recent sample of the browser, zeros if it hasn't been sampled yet"
+        samples = cls._samples.get(browser_id)
+        if samples:
+            return samples[-1]
+        return ResourceSample(0, 0, 0)
+
+    @classmethod
+    def history(cls, browser_id: str) -> list[ResourceSample]:
+        return list(cls._samples.get(browser_id, []))
+
+    @classmethod
+    def _sample_tree(cls, browser_id: str, root_pid: int) -> Optional[ResourceSample]:
+        "Blocking - aggregate CPU & RSS over the browser's process tree"
+        known = cls._processes.get(browser_id, {})
+        try:
+            root = known.get(root_pid) or psutil.Process(root_pid)
+            tree = [root, *root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return None
+
+        current, cpu_percent, rss = {}, 0.0, 0
+        for process in tree:
+            # `cpu_percent` compares against the previous call on the same `Process` object
+            process = known.get(process.pid, process)
+            try:
+                with process.oneshot():
+                    cpu_percent += process.cpu_percent(interval=None)
+                    rss += process.memory_info().rss
+                current[process.pid] = process
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        if browser_id in cls._roots:
+            cls._processes[browser_id] = current
+        return ResourceSample(
+            timestamp=time(),
+            cpu_usage=cpu_percent / 100 / psutil.cpu_count(),
+            memory_usage=rss / (1024 * 1024),
+        )
+
+    @classmethod
+    async def sample_all(cls) -> None:
+        "Take a sample of every registered browser, off the event-loop"
+        roots = dict(cls._roots)
+        if not roots:
+            return
+
+        def _sample() -> dict[str, Optional[ResourceSample]]:
+            return {
+                browser_id: cls._sample_tree(browser_id, pid) for browser_id, pid in roots.items()
+            }
+
+        try:
+            samples = await asyncio.to_thread(_sample)
+        except Exception as e:
+            logger.error(f"Failed to sample browsers resource usage: {e}")
+            return
+
+        for browser_id, sample in samples.items():
+            if sample and browser_id in cls._samples:
+                cls._samples[browser_id].append(sample)
@@ -0,0 +1,373 @@
+import asyncio
+import os
+import pickle
+import shutil
+import httpx
+
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from hashlib import sha1
+from time import time
+from typing import NamedTuple, Optional
+from web_pilot.logger import logger
+from web_pilot.utils.profiles import ProfileManager
+
+
+# headers describing the original transfer - the cached body is stored decoded
+_HOP_BY_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+_CACHEABLE_STATUSES = {200, 203}
+# requests carrying credentials are neither served from, nor stored in, the shared cache
+_CREDENTIAL_HEADERS = ("cookie", "authorization")
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    expires_at: float
+    variant: dict[str, str]  # the request headers nominated by its `Vary`, it was stored for
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time() < self.expires_at
+
+    @property
+    def validators(self) -> dict[str, str]:
+        "Conditional request headers to revalidate the response with"
+        validators = {}
+        if etag := self.headers.get("etag"):
+            validators["If-None-Match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+
+def _cache_directives(headers: dict[str, str]) -> dict[str, Optional[str]]:
+    directives = {}
+    for directive in headers.get("cache-control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"') or None
+    return directives
+
+
+def has_credentials(request_headers: dict[str, str]) -> bool:
+    return any(key.lower() in _CREDENTIAL_HEADERS for key in request_headers)
+
+
+def request_variant(
+    response_headers: dict[str, str], request_headers: dict[str, str]
+) -> Optional[dict[str, str]]:
+    "Values of the request headers the response varies by - None if it varies by anything (`*`)"
+    names = {name.strip().lower() for name in response_headers.get("vary", "").split(",")}
+    names.discard("")
+    names.discard("accept-encoding")  # bodies are stored decoded
+    if "*" in names:
+        return None
+    request_headers = {key.lower(): value for key, value in request_headers.items()}
+    return {name: request_headers.get(name, "") for name in sorted(names)}
+
+
+def freshness_lifetime(headers: dict[str, str]) -> Optional[float]:
+    """
+    Seconds a response stays fresh in a shared cache (RFC 9111), 0 if it must be revalidated
+    before every use, or None if it must not be stored at all.
+    """
+    directives = _cache_directives(headers)
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "*" in [name.strip() for name in headers.get("vary", "").split(",")]:
+        return None
+    if "set-cookie" in headers:
+        return None
+
+    if "no-cache" in directives:
+        return 0
+    for directive in ("s-maxage", "max-age"):
+        if directive in directives:
+            try:
+                return max(float(directives[directive]), 0)
+            except (TypeError, ValueError):
+                return 0
+
+    try:
+        date = parsedate_to_datetime(headers["date"]).timestamp() if "date" in headers else time()
+        if "expires" in headers:
+            return max(parsedate_to_datetime(headers["expires"]).timestamp() - date, 0)
+        if "last-modified" in headers:
+            # heuristic freshness - 10% of the time since the last modification
+            return max((date - parsedate_to_datetime(headers["last-modified"]).timestamp()) / 10, 0)
+    except (TypeError, ValueError):
+        return 0
+    return 0
+
+
+class ResponseCache:
+    """
+    Shared HTTP cache of static assets for all pages of a pool.
+    Entries are kept in a size-bounded in-memory LRU; evicted entries spill over to a
+    size-bounded on-disk LRU. Stale entries with validators (ETag / Last-Modified) are revalidated
+    with a conditional request, through the pool's proxy, instead of being refetched in full.
+    Only responses to requests without credentials, that don't set cookies, are shared - and
+    only with requests matching their `Vary` headers.
+    The disk directory is owned by the cache - it's wiped on creation, as nothing indexes its
+    files from an earlier run.
+    """
+
+    _memory: OrderedDict[str, CachedResponse]
+    _disk: OrderedDict[str, int]
+
+    _client: Optional[httpx.AsyncClient]
+
+    def __init__(
+        self,
+        disk_dir: str,
+        max_memory_bytes: int,
+        max_disk_bytes: int,
+        max_entry_bytes: int,
+        proxy_server: Optional[str] = None,
+    ) -> None:
+        self.disk_dir = disk_dir
+        shutil.rmtree(disk_dir, ignore_errors=True)
+        # Chromium's `--proxy-server` may omit the scheme - it defaults to HTTP
+        if proxy_server and "://" not in proxy_server:
+            proxy_server = f"http://{proxy_server}"
+        self.proxy_server = proxy_server
+        self._client = None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()  # url -> size
+        self._disk_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "bytes_saved": 0}
+
+    def __repr__(self) -> dict:
+        return dict(
+            **self._stats,
+            memory_entries=len(self._memory),
+            memory_bytes=self._memory_bytes,
+            disk_entries=len(self._disk),
+            disk_bytes=self._disk_bytes,
+        )
+
+    def _disk_path(self, url: str) -> str:
+        return os.path.join(self.disk_dir, sha1(url.encode()).hexdigest())
+
+    def _write_to_disk(self, entries: list[CachedResponse]) -> None:
+        os.makedirs(self.disk_dir, exist_ok=True)
+        for entry in entries:
+            with open(self._disk_path(entry.url), "wb") as file:
+                pickle.dump(entry, file)
+
+    def _read_from_disk(self, url: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._disk_path(url), "rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError):
+            return None
+
+    def _remove_from_disk(self, url: str) -> None:
+        try:
+            os.remove(self._disk_path(url))
+        except OSError:
+            pass
+
+    def _discard(self, url: str) -> None:
+        if entry := self._memory.pop(url, None):
+            self._memory_bytes -= entry.size
+        if (size := self._disk.pop(url, None)) is not None:
+            self._disk_bytes -= size
+            self._remove_from_disk(url)
+
+    async def _store(self, entry: CachedResponse) -> None:
+        self._discard(entry.url)
+        self._memory[entry.url] = entry
+        self._memory_bytes += entry.size
+        spilled = []
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            if evicted.size <= self.max_disk_bytes:
+                spilled.append(evicted)
+        if not spilled:
+            return
+
+        await asyncio.to_thread(self._write_to_disk, spilled)
+        for evicted in spilled:
+            if evicted.url in self._memory:
+                continue  # stored again while being written
+            self._disk_bytes += evicted.size - self._disk.get(evicted.url, 0)
+            self._disk[evicted.url] = evicted.size
+        while self._disk_bytes > self.max_disk_bytes:
+            url, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._remove_from_disk(url)
+
+    async def _lookup(self, url: str) -> Optional[CachedResponse]:
+        if entry := self._memory.get(url):
+            self._memory.move_to_end(url)
+            return entry
+
+        if url in self._disk:
+            entry = await asyncio.to_thread(self._read_from_disk, url)
+            if entry is None:
+                self._discard(url)
+                return None
+            # promote back to memory
+            await self._store(entry)
+            return entry
+        return None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(proxy=self.proxy_server, timeout=10)
+        return self._client
+
+    async def _revalidate(
+        self, entry: CachedResponse, headers: dict[str, str]
+    ) -> Optional[CachedResponse]:
+        "Conditional GET of a stale entry, returns the refreshed (or replaced) entry"
+        try:
+            async with self._http_client().stream(
+                "GET", entry.url, headers={**headers, **entry.validators}
+            ) as response:
+                response_headers = {key.lower(): value for key, value in response.headers.items()}
+                status = response.status_code
+                body = b""
+                if status != 304:
+                    async for chunk in response.aiter_bytes():  # decoded, as stored
+                        body += chunk
+                        if len(body) > self.max_entry_bytes:
+                            return None
+        except Exception as e:
+            logger.debug(f"Failed to revalidate '{entry.url}': {e}")
+            return None
+
+        if status == 304:
+            response_headers = {**entry.headers, **self._stored_headers(response_headers)}
+            lifetime = freshness_lifetime(response_headers)
+            variant = request_variant(response_headers, headers)
+            if lifetime is None or variant is None:
+                return None
+            return entry._replace(
+                headers=response_headers, expires_at=time() + lifetime, variant=variant
+            )
+
+        lifetime = freshness_lifetime(response_headers)
+        variant = request_variant(response_headers, headers)
+        if lifetime is None or variant is None or status not in _CACHEABLE_STATUSES:
+            return None
+        return CachedResponse(
+            entry.url,
+            status,
+            self._stored_headers(response_headers),
+            body,
+            time() + lifetime,
+            variant,
+        )
+
+    @staticmethod
+    def _stored_headers(headers: dict[str, str]) -> dict[str, str]:
+        return {key: value for key, value in headers.items() if key not in _HOP_BY_HOP_HEADERS}
+
+    async def get(self, url: str, request_headers: dict[str, str] = {}) -> Optional[CachedResponse]:
+        "A fresh response for the URL - revalidating a stale one if possible - or None on a miss"
+        if has_credentials(request_headers):
+            self._stats["misses"] += 1
+            return None
+
+        entry = await self._lookup(url)
+        if entry and entry.variant != request_variant(entry.headers, request_headers):
+            entry = None  # stored for another variant - replaced once this one is
+        if entry and not entry.is_fresh:
+            stale, entry = entry, None
+            if stale.validators:
+                entry = await self._revalidate(stale, request_headers)
+            if entry:
+                await self._store(entry)
+                self._stats["revalidated"] += 1
+            else:
+                self._discard(url)
+
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        self._stats["bytes_saved"] += entry.size
+        return entry
+
+    async def put(
+        self,
+        url: str,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        request_headers: dict[str, str] = {},
+    ) -> bool:
+        "Store a response, if it's cacheable - and was requested without credentials"
+        headers = {key.lower(): value for key, value in headers.items()}
+        lifetime = freshness_lifetime(headers)
+        variant = request_variant(headers, request_headers)
+        if (
+            lifetime is None
+            or variant is None
+            or has_credentials(request_headers)
+            or status not in _CACHEABLE_STATUSES
+            or len(body) > self.max_entry_bytes
+            or (lifetime == 0 and not ("etag" in headers or "last-modified" in headers))
+        ):
+            return False
+
+        await self._store(
+            CachedResponse(
+                url, status, self._stored_headers(headers), body, time() + lifetime, variant
+            )
+        )
+        self._stats["stored"] += 1
+        return True
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _orphaned_dirs(root: str) -> list[str]:
+        "Cache directories (`<pid>-<pool ID>`) of processes that are gone"
+        if not os.path.isdir(root):
+            return []
+        orphaned = []
+        for name in os.listdir(root):
+            pid, _, _ = name.partition("-")
+            if (
+                pid.isdigit()
+                and int(pid) != os.getpid()
+                and not ProfileManager.is_running(int(pid))
+            ):
+                orphaned.append(os.path.join(root, name))
+        return orphaned
+
+    @classmethod
+    async def sweep_orphaned_dirs(cls, root: str) -> None:
+        "Remove the cache directories left behind by dead processes - nothing indexes them"
+        orphaned = await asyncio.to_thread(cls._orphaned_dirs, root)
+        for disk_dir in orphaned:
+            await asyncio.to_thread(shutil.rmtree, disk_dir, ignore_errors=True)
+        if orphaned:
+            logger.info(f"Removed {len(orphaned)} orphaned response cache directories")
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._memory_bytes = 0
+        self._disk.clear()
+        self._disk_bytes = 0
+        shutil.rmtree(self.disk_dir, ignore_errors=True)
+        logger.debug(f"Response cache at '{self.disk_dir}' has been cleared")
@@ -3,11 +3,17 @@ import pyppeteer
 import asyncio
 import nanoid
 import pyppeteer.page
+import pyppeteer.connection
 import json
+import base64
+import math
 
-from typing import Any
+from typing import Any, Optional
+from web_pilot.config import config as conf
 from web_pilot.exc import InvalidSessionIDError
-from web_pilot.schemas.pages import Snapshot, PageContent
+from web_pilot.schemas.pages import Snapshot, PageContent, BinaryContent
+from web_pilot.utils.extraction import compile_extractor
+from web_pilot.utils.wait_engine import readiness_conditions, wait_until
 
 
 # Utils
@@ -25,6 +31,21 @@ def generate_id(len_=6) -> str:
     return nanoid.generate("0123456789abcdefghijklmnopqrstuvwxyz", len_)
 
 
+def generate_browser_id() -> str:
+    "Browser IDs are prefixed by their worker's ID in multi-worker mode - so session IDs can be routed"
+    if conf.worker_id is None:
+        return generate_id()
+    return f"w{conf.worker_id}-{generate_id()}"
+
+
+def worker_id_of_browser(browser_id: str) -> Optional[int]:
+    "ID of the worker process owning the browser, if it was created in multi-worker mode"
+    prefix, _, _ = browser_id.partition("-")
+    if prefix.startswith("w") and prefix[1:].isdigit():
+        return int(prefix[1:])
+    return None
+
+
 # Page actions
 async def perform_action_click(page: pyppeteer.page.Page, **kwargs) -> None:
     selector = kwargs.pop("selector", None)
@@ -34,7 +55,7 @@ async def perform_action_click(page: pyppeteer.page.Page, **kwargs) -> None:
     wait_for_selector = kwargs.pop("waitForSelector", True)
     options = kwargs.pop("options", None)
     if wait_for_selector:
-        await page.waitForSelector(selector)
+        await wait_until(page, [{"selector": selector}])
     await page.click(selector, options)
 
 
@@ -48,9 +69,93 @@ async def perform_action_setUserAgent(page: pyppeteer.page.Page, **kwargs) -> No
     await page.setUserAgent(user_agent)
 
 
-async def perform_action_screenshot(page: pyppeteer.page.Page, **kwargs) -> None:
-    options = kwargs.pop("options", None)
-    await page.screenshot(options)
+_IMAGE_MEDIA_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+_PDF_OPTIONS = {
+    "landscape",
+    "displayHeaderFooter",
+    "printBackground",
+    "scale",
+    "paperWidth",
+    "paperHeight",
+    "marginTop",
+    "marginBottom",
+    "marginLeft",
+    "marginRight",
+    "pageRanges",
+    "headerTemplate",
+    "footerTemplate",
+    "preferCSSPageSize",
+}
+
+
+async def decode_base64(data: str) -> bytes:
+    "Decode off the event-loop - images & PDF chunks can be megabytes"
+    return await asyncio.to_thread(base64.b64decode, data)
+
+
+async def encode_base64(data: bytes) -> str:
+    return (await asyncio.to_thread(base64.b64encode, data)).decode()
+
+
+async def read_cdp_stream(client: pyppeteer.connection.CDPSession, handle: str):
+    "Read a CDP IO stream (e.g. a PDF printed as a stream) - chunk by chunk"
+    try:
+        while True:
+            chunk = await client.send(
+                "IO.read", {"handle": handle, "size": conf.binary_stream_chunk_size}
+            )
+            if chunk.get("data"):
+                if chunk.get("base64Encoded"):
+                    yield await decode_base64(chunk["data"])
+                else:
+                    yield chunk["data"].encode()
+            if chunk.get("eof"):
+                break
+    finally:
+        await client.send("IO.close", {"handle": handle})
+
+
+async def perform_action_screenshot(page: pyppeteer.page.Page, **kwargs) -> BinaryContent:
+    # options may be passed as pyppeteer's screenshot `options`, or inline
+    options = {**(kwargs.pop("options", None) or {}), **kwargs}
+    image_format = options.get("type", "png")
+    if image_format not in _IMAGE_MEDIA_TYPES:
+        raise ValueError(f"Unsupported screenshot type '{image_format}'")
+
+    params = {"format": image_format}
+    if image_format != "png" and options.get("quality") is not None:
+        params["quality"] = int(options["quality"])
+    clip = options.get("clip")
+    if options.get("fullPage"):
+        metrics = await page._client.send("Page.getLayoutMetrics")
+        size = metrics.get("cssContentSize") or metrics["contentSize"]
+        clip = dict(x=0, y=0, width=math.ceil(size["width"]), height=math.ceil(size["height"]))
+        params["captureBeyondViewport"] = True
+    if clip:
+        params["clip"] = {"scale": 1, **clip}
+
+    omit_background = options.get("omitBackground") and image_format != "jpeg"
+    if omit_background:
+        transparent = {"color": {"r": 0, "g": 0, "b": 0, "a": 0}}
+        await page._client.send("Emulation.setDefaultBackgroundColorOverride", transparent)
+    try:
+        result = await page._client.send("Page.captureScreenshot", params)
+    finally:
+        if omit_background:
+            await page._client.send("Emulation.setDefaultBackgroundColorOverride")
+    return BinaryContent(
+        media_type=_IMAGE_MEDIA_TYPES[image_format], content=await decode_base64(result["data"])
+    )
+
+
+async def perform_action_pdf(page: pyppeteer.page.Page, **kwargs) -> BinaryContent:
+    params = {key: value for key, value in kwargs.items() if key in _PDF_OPTIONS}
+    result = await page._client.send(
+        "Page.printToPDF", {**params, "transferMode": "ReturnAsStream"}
+    )
+    # drained within the action - under its timeout, & before the session's next action runs
+    chunks = [chunk async for chunk in read_cdp_stream(page._client, result["stream"])]
+    return BinaryContent(media_type="application/pdf", content=b"".join(chunks))
 
 
 async def perform_action_setExtraHttpHeaders(page: pyppeteer.page.Page, **kwargs) -> None:
@@ -60,27 +165,18 @@ async def perform_action_setExtraHttpHeaders(page: pyppeteer.page.Page, **kwargs
 
 
 async def perform_action_goto(page: pyppeteer.page.Page, **kwargs) -> None:
-    async def _wait_for_text(
-        page: pyppeteer.page.Page, text: str, timeout: int = 30000, interval: int = 500
-    ) -> bool:
-        elapsed = 0
-        while elapsed < timeout:
-            content = await page.content()
-            if text in content:
-                return True
-            await asyncio.sleep(interval / 1000)
-            elapsed += interval
-        raise asyncio.TimeoutError(f"Timeout: Could not find '{text}' in the page content.")
-
     url = kwargs.pop("url", None)
     if not url:
         raise ValueError("URL is required for 'goto' action")
 
     options = kwargs.pop("options", None)
     wait_for_text = kwargs.pop("waitForText", None)
+    # matched against the page's HTML by default, as it always was - `markup: false` is cheaper
+    markup = kwargs.pop("markup", True)
+    wait_timeout = kwargs.pop("waitTimeout", None)
     await page.goto(url, options, **kwargs)
     if wait_for_text:
-        await _wait_for_text(page, wait_for_text)
+        await wait_until(page, [{"text": wait_for_text, "markup": markup}], wait_timeout)
 
 
 async def perform_action_goBack(page: pyppeteer.page.Page, **kwargs) -> None:
@@ -117,9 +213,6 @@ async def perform_action_evaluate(page: pyppeteer.page.Page, **kwargs) -> Any:
     code = kwargs.pop("code")
     args = kwargs.pop("args", [])
     wait_for_navigation = kwargs.pop("waitForNavigation", False)
-    # Ensure the page is fully loaded before evaluating
-    await page.waitForSelector("body")
-    await page.waitForFunction("document.readyState === 'complete'")
 
     try:
         if wait_for_navigation:
@@ -139,6 +232,35 @@ async def perform_action_evaluate(page: pyppeteer.page.Page, **kwargs) -> Any:
         return evaluation_result
 
 
+async def perform_action_waitFor(page: pyppeteer.page.Page, **kwargs) -> None:
+    "Wait for conditions, or a named readiness strategy - see `wait_until`"
+    conditions = kwargs.pop("conditions", None)
+    if not conditions:
+        raise ValueError("Conditions are required for 'waitFor' action")
+
+    await wait_until(page, readiness_conditions(conditions), kwargs.pop("waitTimeout", None))
+
+
+async def perform_action_waitForSelector(page: pyppeteer.page.Page, **kwargs) -> None:
+    selector = kwargs.pop("selector", None)
+    if not selector:
+        raise ValueError("Selector is required for 'waitForSelector' action")
+
+    count = kwargs.pop("count", 1)
+    await wait_until(
+        page, [{"selector": selector, "count": count}], kwargs.pop("waitTimeout", None)
+    )
+
+
+async def perform_action_waitForText(page: pyppeteer.page.Page, **kwargs) -> None:
+    text = kwargs.pop("text", None)
+    if not text:
+        raise ValueError("Text is required for 'waitForText' action")
+
+    markup = kwargs.pop("markup", False)
+    await wait_until(page, [{"text": text, "markup": markup}], kwargs.pop("waitTimeout", None))
+
+
 async def perform_action_evaluateOnNewDocument(page: pyppeteer.page.Page, **kwargs) -> None:
     code = kwargs.pop("code")
     args = kwargs.pop("args", [])
@@ -180,6 +302,17 @@ async def perform_action_extractPageContents(page: pyppeteer.page.Page) -> PageC
     ).dict()
 
 
+async def perform_action_extract(page: pyppeteer.page.Page, **kwargs) -> dict:
+    "Extract the schema's fields in a single in-page evaluation - see `compile_extractor`"
+    schema = kwargs.pop("schema")
+    if not isinstance(schema, dict) or not schema:
+        raise ValueError("'schema' must be a non-empty object of fields")
+    result = await page.evaluate(compile_extractor(schema))
+    if not result["totals"]:
+        del result["totals"]
+    return result
+
+
 async def perform_action_setGeoLocation(page: pyppeteer.page.Page, **kwargs) -> None:
     latitude = kwargs.pop("latitude")
     longitude = kwargs.pop("longitude")
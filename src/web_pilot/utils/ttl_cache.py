@@ -1,20 +1,34 @@
 import pydantic as pyd
 import cachetools
-import asyncio
 
-from typing import Union
+from typing import Optional, Union
 from web_pilot.schemas.constants.cache import CacheProvider
 from web_pilot.config import config as conf
-from web_pilot.logger import logger
+from web_pilot.exc import CacheCapacityReachedError
 
 
-class TTLCache:
-    def __init__(self) -> None:
-        self._cache = self._init_cache(max_items=conf.browser_max_cached_items, ttl=conf.cache_ttl)
+class _BoundedCache(cachetools.Cache):
+    "A cache that refuses new items once full - instead of evicting one"
+
+    def popitem(self):
+        raise CacheCapacityReachedError(f"Cache is full [max items: {self.maxsize}]")
+
 
-    def _init_cache(self, max_items: int = None, ttl: int = None) -> Union[cachetools.TTLCache]:
+class TTLCache:
+    def __init__(
+        self, max_items: int = conf.browser_max_cached_items, ttl: Optional[float] = conf.cache_ttl
+    ) -> None:
+        self._cache = self._init_cache(max_items=max_items, ttl=ttl)
+
+    def _init_cache(
+        self, max_items: int = None, ttl: Optional[float] = None
+    ) -> Union[cachetools.TTLCache, cachetools.Cache]:
+        if ttl is None:
+            # expired externally - setting an item while full raises, nothing is evicted
+            return _BoundedCache(maxsize=max_items)
         match conf.cache_provider:
-            case CacheProvider.IN_MEMORY:
+            # live page objects always stay in-process - with redis, only their metadata is shared
+            case CacheProvider.IN_MEMORY | CacheProvider.REDIS:
                 return cachetools.TTLCache(maxsize=max_items, ttl=ttl)
             case _:
                 raise ValueError("Unsupported cache provider")
@@ -33,12 +47,3 @@ class TTLCache:
 
     def delete_item(self, key: str) -> None:
         self._cache.__delitem__(key)
-
-    async def periodic_cleanup(self):
-        while True:
-            await asyncio.sleep(conf.cache_cleanup_interval)
-            try:
-                self._cache.expire()
-                logger.debug("Cache periodic-cleanup completed successfully")
-            except Exception as e:
-                logger.error(f"Error in exectuion of cache periodic-cleanup: {e}")
@@ -0,0 +1,218 @@
+import asyncio
+import weakref
+import pyppeteer.page
+import pyppeteer.errors
+import pyppeteer.network_manager
+
+from time import monotonic
+from typing import Optional, Union
+from web_pilot.config import config as conf
+
+
+# resolves once the condition holds - checked right away, then as the DOM mutates (or the ready
+# state changes) instead of polling; `false` on timeout. Text is first looked for in the mutated
+# nodes only - full scans of the document run at most once per `scanIntervalMs`
+_WAIT_SCRIPT = """
+(condition, timeoutMs, scanIntervalMs) => new Promise((resolve) => {
+    const text = condition.text;
+    const markup = !!condition.markup;  // the serialized HTML, as `page.content()` - not just text
+    const documentText = () => {
+        if (!markup) return document.body ? document.body.textContent : "";
+        const doctype = document.doctype
+            ? new XMLSerializer().serializeToString(document.doctype)
+            : "";
+        return doctype + document.documentElement.outerHTML;
+    };
+    const holds = () => {
+        if (condition.readyState === "complete") return document.readyState === "complete";
+        if (condition.readyState) return document.readyState !== "loading";
+        if (text !== undefined) return documentText().includes(text);
+        if (condition.selector !== undefined) {
+            const count = document.querySelectorAll(condition.selector).length;
+            return condition.count === 0 ? count === 0 : count >= (condition.count || 1);
+        }
+        return false;
+    };
+    const mutatedNodesHold = (records) => {
+        for (const record of records) {
+            if (record.type === "attributes") {
+                const value = markup && record.target.getAttribute(record.attributeName);
+                if (value && value.includes(text)) return true;
+                continue;
+            }
+            const nodes = record.type === "childList" ? record.addedNodes : [record.target];
+            for (const node of nodes) {
+                const content = markup && node.nodeType === Node.ELEMENT_NODE
+                    ? node.outerHTML
+                    : node.textContent;
+                if (content && content.includes(text)) return true;
+            }
+        }
+        return false;
+    };
+    if (condition.domStable === undefined && holds()) return resolve(true);
+
+    let stableTimer = null;
+    let scanTimer = null;
+    let lastScan = performance.now();
+    const finish = (result) => {
+        observer.disconnect();
+        document.removeEventListener("readystatechange", scheduleScan);
+        clearTimeout(timeoutTimer);
+        clearTimeout(stableTimer);
+        clearTimeout(scanTimer);
+        resolve(result);
+    };
+    const restartStableTimer = () => {
+        clearTimeout(stableTimer);
+        stableTimer = setTimeout(() => finish(true), condition.domStable);
+    };
+    const scan = () => {
+        scanTimer = null;
+        lastScan = performance.now();
+        if (holds()) finish(true);
+    };
+    function scheduleScan() {
+        if (scanTimer !== null) return;
+        scanTimer = setTimeout(scan, Math.max(scanIntervalMs - (performance.now() - lastScan), 0));
+    }
+    const observer = new MutationObserver((records) => {
+        if (condition.domStable !== undefined) return restartStableTimer();
+        if (text !== undefined && mutatedNodesHold(records)) return finish(true);
+        scheduleScan();
+    });
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    document.addEventListener("readystatechange", scheduleScan);
+    const timeoutTimer = setTimeout(() => finish(false), timeoutMs);
+    if (condition.domStable !== undefined) restartStableTimer();
+});
+"""
+
+# readiness strategies - conditions awaited before an action
+_READINESS = {
+    "none": [],
+    "domcontentloaded": [{"readyState": "interactive"}],
+    "load": [{"readyState": "complete"}],
+    "networkIdle": [{"readyState": "complete"}, {"networkIdle": None}],
+    "domStable": [{"domStable": None}],
+}
+
+# network-activity trackers, by page
+_trackers: "weakref.WeakKeyDictionary[pyppeteer.page.Page, NetworkActivity]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class NetworkActivity:
+    "In-flight requests of a page - tracked from the page session's start"
+
+    _inflight: set[str]
+    _last_change: float
+    _changed: asyncio.Event
+
+    def __init__(self, page: pyppeteer.page.Page) -> None:
+        self._inflight = set()
+        self._last_change = monotonic()
+        self._changed = asyncio.Event()
+        page.on("request", self._on_request_started)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def _notify(self) -> None:
+        self._last_change = monotonic()
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _on_request_started(self, request: pyppeteer.network_manager.Request) -> None:
+        self._inflight.add(request._requestId)
+        self._notify()
+
+    def _on_request_done(self, request: pyppeteer.network_manager.Request) -> None:
+        self._inflight.discard(request._requestId)
+        self._notify()
+
+    async def wait_for_idle(self, idle_ms: int, max_inflight: int = 0) -> None:
+        "Wait until at most `max_inflight` requests were in flight for `idle_ms`"
+        while True:
+            changed = self._changed
+            if len(self._inflight) > max_inflight:
+                await changed.wait()
+                continue
+            remaining = idle_ms / 1000 - (monotonic() - self._last_change)
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+
+
+def network_activity(page: pyppeteer.page.Page) -> NetworkActivity:
+    "The page's network-activity tracker - created on first use"
+    tracker = _trackers.get(page)
+    if tracker is None:
+        tracker = _trackers[page] = NetworkActivity(page)
+    return tracker
+
+
+def readiness_conditions(readiness: Union[str, dict, list[dict], None]) -> list[dict]:
+    "Conditions of a readiness strategy - a named one, or custom condition(s)"
+    if readiness is None:
+        return []
+    if isinstance(readiness, str):
+        if readiness not in _READINESS:
+            raise ValueError(f"Unknown readiness strategy '{readiness}' [{', '.join(_READINESS)}]")
+        return _READINESS[readiness]
+    if isinstance(readiness, dict):
+        return [readiness]
+    return list(readiness)
+
+
+async def _wait_in_page(page: pyppeteer.page.Page, condition: dict, deadline: float) -> None:
+    while True:
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError(f"Timeout: waiting for {condition}")
+        try:
+            if await page.evaluate(
+                _WAIT_SCRIPT, condition, int(remaining * 1000), conf.wait_scan_interval_ms
+            ):
+                return
+        except pyppeteer.errors.NetworkError:
+            # the document was replaced (navigation) while waiting - wait on the new one
+            await asyncio.sleep(0.05)
+
+
+async def wait_until(
+    page: pyppeteer.page.Page, conditions: list[dict], timeout_ms: Optional[int] = None
+) -> None:
+    """
+    Wait for every condition, in order - text present in the page's text content (`text`, or in
+    its serialized HTML with `markup`), selector count (`selector`, `count` - 0 for absent), ready
+    state (`readyState`), `networkIdle` & `domStable` (ms).
+    Raises an `asyncio.TimeoutError` if they don't hold within the timeout.
+    """
+    if not conditions:
+        return
+    deadline = monotonic() + (timeout_ms or conf.wait_timeout) / 1000
+    for condition in conditions:
+        if not isinstance(condition, dict):
+            raise ValueError(f"Invalid wait condition '{condition}'")
+        if "networkIdle" in condition:
+            idle_ms = condition["networkIdle"] or conf.wait_network_idle_ms
+            try:
+                await asyncio.wait_for(
+                    network_activity(page).wait_for_idle(idle_ms, condition.get("maxInflight", 0)),
+                    timeout=max(deadline - monotonic(), 0),
+                )
+            except asyncio.TimeoutError:
+                raise asyncio.TimeoutError(f"Timeout: waiting for {condition}")
+        elif "domStable" in condition:
+            stable_ms = condition["domStable"] or conf.wait_dom_stable_ms
+            await _wait_in_page(page, {"domStable": stable_ms}, deadline)
+        else:
+            await _wait_in_page(page, condition, deadline)